@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.database.storage import StorageManager
+
+def _seed(db, start, count, activity_ids, logs_per_day):
+    """Appends logs start..start+count-1, logs_per_day per day going back from today, 60s each."""
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    step = timedelta(seconds=86400 // logs_per_day)
+    rows = []
+    for i in range(start, start + count):
+        day, slot = divmod(i, logs_per_day)
+        begin = today - timedelta(days=day) + slot * step
+        rows.append((
+            activity_ids[i % len(activity_ids)],
+            begin.strftime("%Y-%m-%d %H:%M:%S.%f"),
+            (begin + timedelta(seconds=60)).strftime("%Y-%m-%d %H:%M:%S.%f"),
+            60
+        ))
+    session = db.get_session()
+    try:
+        conn = session.connection()
+        conn.exec_driver_sql(
+            "INSERT INTO activity_logs (activity_id, start_time, end_time, duration_seconds) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        session.commit()
+    finally:
+        db.release_session(session)
+
+def _time(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+def bench_stats(sizes=(10_000, 100_000, 1_000_000), activities=40, logs_per_day=500):
+    print(f"Timing stats queries against {activities} activities, {logs_per_day} logs per day...")
+
+    db_dir = tempfile.mkdtemp(prefix="gainhour-bench-")
+    db = StorageManager(os.path.join(db_dir, "gainhour.db"))
+    activity_ids = [db.get_or_create_activity(f"app{i}.exe").id for i in range(activities)]
+    yesterday = datetime.now().date() - timedelta(days=1)
+
+    seeded = 0
+    print(f"{'logs':>10} {'days':>6} {'lifetime ms':>12} {'today ms':>9} {'daily ms':>9}")
+    for size in sizes:
+        _seed(db, seeded, size - seeded, activity_ids, logs_per_day)
+        seeded = size
+        # Logs were inserted directly, so bring the daily rollup up to date as a migration would
+        db.rebuild_daily_totals()
+
+        lifetime = _time(db.get_activity_stats)
+        today = _time(db.get_today_stats)
+        daily = _time(lambda: db.get_daily_stats(yesterday))
+        print(f"{size:>10,} {-(-size // logs_per_day):>6} {lifetime:>12.2f} {today:>9.2f} {daily:>9.2f}")
+
+    print(f"Database: {db_dir}")
+
+if __name__ == "__main__":
+    sizes = tuple(int(arg) for arg in sys.argv[1:]) or (10_000, 100_000, 1_000_000)
+    bench_stats(sizes)
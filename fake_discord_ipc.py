@@ -0,0 +1,139 @@
+import json
+import os
+import socket
+import struct
+import threading
+import uuid
+
+OP_HANDSHAKE = 0
+OP_FRAME = 1
+OP_CLOSE = 2
+OP_PING = 3
+OP_PONG = 4
+
+_HEADER = struct.Struct("<II")
+
+
+class FakeDiscordIPC:
+    """
+    Local stand-in for the Discord client's RPC socket.
+
+    Listens on <socket_dir>/discord-ipc-<pipe> and speaks the same framing
+    as Discord (little-endian opcode and length, then a JSON payload):
+    handshakes are answered with a READY dispatch, SET_ACTIVITY frames are
+    acknowledged and recorded in activities (or counted in clears when they
+    carry no activity), and pings get pongs. Point
+    pypresence at it by setting XDG_RUNTIME_DIR to socket_dir. stop() drops
+    every client, like Discord quitting, and start() can be called again to
+    test reconnects. Unix sockets only; Windows named pipes are not emulated.
+    """
+
+    def __init__(self, socket_dir, pipe=0):
+        self.path = os.path.join(socket_dir, f"discord-ipc-{pipe}")
+        self._lock = threading.Lock()
+        self._server = None
+        self._clients = []
+        self._running = False
+
+        self.activities = []
+        self.clears = 0
+        self.handshakes = 0
+        self.frames = 0
+
+    def start(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen(8)
+        self._running = True
+        threading.Thread(target=self._accept_loop, args=(self._server,), daemon=True).start()
+
+    def stop(self):
+        self._running = False
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for conn in clients:
+            self._close(conn)
+        if self._server is not None:
+            self._close(self._server)
+            self._server = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def _close(sock):
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+
+    def _accept_loop(self, server):
+        while self._running:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with self._lock:
+                self._clients.append(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    @staticmethod
+    def _recv_exact(conn, size):
+        data = b""
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    @staticmethod
+    def _send(conn, op, payload):
+        body = json.dumps(payload).encode("utf-8")
+        conn.sendall(_HEADER.pack(op, len(body)) + body)
+
+    def _serve(self, conn):
+        try:
+            while self._running:
+                header = self._recv_exact(conn, _HEADER.size)
+                if header is None:
+                    return
+                op, length = _HEADER.unpack(header)
+                body = self._recv_exact(conn, length)
+                if body is None:
+                    return
+                payload = json.loads(body.decode("utf-8")) if length else {}
+
+                if op == OP_HANDSHAKE:
+                    self.handshakes += 1
+                    self._send(conn, OP_FRAME, {
+                        "cmd": "DISPATCH", "evt": "READY", "nonce": None,
+                        "data": {"v": 1, "config": {}, "user": {"id": "0", "username": "gainhour-test"}}
+                    })
+                elif op == OP_FRAME:
+                    self.frames += 1
+                    if payload.get("cmd") == "SET_ACTIVITY":
+                        activity = payload.get("args", {}).get("activity")
+                        with self._lock:
+                            if activity is None:
+                                self.clears += 1
+                            else:
+                                self.activities.append(activity)
+                    self._send(conn, OP_FRAME, {
+                        "cmd": payload.get("cmd"), "evt": None,
+                        "nonce": payload.get("nonce", str(uuid.uuid4())),
+                        "data": payload.get("args", {}).get("activity")
+                    })
+                elif op == OP_PING:
+                    self._send(conn, OP_PONG, payload)
+                elif op == OP_CLOSE:
+                    return
+        except (OSError, ValueError):
+            return
+        finally:
+            with self._lock:
+                if conn in self._clients:
+                    self._clients.remove(conn)
+            conn.close()
@@ -0,0 +1,174 @@
+import os
+import threading
+from collections import deque
+from types import SimpleNamespace
+
+from Xlib import X, error as xerror
+
+
+class FakeXServer:
+    """
+    In-process stand-in for an X server running an EWMH window manager.
+
+    Implements the slice of python-xlib's Display API that X11Backend and
+    X11EventWatcher use: atoms, the root window's _NET_ACTIVE_WINDOW and
+    _NET_CLIENT_LIST, per-window _NET_WM_NAME and _NET_WM_PID, and
+    PropertyNotify events for windows a connection selected
+    PropertyChangeMask on, delivered through a pipe so select() works. Pass
+    connect as X11Backend's display_factory, then drive it with
+    create_window/set_title/activate/destroy_window. fail_next_events(n)
+    makes the next n event reads on watching connections raise
+    ConnectionClosedError, to test recovery.
+    """
+
+    ROOT = 1
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._atoms = {}
+        self._properties = {self.ROOT: {}}   # window id -> {atom: value}
+        self._next_window = 0x400001
+        self._connections = []
+        self._fail_events = 0
+
+        self.connects = 0
+        self._set(self.ROOT, "_NET_CLIENT_LIST", [])
+        self._set(self.ROOT, "_NET_ACTIVE_WINDOW", [0])
+
+    def intern_atom(self, name):
+        with self._lock:
+            return self._atoms.setdefault(name, len(self._atoms) + 1)
+
+    def connect(self, display_name=None):
+        with self._lock:
+            self.connects += 1
+            connection = FakeDisplay(self)
+            self._connections.append(connection)
+            return connection
+
+    def _disconnect(self, connection):
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+
+    def _property(self, window_id, atom):
+        with self._lock:
+            return self._properties.get(window_id, {}).get(atom)
+
+    def _set(self, window_id, name, value):
+        atom = self.intern_atom(name)
+        with self._lock:
+            self._properties[window_id][atom] = value
+            for connection in self._connections:
+                if window_id in connection._selected:
+                    connection._post(SimpleNamespace(
+                        type=X.PropertyNotify,
+                        window=FakeWindow(connection, window_id),
+                        atom=atom
+                    ))
+
+    def _take_failure(self):
+        with self._lock:
+            if self._fail_events <= 0:
+                return False
+            self._fail_events -= 1
+            return True
+
+    def fail_next_events(self, count=1):
+        with self._lock:
+            self._fail_events = count
+
+    def create_window(self, title, pid=None):
+        with self._lock:
+            window_id = self._next_window
+            self._next_window += 1
+            self._properties[window_id] = {}
+            self._set(window_id, "_NET_WM_NAME", title.encode("utf-8"))
+            self._set(window_id, "_NET_WM_PID", [os.getpid() if pid is None else pid])
+            clients = list(self._property(self.ROOT, self.intern_atom("_NET_CLIENT_LIST")))
+            self._set(self.ROOT, "_NET_CLIENT_LIST", clients + [window_id])
+            return window_id
+
+    def set_title(self, window_id, title):
+        self._set(window_id, "_NET_WM_NAME", title.encode("utf-8"))
+
+    def activate(self, window_id):
+        self._set(self.ROOT, "_NET_ACTIVE_WINDOW", [window_id])
+
+    def destroy_window(self, window_id):
+        with self._lock:
+            clients = [w for w in self._property(self.ROOT, self.intern_atom("_NET_CLIENT_LIST")) if w != window_id]
+            self._properties.pop(window_id, None)
+            for connection in self._connections:
+                connection._selected.discard(window_id)
+            self._set(self.ROOT, "_NET_CLIENT_LIST", clients)
+            if self._property(self.ROOT, self.intern_atom("_NET_ACTIVE_WINDOW")) == [window_id]:
+                self._set(self.ROOT, "_NET_ACTIVE_WINDOW", [0])
+
+
+class FakeDisplay:
+    """One client connection to a FakeXServer."""
+
+    def __init__(self, server):
+        self.server = server
+        self._selected = set()   # window ids with PropertyChangeMask
+        self._events = deque()
+        self._read_fd, self._write_fd = os.pipe()
+        self._root = FakeWindow(self, FakeXServer.ROOT)
+
+    def _post(self, event):
+        self._events.append(event)
+        os.write(self._write_fd, b"\0")
+
+    def screen(self):
+        return SimpleNamespace(root=self._root)
+
+    def intern_atom(self, name):
+        return self.server.intern_atom(name)
+
+    def has_extension(self, name):
+        return False
+
+    def create_resource_object(self, kind, resource_id):
+        return FakeWindow(self, resource_id)
+
+    def fileno(self):
+        return self._read_fd
+
+    def pending_events(self):
+        return len(self._events)
+
+    def next_event(self):
+        if self._selected and self.server._take_failure():
+            raise xerror.ConnectionClosedError("fake X server")
+        os.read(self._read_fd, 1)
+        return self._events.popleft()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.server._disconnect(self)
+        if self._read_fd is not None:
+            os.close(self._read_fd)
+            os.close(self._write_fd)
+            self._read_fd = self._write_fd = None
+
+
+class FakeWindow:
+    def __init__(self, display, window_id):
+        self.display = display
+        self.id = window_id
+
+    def change_attributes(self, event_mask=X.NoEventMask):
+        if event_mask & X.PropertyChangeMask:
+            self.display._selected.add(self.id)
+        else:
+            self.display._selected.discard(self.id)
+
+    def get_full_property(self, atom, property_type):
+        value = self.display.server._property(self.id, atom)
+        return SimpleNamespace(value=value) if value is not None else None
+
+    def get_wm_name(self):
+        return None
@@ -9,7 +9,7 @@ if project_root not in sys.path:
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QIcon
 from src.ui.main_window import MainWindow
-from src.database.storage import init_db, StorageManager
+from src.database.storage import StorageManager
 
 def main():
     app = QApplication(sys.argv)
@@ -27,16 +27,17 @@ def main():
     
 
     db_file = get_db_path("gainhour.db")
-    init_db(db_file)
     db = StorageManager(db_file)
-    db.cleanup_incomplete_logs()
     
+    # Logs left open by a crash are closed when the tracker starts (see Tracker.__init__)
+    with db.unit_of_work():
+        db.clean_explorer_data()
 
-    if db.get_setting("daily_logs_only") == "True":
-        db.cleanup_old_description_logs()   
+        if db.get_setting("daily_logs_only") == "True":
+            db.cleanup_old_description_logs()   
     
 
-    window = MainWindow()
+    window = MainWindow(db)
     window.show()
     
     sys.exit(app.exec())
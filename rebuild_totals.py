@@ -0,0 +1,25 @@
+import os
+import sys
+
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.database.storage import StorageManager
+from src.utils.path_utils import get_db_path
+
+def rebuild_totals():
+    print("Rebuilding Gainhour daily totals...")
+
+    db_path = get_db_path("gainhour.db")
+    if not os.path.exists(db_path):
+        print(f"{db_path} not found.")
+        return
+
+    db = StorageManager(db_path)
+    db.rebuild_daily_totals()
+    print("Rebuild Complete.")
+
+if __name__ == "__main__":
+    rebuild_totals()
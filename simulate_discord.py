@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+import time
+
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# pypresence looks for the Discord socket in XDG_RUNTIME_DIR; point it at the fake server before anything connects
+socket_dir = tempfile.mkdtemp(prefix="gainhour-discord-")
+os.environ["XDG_RUNTIME_DIR"] = socket_dir
+
+from fake_discord_ipc import FakeDiscordIPC
+from src.core.discord_rpc import DiscordRPC
+from src.core.discord_presence import PresencePublisher
+
+def _wait_for(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+def simulate_discord(updates=1000, outage=3.0):
+    server = FakeDiscordIPC(socket_dir)
+    server.start()
+
+    rpc = DiscordRPC(client_id="0", initial_backoff=0.25, max_backoff=2.0)
+    publisher = PresencePublisher(rpc, min_interval=0.0)
+    publisher.start()
+    if not rpc.connected_event.wait(10):
+        print("Could not connect to the fake Discord server (is pypresence installed?)")
+        return
+
+    print(f"Publishing {updates} presence changes...")
+    started = time.perf_counter()
+    for i in range(updates):
+        publisher.publish({'details': f"Using app{i}.exe", 'state': "Active", 'start': 0})
+    _wait_for(lambda: server.activities and server.activities[-1]['details'] == f"Using app{updates - 1}.exe", 30)
+    elapsed = time.perf_counter() - started
+    print(f"Delivered latest presence in {elapsed:.2f}s; sent {publisher.sent}, coalesced {publisher.coalesced}")
+
+    print(f"Stopping the server for {outage:.1f}s...")
+    server.stop()
+    publisher.publish({'details': "Using after-outage.exe", 'state': "Active", 'start': 0})
+    _wait_for(lambda: not rpc.connected, 5)
+    time.sleep(outage)
+    attempts_during_outage = rpc.attempts
+
+    restarted = time.perf_counter()
+    server.start()
+    reconnected = _wait_for(lambda: server.activities and server.activities[-1]['details'] == "Using after-outage.exe", 30)
+    print(f"Reconnected: {reconnected} in {time.perf_counter() - restarted:.2f}s after restart; "
+          f"{attempts_during_outage} connection attempts in total up to then")
+
+    publisher.stop()
+    server.stop()
+    print(f"Client: {rpc.get_stats()}")
+    print(f"Server: {server.handshakes} handshakes, {server.frames} frames, "
+          f"{len(server.activities)} activities, {server.clears} clears")
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    simulate_discord(count)
@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+import time
+
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.database.storage import StorageManager
+from src.core.tracker import Tracker
+from src.core.simulated_backend import SimulatedBackend
+
+def simulate_load(switches=10000, apps=20, interval=5.0):
+    print(f"Replaying {switches} simulated focus switches across {apps} apps, {interval}s apart...")
+
+    db_dir = tempfile.mkdtemp(prefix="gainhour-load-")
+    db = StorageManager(os.path.join(db_dir, "gainhour.db"))
+    backend = SimulatedBackend.random_switches(switches, apps=apps, interval=interval,
+                                               start_time=time.time() - switches * interval)
+    tracker = Tracker(db, backend=backend)
+
+    started = time.perf_counter()
+    tracker.start()
+    backend.finished.wait()
+    while tracker.watcher.pending_events():
+        time.sleep(0.01)
+    replayed = time.perf_counter() - started
+    tracker.stop()
+    elapsed = time.perf_counter() - started
+
+    stats = db.get_activity_stats()
+    tracked = sum(s['total_seconds'] for s in stats)
+    print(f"Replayed in {replayed:.2f}s ({switches / replayed:,.0f} switches/s), "
+          f"{elapsed:.2f}s including final flush")
+    print(f"Events: {tracker.watcher.events_emitted}, rows written: {tracker.writer.events_written}, "
+          f"flushes: {tracker.writer.flush_count}")
+    print(f"Debounce: {tracker.get_debounce_stats()}")
+    print(f"Ticks: {tracker.get_tick_stats()}")
+    print(f"Tracked {tracked}s across {len(stats)} activities (database: {db_dir})")
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    simulate_load(count, interval=interval)
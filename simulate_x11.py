@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from fake_x11 import FakeXServer
+from src.core.focus_watcher import EVENT_FOCUS, EVENT_TITLE, EVENT_WINDOWS
+from src.core.x11_backend import X11Backend
+
+# Every fake window belongs to this process, so switching between them is a title change
+SWITCH = (EVENT_FOCUS, EVENT_TITLE)
+
+def _expect(watcher, kinds, check=None, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        event = watcher.next_event(timeout=deadline - time.monotonic())
+        if event is not None and event.kind in kinds and (check is None or check(event.info)):
+            return True
+    return False
+
+def _title_is(title):
+    return lambda info: info is not None and info['title'] == title
+
+def simulate_x11():
+    server = FakeXServer()
+    backend = X11Backend(display_factory=server.connect)
+    editor = server.create_window("notes.txt - Editor")
+    browser = server.create_window("Browser")
+
+    watcher = backend.create_watcher(poll_interval=0.1)
+    watcher.initial_backoff = 0.1
+    watcher.max_restarts = 2
+    watcher.start()
+    time.sleep(0.2)
+
+    results = []
+    def check(name, passed):
+        results.append(passed)
+        print(f"{'ok  ' if passed else 'FAIL'} {name}")
+
+    server.activate(editor)
+    check("event for the activated window", _expect(watcher, SWITCH, _title_is("notes.txt - Editor")))
+    server.set_title(editor, "todo.txt - Editor")
+    check("title event for the active window", _expect(watcher, (EVENT_TITLE,), _title_is("todo.txt - Editor")))
+    watcher.open_windows()
+    terminal = server.create_window("Terminal")
+    check("windows event for a new client", _expect(watcher, (EVENT_WINDOWS,)))
+    check("window list includes it", any(w['title'] == "Terminal" for w in watcher.open_windows()))
+    # Background windows: a title change can move them in or out of a title rule
+    server.set_title(browser, "Browser - background")
+    check("windows event for a background title change", _expect(watcher, (EVENT_WINDOWS,)))
+    check("window list has the new title", any(w['title'] == "Browser - background" for w in watcher.open_windows()))
+    server.set_title(terminal, "Terminal - build")
+    check("windows event for a client opened later", _expect(watcher, (EVENT_WINDOWS,)))
+    watcher.open_windows()
+    server.set_title(browser, "Browser")
+    server.set_title(terminal, "Terminal")
+    _expect(watcher, (EVENT_WINDOWS,))
+
+    # One failed read: the loop reconnects and reports the focus change it missed
+    server.fail_next_events(1)
+    server.activate(browser)
+    check("reconnects after a failed event read", _expect(watcher, SWITCH, _title_is("Browser")))
+    check("restart counted", watcher.restarts == 1 and not watcher.polling)
+
+    # Failing every read: after max_restarts it falls back to polling
+    server.fail_next_events(1000)
+    deadline = time.monotonic() + 5
+    page = 0
+    while not watcher.polling and time.monotonic() < deadline:
+        page += 1
+        server.set_title(browser, f"Browser - page {page}")
+        time.sleep(0.05)
+    check("falls back to polling", watcher.polling)
+    server.activate(terminal)
+    check("polling still reports focus changes", _expect(watcher, SWITCH, _title_is("Terminal")))
+
+    watcher.stop()
+    print(f"{sum(results)}/{len(results)} checks passed; {server.connects} connections, {watcher.restarts} restarts")
+    return all(results)
+
+if __name__ == "__main__":
+    sys.exit(0 if simulate_x11() else 1)
@@ -0,0 +1,166 @@
+import threading
+import time
+
+
+class PresencePublisher:
+    """
+    Publishes Discord presence from a dedicated worker thread.
+
+    The tracker calls publish() with the presence it wants shown (a dict of
+    update() keyword arguments, or None to clear it); this only records the
+    desired state and never touches the Discord pipe. The worker sends it
+    only when it differs from what was last sent, and at most once every
+    min_interval seconds: changes arriving in between are coalesced so
+    only the latest one is sent when the interval ends. The worker is the
+    only thread that calls into the DiscordRPC client, so it is also the one
+    long-lived thread that (re)connects, waiting out the client's backoff
+    between attempts.
+    """
+
+    # Discord drops presence updates sent more often than once every 15 seconds
+    MIN_INTERVAL = 15.0
+
+    def __init__(self, rpc, min_interval=MIN_INTERVAL):
+        self.rpc = rpc
+        self.min_interval = min_interval
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+        self._desired = None
+        self._desired_version = 0
+        self._handled_version = 0
+        self._reconnect = False
+        self._last_sent = None
+        self._sent_any = False
+        self._last_send = float("-inf")
+        rpc.add_state_listener(self._on_state_changed)
+
+        self.published = 0
+        self.sent = 0
+        self.skipped_unchanged = 0
+        self.coalesced = 0
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="discord-presence", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Stops the worker, which clears the presence and closes the connection on its way out."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def publish(self, presence):
+        """Sets the presence to show; returns immediately."""
+        with self._cond:
+            if presence == self._desired:
+                return
+            if self._desired_version != self._handled_version:
+                # The previous state was never sent; the new one replaces it
+                self.coalesced += 1
+            self._desired = presence
+            self._desired_version += 1
+            self.published += 1
+            self._cond.notify()
+
+    def reconnect(self):
+        """Asks the worker to drop the connection, reconnect and resend the current presence."""
+        with self._cond:
+            self._reconnect = True
+            self._cond.notify()
+
+    def _on_state_changed(self, state):
+        with self._cond:
+            if not self.rpc.connected:
+                # Whatever was shown is gone with the connection; resend once reconnected
+                self._sent_any = False
+            self._cond.notify()
+
+    def _next_step(self):
+        """Waits until there is something to do; returns (reconnect, desired, version) or None to exit. Caller holds the lock."""
+        while self._running:
+            if self._reconnect:
+                self._reconnect = False
+                return True, self._desired, self._desired_version
+
+            now = time.monotonic()
+            if not self.rpc.connected:
+                retry_in = self.rpc.retry_in()
+                if retry_in <= 0:
+                    return False, self._desired, self._desired_version
+                self._cond.wait(retry_in)
+                continue
+
+            if self._desired_version == self._handled_version and self._sent_any:
+                self._cond.wait()
+                continue
+            if not self._sent_any and self._desired is None:
+                # A fresh connection shows nothing, so there is nothing to clear
+                # and no send that should hold back the first real presence
+                self._last_sent = None
+                self._sent_any = True
+                self._handled_version = self._desired_version
+                continue
+            if self._sent_any and self._desired == self._last_sent:
+                self.skipped_unchanged += 1
+                self._handled_version = self._desired_version
+                continue
+            send_in = self._last_send + self.min_interval - now
+            if send_in > 0:
+                # Later publish() calls replace the desired state while waiting
+                self._cond.wait(send_in)
+                continue
+            return False, self._desired, self._desired_version
+        return None
+
+    def _run(self):
+        self.rpc.connect()
+        while True:
+            with self._cond:
+                step = self._next_step()
+            if step is None:
+                break
+            reconnect, desired, version = step
+            if reconnect:
+                self._drop_connection()
+                self.rpc.reset_backoff()
+            if not self.rpc.connected:
+                self.rpc.connect()
+            if self.rpc.connected:
+                self._deliver(desired, version)
+        self._drop_connection()
+
+    def _deliver(self, desired, version):
+        sent = self.rpc.clear() if desired is None else self.rpc.update(**desired)
+        if not sent:
+            # The connection dropped; the state listener arranges a resend after reconnecting
+            return
+
+        with self._cond:
+            self._last_sent = desired
+            self._sent_any = True
+            self._last_send = time.monotonic()
+            self._handled_version = max(self._handled_version, version)
+            self.sent += 1
+
+    def _drop_connection(self):
+        self.rpc.clear()
+        self.rpc.close()
+
+    def get_stats(self):
+        with self._cond:
+            return {
+                'published': self.published,
+                'sent': self.sent,
+                'skipped_unchanged': self.skipped_unchanged,
+                'coalesced': self.coalesced,
+                'connected': self.rpc.connected
+            }
@@ -1,58 +1,136 @@
-from pypresence import Presence
+import threading
 import time
 
+STATE_DISCONNECTED = "disconnected"
+STATE_CONNECTING = "connecting"
+STATE_CONNECTED = "connected"
+
+
 class DiscordRPC:
-    def __init__(self, client_id):
+    """
+    Connection manager for the Discord RPC pipe.
+
+    connect() makes one synchronous attempt and is meant to be called from a
+    single long-lived worker (the presence publisher); it never spawns
+    threads. After a failed attempt the next one is allowed only once the
+    backoff has elapsed, doubling from initial_backoff up to max_backoff and
+    resetting on success. Connection state changes are reported to
+    listeners registered with add_state_listener(callback(state)), and
+    connected_event is set while connected.
+    """
+
+    def __init__(self, client_id, initial_backoff=2.0, max_backoff=120.0, pipe=None):
         self.client_id = client_id
+        self.pipe = pipe
         self.rpc = None
-        self.connected = False
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
 
-    def connect(self):
-        if self.connected:
-            return
+        self.state = STATE_DISCONNECTED
+        self.connected_event = threading.Event()
+        self._state_listeners = []
+
+        self.failures = 0
+        self.next_attempt_at = 0.0
+        self.attempts = 0
+        self.connects = 0
+        self.disconnects = 0
 
-        def _connect_thread():
+    @property
+    def connected(self):
+        return self.state == STATE_CONNECTED
+
+    def add_state_listener(self, callback):
+        """Registers callback(state), called on the thread that changed the state."""
+        self._state_listeners.append(callback)
+
+    def _set_state(self, state):
+        if state == self.state:
+            return
+        self.state = state
+        if state == STATE_CONNECTED:
+            self.connected_event.set()
+        else:
+            self.connected_event.clear()
+        for callback in list(self._state_listeners):
             try:
-                self.rpc = Presence(self.client_id)
-                self.rpc.connect()
-                self.connected = True
-                print("Successfully connected to Discord RPC")
+                callback(state)
             except Exception as e:
-                if "Client ID is Invalid" in str(e) or "Invalid pipe" in str(e):
-                    self.connected = False
-                    return 
-                
+                print(f"Error in Discord state listener: {e}")
+
+    def retry_in(self):
+        """Seconds until connect() will make another attempt (0 if connected or due)."""
+        if self.connected:
+            return 0.0
+        return max(self.next_attempt_at - time.monotonic(), 0.0)
+
+    def reset_backoff(self):
+        """Allows the next connect() to try immediately, e.g. for a user-requested reconnect."""
+        self.failures = 0
+        self.next_attempt_at = 0.0
+
+    def connect(self):
+        """Attempts to connect unless connected or backing off; returns whether connected."""
+        if self.connected:
+            return True
+        if time.monotonic() < self.next_attempt_at:
+            return False
+
+        self.attempts += 1
+        self._set_state(STATE_CONNECTING)
+        try:
+            from pypresence import Presence
+            self.rpc = Presence(self.client_id, pipe=self.pipe)
+            self.rpc.connect()
+        except Exception as e:
+            self.rpc = None
+            delay = min(self.initial_backoff * (2 ** self.failures), self.max_backoff)
+            if self.failures == 0:
                 print(f"Failed to connect to Discord RPC: {e}")
-                self.connected = False
+            self.failures += 1
+            self.next_attempt_at = time.monotonic() + delay
+            self._set_state(STATE_DISCONNECTED)
+            return False
 
-        import threading
-        t = threading.Thread(target=_connect_thread, daemon=True)
-        t.start()
+        self.failures = 0
+        self.next_attempt_at = 0.0
+        self.connects += 1
+        print("Successfully connected to Discord RPC")
+        self._set_state(STATE_CONNECTED)
+        return True
+
+    def _lost(self, e):
+        print(f"Lost connection to Discord RPC: {e}")
+        self.disconnects += 1
+        self.rpc = None
+        self._set_state(STATE_DISCONNECTED)
 
     def update(self, state, details=None, start=None, large_image=None, large_text=None):
+        """Sends a presence update; returns False (and drops the connection) if it could not be sent."""
         if not self.connected:
-            if self.connect() is False:
-                return
-        
-        if self.connected:
-            try:
-                self.rpc.update(
-                    state=state,
-                    details=details,
-                    start=start,
-                    large_image=large_image,
-                    large_text=large_text
-                )
-            except Exception as e:
-                print(f"Lost connection to Discord RPC: {e}")
-                self.connected = False
+            return False
+        try:
+            self.rpc.update(
+                state=state,
+                details=details,
+                start=start,
+                large_image=large_image,
+                large_text=large_text
+            )
+            return True
+        except Exception as e:
+            self._lost(e)
+            return False
 
     def clear(self):
-        if self.connected:
-            try:
-                self.rpc.clear()
-            except:
-                pass
+        if not self.connected:
+            return False
+        try:
+            self.rpc.clear()
+            return True
+        except Exception as e:
+            self._lost(e)
+            return False
 
     def close(self):
         if self.connected:
@@ -60,4 +138,15 @@ class DiscordRPC:
                 self.rpc.close()
             except:
                 pass
+        self.rpc = None
+        self._set_state(STATE_DISCONNECTED)
 
+    def get_stats(self):
+        return {
+            'state': self.state,
+            'attempts': self.attempts,
+            'connects': self.connects,
+            'disconnects': self.disconnects,
+            'failures': self.failures,
+            'retry_in': self.retry_in()
+        }
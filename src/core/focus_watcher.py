@@ -0,0 +1,325 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .window_watcher import get_backend
+from .timing import get_clock
+
+EVENT_FOCUS = "focus"      # foreground window moved to another process
+EVENT_TITLE = "title"      # foreground window kept its process but changed title
+EVENT_WINDOWS = "windows"  # a top-level window was created, destroyed, shown or hidden
+
+
+@dataclass(frozen=True)
+class WatchEvent:
+    """
+    One change reported by a watcher. info is the active window dict for focus
+    and title events, and the window list (or None) for window events.
+    timestamp is a reading of the shared MonotonicClock.
+    """
+    __slots__ = ('kind', 'timestamp', 'info')
+
+    kind: str
+    timestamp: float
+    info: Optional[dict]
+
+
+@dataclass(frozen=True)
+class WindowDelta:
+    """Windows opened, closed or retitled since the consumer's previous take_window_delta()."""
+    __slots__ = ('opened', 'closed', 'retitled')
+
+    opened: tuple
+    closed: tuple
+    retitled: tuple
+
+    def __bool__(self):
+        return bool(self.opened or self.closed or self.retitled)
+
+
+EMPTY_DELTA = WindowDelta((), (), ())
+
+
+def window_key(window):
+    """Stable identity of a window: its platform handle, or process and title when there is none."""
+    hwnd = window.get('hwnd')
+    return hwnd if hwnd is not None else (window['process_name'], window['title'])
+
+
+class WindowWatcher:
+    """
+    Base class for focus watchers over a WindowBackend.
+
+    A watcher runs on its own thread and pushes WatchEvents onto a queue;
+    the tracker blocks on next_event() instead of polling. Each focus/title
+    event carries the active window info captured when it happened, so
+    switches are recorded at their real time. open_windows() returns the
+    last known window list and only re-enumerates after an EVENT_WINDOWS;
+    take_window_delta() returns just what changed since the previous call.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._events = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+        self._active = None
+        self._window_keys = None
+        self.initial_window = None  # focus when start() was called; later changes arrive as events
+        self._windows = []
+        self._windows_dirty = True
+        self._window_map = {}
+        self._windows_version = 0
+        self._taken_map = {}
+        self._taken_version = 0
+
+        self.events_emitted = 0
+        self.enumerations = 0
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._active = self.backend.get_active_window_info()
+        self.initial_window = self._active
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def _run(self):
+        raise NotImplementedError
+
+    def next_event(self, timeout=None):
+        """Blocks until an event arrives; returns None after timeout seconds without one."""
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def wake(self):
+        """Makes a consumer blocked in next_event() return None straight away, e.g. so it can notice a stop."""
+        self._events.put(None)
+
+    def pending_events(self):
+        return self._events.qsize()
+
+    def active_window(self):
+        return self._active
+
+    def open_windows(self):
+        with self._lock:
+            if not self._windows_dirty:
+                return self._windows
+            self._windows_dirty = False
+        try:
+            windows = self.backend.get_open_windows()
+        except Exception:
+            windows = []
+        self._store_windows(windows)
+        return windows
+
+    def last_windows(self):
+        """The window list the last take_window_delta() was computed against."""
+        with self._lock:
+            return list(self._taken_map.values())
+
+    def _store_windows(self, windows):
+        with self._lock:
+            self._windows = windows
+            self._window_map = {window_key(w): w for w in windows}
+            self._windows_version += 1
+            self.enumerations += 1
+
+    def take_window_delta(self, windows=None):
+        """
+        Returns a WindowDelta against the window set seen at the previous call.
+        Pass the snapshot carried by an EVENT_WINDOWS event as windows to diff
+        against that instead of the current list. Costs nothing unless the
+        window list changed in between.
+        """
+        if windows is not None:
+            self._store_windows(windows)
+        else:
+            self.open_windows()
+        with self._lock:
+            if self._windows_version == self._taken_version:
+                return EMPTY_DELTA
+            current, previous = self._window_map, self._taken_map
+            self._taken_map, self._taken_version = current, self._windows_version
+
+        opened = tuple(w for key, w in current.items() if key not in previous)
+        closed = tuple(w for key, w in previous.items() if key not in current)
+        retitled = tuple(
+            w for key, w in current.items()
+            if key in previous and previous[key]['title'] != w['title']
+        )
+        return WindowDelta(opened, closed, retitled)
+
+    def _emit(self, kind, info=None, timestamp=None):
+        self.events_emitted += 1
+        self._events.put(WatchEvent(kind, timestamp or get_clock().now(), info))
+
+    def _focus_changed(self, info, timestamp=None):
+        """Emits a focus or title event if info differs from the last active window."""
+        previous = self._active
+        self._active = info
+        if info is None and previous is None:
+            return
+        if info is None or previous is None or info['process_name'] != previous['process_name']:
+            self._emit(EVENT_FOCUS, info, timestamp)
+        elif info['title'] != previous['title']:
+            self._emit(EVENT_TITLE, info, timestamp)
+
+    def _poll(self, interval):
+        """Samples the foreground window and window list every interval seconds until stopped."""
+        failing = False
+        while self._running:
+            now = get_clock().now()
+            try:
+                self._focus_changed(self.backend.get_active_window_info(), now)
+                windows = self.backend.get_open_windows()
+                failing = False
+            except Exception as e:
+                # Keep the last known state rather than reporting every window closed
+                if not failing:
+                    print(f"Error polling windows: {e}")
+                failing = True
+                windows = None
+            if windows is not None:
+                keys = {(window_key(w), w['title']) for w in windows}
+                if keys != self._window_keys:
+                    self._window_keys = keys
+                    self._windows_changed(now, windows)
+
+            time.sleep(interval)
+
+    def _windows_changed(self, timestamp=None, windows=None):
+        """
+        Reports a window-list change. Watchers that already hold the new list
+        pass it along with the event; otherwise the list is re-enumerated
+        lazily on the next open_windows().
+        """
+        if windows is not None:
+            self._emit(EVENT_WINDOWS, windows, timestamp)
+            return
+        with self._lock:
+            already_dirty = self._windows_dirty
+            self._windows_dirty = True
+        if not already_dirty:
+            self._emit(EVENT_WINDOWS, timestamp=timestamp)
+
+
+class PollingWatcher(WindowWatcher):
+    """Fallback watcher: samples the foreground window and window list every interval seconds."""
+
+    def __init__(self, backend, interval=1.0):
+        super().__init__(backend)
+        self.interval = interval
+
+    def _run(self):
+        self._poll(self.interval)
+
+
+class WinEventWatcher(WindowWatcher):
+    """
+    Event-driven watcher for Windows built on SetWinEventHook.
+
+    Foreground, name-change and create/destroy/show/hide notifications are
+    delivered out of context to a message loop on the watcher thread, so the
+    process sleeps in GetMessage until something actually changes.
+    """
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_CREATE = 0x8000
+    EVENT_OBJECT_DESTROY = 0x8001
+    EVENT_OBJECT_HIDE = 0x8003
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+    GA_ROOT = 2
+    WM_QUIT = 0x0012
+
+    def __init__(self, backend):
+        super().__init__(backend)
+        self._thread_id = None
+        self._ready = threading.Event()
+
+    def start(self):
+        super().start()
+        self._ready.wait(timeout=2)
+
+    def stop(self):
+        if self._thread_id:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        super().stop()
+        self._thread_id = None
+
+    def _run(self):
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+
+        def callback(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+            if id_object != self.OBJID_WINDOW or id_child != 0 or not hwnd:
+                return
+            try:
+                now = get_clock().now()
+                if event == self.EVENT_SYSTEM_FOREGROUND:
+                    self._focus_changed(self.backend.get_active_window_info(), now)
+                elif event == self.EVENT_OBJECT_DESTROY:
+                    # GetAncestor fails on a destroyed window; match it against the last enumeration instead
+                    with self._lock:
+                        known = hwnd in self._window_map
+                    if known:
+                        self._windows_changed(now)
+                elif user32.GetAncestor(hwnd, self.GA_ROOT) == hwnd:
+                    # A title change can move any top-level window in or out of a title rule
+                    self._windows_changed(now)
+                    if event == self.EVENT_OBJECT_NAMECHANGE and hwnd == user32.GetForegroundWindow():
+                        self._focus_changed(self.backend.get_active_window_info(), now)
+            except Exception as e:
+                print(f"Error in WinEvent callback: {e}")
+
+        # Keep a reference so the callback is not collected while hooks are installed
+        self._proc = WinEventProc(callback)
+        flags = self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+        hooks = [
+            user32.SetWinEventHook(self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND, 0, self._proc, 0, 0, flags),
+            user32.SetWinEventHook(self.EVENT_OBJECT_CREATE, self.EVENT_OBJECT_HIDE, 0, self._proc, 0, 0, flags),
+            user32.SetWinEventHook(self.EVENT_OBJECT_NAMECHANGE, self.EVENT_OBJECT_NAMECHANGE, 0, self._proc, 0, 0, flags),
+        ]
+        self._thread_id = kernel32.GetCurrentThreadId()
+        self._ready.set()
+
+        msg = wintypes.MSG()
+        try:
+            while self._running and user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWinEvent(hook)
+
+
+def create_watcher(backend=None, poll_interval=1.0):
+    """Returns the best watcher the backend offers (event-driven where possible, else polling)."""
+    return (backend or get_backend()).create_watcher(poll_interval)
@@ -1,32 +1,173 @@
+import hashlib
+import json
 import os
 import shutil
+import threading
 from PIL import Image
-import win32ui
-import win32gui
-import win32con
-import win32api
+
+
+def safe_name(name):
+    """Strips everything but letters, digits and spaces, as used for icon file names."""
+    return "".join([c for c in name if c.isalpha() or c.isdigit() or c==' ']).rstrip()
+
 
 class IconManager:
+    """
+    Stores activity icons as PNGs in icons_dir.
+
+    The directory is indexed once at startup and the index is kept up to date
+    on save/delete, so get_icon_path is a dictionary lookup with no filesystem
+    access. Icons are named after safe_name(name); when two names sanitize to
+    the same file name (e.g. "a.b.exe" and "ab.exe") the later one gets a
+    hash suffix, and the name -> file assignments are persisted in index.json
+    so they survive restarts. Icons from before the index are adopted once
+    with adopt_legacy_icons.
+    """
+
+    INDEX_FILE = "index.json"
+
     def __init__(self, icons_dir="assets/icons"):
         from src.utils.path_utils import get_db_path
         self.icons_dir = get_db_path(icons_dir)
         if not os.path.exists(self.icons_dir):
             os.makedirs(self.icons_dir)
-    
+
+        self._lock = threading.Lock()
+        self._files = set()   # icon file names present in icons_dir
+        self._owners = {}     # activity name -> icon file name
+        self._change_listeners = []
+        self.rescan()
+
+    def add_change_listener(self, callback):
+        """Registers callback(path), called whenever an icon file is written or removed (possibly from a worker thread)."""
+        self._change_listeners.append(callback)
+
+    def _notify_change(self, filename):
+        path = os.path.join(self.icons_dir, filename)
+        for callback in list(self._change_listeners):
+            try:
+                callback(path)
+            except Exception as e:
+                print(f"Error in icon change listener: {e}")
+
+    def rescan(self):
+        """Rebuilds the index from the icons directory and index.json."""
+        try:
+            files = {f for f in os.listdir(self.icons_dir) if f.lower().endswith('.png')}
+        except OSError as e:
+            print(f"Error indexing icons: {e}")
+            files = set()
+
+        owners = {}
+        try:
+            with open(os.path.join(self.icons_dir, self.INDEX_FILE), "r", encoding="utf-8") as f:
+                owners = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        with self._lock:
+            self._files = files
+            self._owners = {name: filename for name, filename in owners.items() if filename in files}
+
+    def _save_index(self):
+        path = os.path.join(self.icons_dir, self.INDEX_FILE)
+        try:
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self._owners, f)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"Error saving icon index: {e}")
+
+    def _lookup(self, name):
+        """Returns the icon file name for name, or None. Caller holds the lock."""
+        return self._owners.get(name)
+
+    def adopt_legacy_icons(self, activities):
+        """
+        Adds icons saved before the index existed (plain safe_name files) to
+        it and persists the result. An activity whose icon_path points at a
+        file in icons_dir owns that file; any other file goes to the one
+        activity whose safe_name produces it, and stays unassigned when
+        several names collide on it.
+        """
+        icons_dir = os.path.abspath(self.icons_dir)
+        with self._lock:
+            unowned = self._files - set(self._owners.values())
+            if not unowned:
+                return
+            changed = False
+            candidates = {}   # legacy file name -> names that sanitize to it
+            for activity in activities:
+                name = activity.name
+                if name in self._owners:
+                    continue
+                path = activity.icon_path
+                if path and os.path.dirname(os.path.abspath(path)) == icons_dir and os.path.basename(path) in unowned:
+                    self._owners[name] = os.path.basename(path)
+                    unowned.discard(self._owners[name])
+                    changed = True
+                    continue
+                candidates.setdefault(f"{safe_name(name)}.png", set()).add(name)
+
+            for filename, names in candidates.items():
+                owners = [n for n in names if n not in self._owners]
+                if filename in unowned and len(owners) == 1:
+                    self._owners[owners[0]] = filename
+                    unowned.discard(filename)
+                    changed = True
+            if changed:
+                self._save_index()
+
+    def _assign(self, name):
+        """Returns the file name to save name's icon under, reserving it. Caller holds the lock."""
+        filename = self._lookup(name)
+        if filename:
+            return filename
+        stem = safe_name(name) or "icon"
+        filename = f"{stem}.png"
+        if filename in self._files or filename in self._owners.values():
+            filename = f"{stem} {hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}.png"
+        self._owners[name] = filename
+        return filename
+
+    def _stored(self, filename):
+        with self._lock:
+            self._files.add(filename)
+            self._save_index()
+        self._notify_change(filename)
+
     def get_icon_path(self, name):
         """Returns the path to the icon for the given activity name."""
-        safe_name = "".join([c for c in name if c.isalpha() or c.isdigit() or c==' ']).rstrip()
-        filename = f"{safe_name}.png"
-        path = os.path.join(self.icons_dir, filename)
-        if os.path.exists(path):
-            return path
-        return None
+        with self._lock:
+            filename = self._lookup(name)
+        return os.path.join(self.icons_dir, filename) if filename else None
+
+    def forget_path(self, path):
+        """Drops path from the index after the file was removed elsewhere (e.g. with its activity)."""
+        if not path or os.path.dirname(os.path.abspath(path)) != os.path.abspath(self.icons_dir):
+            return
+        filename = os.path.basename(path)
+        with self._lock:
+            self._files.discard(filename)
+            for name in [n for n, f in self._owners.items() if f == filename]:
+                del self._owners[name]
+            self._save_index()
+        self._notify_change(filename)
 
     def extract_icon(self, exe_path, name):
         """Extracts the icon from the exe using ExtractIconEx."""
         if not exe_path or not os.path.exists(exe_path):
             return None
         
+        try:
+            import win32ui
+            import win32gui
+            import win32con
+            import win32api
+        except ImportError:
+            # Icon extraction needs pywin32; other platforms fall back to the exe path
+            return None
+
         try:
             large, small = win32gui.ExtractIconEx(exe_path, 0)
             
@@ -56,9 +197,11 @@ class IconManager:
                 (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
                 bmpstr, 'raw', 'BGRX', 0, 1)
 
-            safe_name = "".join([c for c in name if c.isalpha() or c.isdigit() or c==' ']).rstrip()
-            save_path = os.path.join(self.icons_dir, f"{safe_name}.png")
+            with self._lock:
+                filename = self._assign(name)
+            save_path = os.path.join(self.icons_dir, filename)
             img.save(save_path)
+            self._stored(filename)
             
             win32gui.DestroyIcon(hIcon)
             
@@ -72,9 +215,11 @@ class IconManager:
         """Saves a user-uploaded icon."""
         try:
             img = Image.open(source_path)
-            safe_name = "".join([c for c in name if c.isalpha() or c.isdigit() or c==' ']).rstrip()
-            save_path = os.path.join(self.icons_dir, f"{safe_name}.png")
+            with self._lock:
+                filename = self._assign(name)
+            save_path = os.path.join(self.icons_dir, filename)
             img.save(save_path)
+            self._stored(filename)
             return save_path
         except Exception as e:
             print(f"Error saving user icon: {e}")
@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class IconResolver:
+    """
+    Resolves application icons off the tracker thread.
+
+    request() never blocks: it returns the icon already known for the
+    executable (or None) and, if needed, queues a job on a small worker pool.
+    Jobs are deduplicated per executable while in flight. A job first looks
+    for an existing icon through IconManager and only extracts (GDI + PNG
+    encode) when there is none. Results are remembered per
+    (executable path, mtime); when a recheck finds the executable's mtime
+    changed, the icon is extracted again and replaces the stored one.
+    on_resolved(process_name, executable_path, icon_path) is called from the
+    worker when an icon becomes available.
+    """
+
+    # How long a resolved executable is trusted before its mtime is checked again
+    RECHECK_AFTER = 300.0
+
+    def __init__(self, icon_manager, on_resolved=None, workers=2):
+        self.icon_manager = icon_manager
+        self.on_resolved = on_resolved
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="icon")
+        self._lock = threading.Lock()
+        self._inflight = set()   # executable paths with a queued or running job
+        self._resolved = {}      # executable path -> (mtime, icon_path or None, checked_at)
+        self._closed = False
+
+        self.requests = 0
+        self.deduplicated = 0
+        self.index_hits = 0
+        self.extractions = 0
+
+    def request(self, process_name, executable_path):
+        """Returns the known icon path for executable_path, scheduling resolution if it is unknown or stale."""
+        if not executable_path:
+            return None
+        with self._lock:
+            self.requests += 1
+            known = self._resolved.get(executable_path)
+            if known and time.monotonic() - known[2] < self.RECHECK_AFTER:
+                return known[1]
+            if executable_path in self._inflight:
+                self.deduplicated += 1
+                return known[1] if known else None
+            if self._closed:
+                return known[1] if known else None
+            self._inflight.add(executable_path)
+        self._pool.submit(self._resolve, process_name, executable_path)
+        return known[1] if known else None
+
+    def _resolve(self, process_name, executable_path):
+        icon_path = None
+        try:
+            try:
+                mtime = os.stat(executable_path).st_mtime
+            except OSError:
+                mtime = None
+
+            with self._lock:
+                known = self._resolved.get(executable_path)
+            if known and known[0] == mtime and known[1]:
+                icon_path = known[1]
+            elif known and mtime is not None:
+                # The executable changed since it was last resolved: extract again, overwriting the indexed icon
+                self.extractions += 1
+                icon_path = (self.icon_manager.extract_icon(executable_path, process_name)
+                             or self.icon_manager.get_icon_path(process_name))
+            else:
+                icon_path = self.icon_manager.get_icon_path(process_name)
+                if icon_path:
+                    self.index_hits += 1
+                elif mtime is not None:
+                    self.extractions += 1
+                    icon_path = self.icon_manager.extract_icon(executable_path, process_name)
+
+            with self._lock:
+                self._resolved[executable_path] = (mtime, icon_path, time.monotonic())
+        except Exception as e:
+            print(f"Error resolving icon for {process_name}: {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard(executable_path)
+
+        if icon_path and self.on_resolved:
+            try:
+                self.on_resolved(process_name, executable_path, icon_path)
+            except Exception as e:
+                print(f"Error in icon callback for {process_name}: {e}")
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'deduplicated': self.deduplicated,
+                'index_hits': self.index_hits,
+                'extractions': self.extractions,
+                'in_flight': len(self._inflight),
+                'resolved': len(self._resolved)
+            }
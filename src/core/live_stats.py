@@ -0,0 +1,110 @@
+import threading
+import time
+from datetime import datetime
+
+
+class LiveStats:
+    """
+    Totals for one tick with in-flight (not yet persisted) session time merged in.
+    Shared by every view, so treat the lists and dicts as read-only.
+    """
+    __slots__ = ('computed_at', 'today', 'lifetime', 'daily_breakdown',
+                 'total_today', 'today_by_key', 'total_by_key')
+
+    def __init__(self, computed_at, today, lifetime, daily_breakdown, today_by_key, total_by_key):
+        self.computed_at = computed_at
+        self.today = today
+        self.lifetime = lifetime
+        self.daily_breakdown = daily_breakdown
+        self.today_by_key = today_by_key
+        self.total_by_key = total_by_key
+        self.total_today = sum(s['total_seconds'] for s in today)
+
+    def today_seconds(self, name, activity_type='app'):
+        return self.today_by_key.get((name, activity_type), 0)
+
+    def total_seconds(self, name, activity_type='app'):
+        return self.total_by_key.get((name, activity_type), 0)
+
+
+class LiveStatsProvider:
+    """
+    Builds a LiveStats at most once per max_age seconds: persisted totals from
+    StorageManager plus the write-behind queue's unflushed log time.
+    """
+
+    def __init__(self, storage, writer, max_age=1.0):
+        self.storage = storage
+        self.writer = writer
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._snapshot_time = 0
+        self.compute_count = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def snapshot(self):
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._snapshot_time < self.max_age:
+                return self._snapshot
+            self._snapshot = self._compute()
+            self._snapshot_time = time.monotonic()
+            return self._snapshot
+
+    def _compute(self):
+        now = datetime.now()
+        today = now.date()
+
+        # A flush between the two reads would move seconds from the overlay into the totals already read
+        (today_rows, total_rows, breakdown), unflushed = self.writer.read_with_unflushed(self._read_persisted)
+        today_map = {(s['name'], s['type']): dict(s) for s in today_rows}
+        total_map = {(s['name'], s['type']): dict(s) for s in total_rows}
+        breakdown.setdefault(today, {})
+
+        for (activity_id, day), seconds in unflushed.items():
+            activity = self.storage.get_activity_by_id(activity_id)
+            if not activity:
+                continue
+
+            self._add(total_map, activity, seconds)
+            if day == today:
+                self._add(today_map, activity, seconds)
+
+            day_data = breakdown.setdefault(day, {})
+            day_data[activity.name] = day_data.get(activity.name, 0) + seconds
+
+        today_stats = sorted(today_map.values(), key=lambda x: x['total_seconds'], reverse=True)
+        lifetime_stats = sorted(total_map.values(), key=lambda x: x['total_seconds'], reverse=True)
+
+        self.compute_count += 1
+        return LiveStats(
+            computed_at=now,
+            today=today_stats,
+            lifetime=lifetime_stats,
+            daily_breakdown=breakdown,
+            today_by_key={k: v['total_seconds'] for k, v in today_map.items()},
+            total_by_key={k: v['total_seconds'] for k, v in total_map.items()}
+        )
+
+    def _read_persisted(self):
+        return (
+            self.storage.get_today_stats(),
+            self.storage.get_activity_stats(),
+            self.storage.get_daily_activity_breakdown()
+        )
+
+    def _add(self, stats_map, activity, seconds):
+        key = (activity.name, activity.type)
+        entry = stats_map.get(key)
+        if entry is None:
+            stats_map[key] = {
+                "name": activity.name,
+                "type": activity.type,
+                "total_seconds": seconds,
+                "icon_path": activity.icon_path
+            }
+        else:
+            entry['total_seconds'] += seconds
@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import OrderedDict
+
+import psutil
+
+# psutil calls made for an uncached lookup: Process() (reads create_time), name(), exe()
+FULL_LOOKUP_CALLS = 3
+
+
+def _psutil_resolver(process):
+    process_name = process.name()
+    try:
+        executable_path = process.exe()
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        executable_path = None
+    return process_name, executable_path
+
+
+class ProcessInfoCache:
+    """
+    Caches (process_name, executable_path) per process for window enumeration.
+
+    Entries are keyed by pid and stamped with the process create_time, so a
+    recycled pid is detected and re-resolved. An entry checked within
+    revalidate_after seconds is served without any syscall; older entries
+    cost one create_time check. Processes that hide their create_time but
+    still report a name are cached under (pid, None) and revalidated the same
+    way, though a recycled pid cannot be told apart for those. Processes that
+    deny access entirely are cached as negative entries for denied_ttl
+    seconds so they are not retried on every pass. Entries for processes
+    that exited are dropped on revalidation or after idle_ttl seconds
+    without a lookup, and the cache is capped at max_entries (least
+    recently used first).
+
+    resolver(process) -> (name, exe) may be replaced, e.g. by a /proc reader.
+    """
+
+    def __init__(self, resolver=None, revalidate_after=5.0, denied_ttl=30.0, idle_ttl=60.0, max_entries=512):
+        self.resolver = resolver or _psutil_resolver
+        self.revalidate_after = revalidate_after
+        self.denied_ttl = denied_ttl
+        self.idle_ttl = idle_ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # pid -> {create_time, info, denied, checked_at, used_at}
+
+        self.hits = 0
+        self.misses = 0
+        self.denied_hits = 0
+        self.evictions = 0
+        self.syscalls_made = 0
+        self.syscalls_saved = 0
+        self._pass_start = (0, 0)
+        self.last_pass = {'syscalls_made': 0, 'syscalls_saved': 0}
+
+    def lookup(self, pid):
+        """Returns (process_name, executable_path), or None if the process is gone or denies access."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(pid)
+            if entry is not None:
+                fresh_for = self.denied_ttl if entry['denied'] else self.revalidate_after
+                if now - entry['checked_at'] < fresh_for:
+                    return self._hit(pid, entry, now, calls=0)
+
+        try:
+            process = psutil.Process(pid)
+            create_time = process.create_time()
+        except psutil.NoSuchProcess:
+            with self._lock:
+                self.syscalls_made += 1
+                self._evict(pid)
+            return None
+        except psutil.AccessDenied:
+            create_time = None
+
+        with self._lock:
+            entry = self._entries.get(pid)
+            # Unstamped entries only match while they hold a name; a denied one is retried after denied_ttl
+            if (entry is not None and entry['create_time'] == create_time
+                    and (create_time is not None or not entry['denied'])):
+                entry['checked_at'] = now
+                return self._hit(pid, entry, now, calls=1)
+
+        try:
+            info = self.resolver(process)
+            denied = not info or not info[0]
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            with self._lock:
+                self.syscalls_made += FULL_LOOKUP_CALLS
+                self._evict(pid)
+            return None
+        except psutil.AccessDenied:
+            info, denied = None, True
+
+        with self._lock:
+            self.misses += 1
+            self.syscalls_made += FULL_LOOKUP_CALLS
+            self._entries[pid] = {
+                'create_time': create_time,
+                'info': None if denied else info,
+                'denied': denied,
+                'checked_at': now,
+                'used_at': now
+            }
+            self._entries.move_to_end(pid)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return None if denied else info
+
+    def _hit(self, pid, entry, now, calls):
+        entry['used_at'] = now
+        self._entries.move_to_end(pid)
+        self.syscalls_made += calls
+        self.syscalls_saved += FULL_LOOKUP_CALLS - calls
+        if entry['denied']:
+            self.denied_hits += 1
+            return None
+        self.hits += 1
+        return entry['info']
+
+    def _evict(self, pid):
+        if self._entries.pop(pid, None) is not None:
+            self.evictions += 1
+
+    def begin_pass(self):
+        """Marks the start of an enumeration pass for last_pass accounting."""
+        with self._lock:
+            self._pass_start = (self.syscalls_made, self.syscalls_saved)
+
+    def end_pass(self):
+        """Records syscalls made/saved since begin_pass and drops entries idle longer than idle_ttl."""
+        now = time.monotonic()
+        with self._lock:
+            made, saved = self._pass_start
+            self.last_pass = {
+                'syscalls_made': self.syscalls_made - made,
+                'syscalls_saved': self.syscalls_saved - saved
+            }
+            for pid in [pid for pid, entry in self._entries.items() if now - entry['used_at'] > self.idle_ttl]:
+                self._evict(pid)
+            return self.last_pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'denied_hits': self.denied_hits,
+                'evictions': self.evictions,
+                'syscalls_made': self.syscalls_made,
+                'syscalls_saved': self.syscalls_saved,
+                'last_pass': dict(self.last_pass)
+            }
@@ -0,0 +1,212 @@
+import fnmatch
+import json
+import re
+
+RULES_SETTING_KEY = "tracking_rules"
+
+FIELD_PROCESS = "process"
+FIELD_EXE = "exe"
+FIELD_TITLE = "title"
+FIELDS = (FIELD_PROCESS, FIELD_EXE, FIELD_TITLE)
+
+MATCH_EXACT = "exact"
+MATCH_GLOB = "glob"
+MATCH_REGEX = "regex"
+MATCH_TYPES = (MATCH_EXACT, MATCH_GLOB, MATCH_REGEX)
+
+ACTION_TRACK = "track"    # track normally; use to carve exceptions out of later rules
+ACTION_IGNORE = "ignore"  # never tracked; while it has focus the previous app keeps running
+ACTIONS = (ACTION_TRACK, ACTION_IGNORE)
+
+
+def _rule(field, match, pattern, action, case_sensitive=False):
+    return {'field': field, 'match': match, 'pattern': pattern, 'case_sensitive': case_sensitive, 'action': action}
+
+
+DEFAULT_RULES = [
+    # Gainhour's own windows and dialogs
+    _rule(FIELD_TITLE, MATCH_GLOB, "*Gainhour*", ACTION_IGNORE, case_sensitive=True),
+    _rule(FIELD_TITLE, MATCH_EXACT, "Settings Saved", ACTION_IGNORE, case_sensitive=True),
+    _rule(FIELD_TITLE, MATCH_EXACT, "Add IRL Activity", ACTION_IGNORE, case_sensitive=True),
+    _rule(FIELD_TITLE, MATCH_EXACT, "Edit Activity", ACTION_IGNORE, case_sensitive=True),
+    _rule(FIELD_TITLE, MATCH_EXACT, "Add Description", ACTION_IGNORE, case_sensitive=True),
+    _rule(FIELD_TITLE, MATCH_EXACT, "Select Icon", ACTION_IGNORE, case_sensitive=True),
+    _rule(FIELD_TITLE, MATCH_EXACT, "Delete Activity", ACTION_IGNORE, case_sensitive=True),
+    _rule(FIELD_TITLE, MATCH_GLOB, "Activity Logs - *", ACTION_IGNORE, case_sensitive=True),
+    _rule(FIELD_TITLE, MATCH_EXACT, "Explorer", ACTION_IGNORE, case_sensitive=True),
+    # Shell processes
+    _rule(FIELD_PROCESS, MATCH_EXACT, "explorer.exe", ACTION_IGNORE),
+    _rule(FIELD_PROCESS, MATCH_EXACT, "SearchApp.exe", ACTION_IGNORE),
+    _rule(FIELD_PROCESS, MATCH_EXACT, "ShellExperienceHost.exe", ACTION_IGNORE),
+]
+
+
+def validate_rule(rule):
+    """Raises ValueError describing the first problem with rule."""
+    if rule.get('field') not in FIELDS:
+        raise ValueError(f"Unknown field '{rule.get('field')}'")
+    if rule.get('match') not in MATCH_TYPES:
+        raise ValueError(f"Unknown match type '{rule.get('match')}'")
+    if rule.get('action') not in ACTIONS:
+        raise ValueError(f"Unknown action '{rule.get('action')}'")
+    pattern = rule.get('pattern')
+    if not pattern:
+        raise ValueError("Pattern is empty")
+    if rule['match'] == MATCH_REGEX:
+        # Compile exactly what RuleSet compiles: inline global flags such as (?i) are only
+        # legal at the start of a pattern, and the wrapping moves them away from it
+        try:
+            re.compile(_regex_body(rule), re.DOTALL)
+        except re.error as e:
+            raise ValueError(f"Invalid regex '{pattern}': {e}")
+
+
+def load_rules(storage):
+    """
+    Returns the persisted rules, or the defaults if none were saved or they
+    cannot be read. Individual invalid rules are skipped.
+    """
+    raw = storage.get_setting(RULES_SETTING_KEY)
+    if not raw:
+        return [dict(r) for r in DEFAULT_RULES]
+    try:
+        stored = json.loads(raw)
+        if not isinstance(stored, list):
+            raise ValueError("Rules must be a list")
+    except (ValueError, TypeError) as e:
+        print(f"Error loading tracking rules, using defaults: {e}")
+        return [dict(r) for r in DEFAULT_RULES]
+
+    rules = []
+    for rule in stored:
+        try:
+            validate_rule(rule)
+        except (ValueError, TypeError, AttributeError, KeyError) as e:
+            print(f"Skipping invalid tracking rule {rule!r}: {e}")
+            continue
+        rules.append(rule)
+    return rules
+
+
+def save_rules(storage, rules):
+    for rule in rules:
+        validate_rule(rule)
+    storage.set_setting(RULES_SETTING_KEY, json.dumps(rules))
+
+
+def _regex_body(rule):
+    if rule['match'] == MATCH_GLOB:
+        body = fnmatch.translate(rule['pattern'])
+    else:
+        # Regex rules match anywhere in the value, like re.search
+        body = f".*?(?:{rule['pattern']})"
+    return body if rule.get('case_sensitive') else f"(?i:{body})"
+
+
+_BACKREFERENCE = re.compile(r"\\[1-9]")
+
+
+class _FieldMatcher:
+    """All rules for one field: hashed exact lookups plus one combined regex."""
+
+    def __init__(self, indexed_rules):
+        self.exact = {}     # value -> lowest rule index, case-sensitive
+        self.exact_ci = {}  # lowercased value -> lowest rule index
+        regex_rules = []
+
+        for index, rule in indexed_rules:
+            if rule['match'] == MATCH_EXACT:
+                table, key = (self.exact, rule['pattern']) if rule.get('case_sensitive') else (self.exact_ci, rule['pattern'].lower())
+                table.setdefault(key, index)
+            else:
+                regex_rules.append((index, rule))
+
+        self.combined = None
+        self.separate = []
+        if regex_rules:
+            # Numbered backreferences would point at the wrong group once patterns are combined
+            if not any(_BACKREFERENCE.search(r['pattern']) for _, r in regex_rules):
+                # Alternatives are tried in order, so the first group that matches is the lowest-index rule
+                try:
+                    self.combined = re.compile("|".join(f"(?P<r{i}>{_regex_body(r)})" for i, r in regex_rules), re.DOTALL)
+                except re.error:
+                    pass
+            if self.combined is None:
+                for i, r in regex_rules:
+                    try:
+                        self.separate.append((i, re.compile(_regex_body(r), re.DOTALL)))
+                    except re.error as e:
+                        print(f"Skipping tracking rule with invalid pattern '{r['pattern']}': {e}")
+
+    def first_match(self, value):
+        """Returns the lowest index of a rule matching value, or None."""
+        best = self.exact.get(value)
+        ci = self.exact_ci.get(value.lower()) if self.exact_ci else None
+        if ci is not None and (best is None or ci < best):
+            best = ci
+
+        if self.combined is not None:
+            m = self.combined.match(value)
+            if m and (best is None or int(m.lastgroup[1:]) < best):
+                best = int(m.lastgroup[1:])
+        else:
+            for index, pattern in self.separate:
+                if best is not None and index > best:
+                    break
+                if pattern.match(value):
+                    best = index
+                    break
+        return best
+
+
+class RuleSet:
+    """
+    Compiled ignore/classification rules.
+
+    Rules are dicts with field (process, exe, title), match (exact, glob,
+    regex), pattern, case_sensitive and action (track, ignore). The first
+    rule in list order that matches decides;
+    windows no rule matches are tracked. Each field compiles to hashed exact
+    sets plus a single alternation regex, and results are memoized per
+    (process, exe, title) so a window is only evaluated again when one of
+    those changes.
+    """
+
+    MAX_CACHED = 4096
+
+    def __init__(self, rules):
+        self.rules = [dict(r) for r in rules]
+        self._matchers = {
+            field: _FieldMatcher([(i, r) for i, r in enumerate(self.rules) if r['field'] == field])
+            for field in FIELDS
+        }
+        self._cache = {}
+        self.evaluations = 0
+
+    @classmethod
+    def from_storage(cls, storage):
+        return cls(load_rules(storage))
+
+    def classify(self, process_name, executable_path=None, title=None):
+        key = (process_name, executable_path, title)
+        action = self._cache.get(key)
+        if action is not None:
+            return action
+
+        self.evaluations += 1
+        best = None
+        for field, value in ((FIELD_PROCESS, process_name), (FIELD_EXE, executable_path), (FIELD_TITLE, title)):
+            if value is None:
+                continue
+            index = self._matchers[field].first_match(value)
+            if index is not None and (best is None or index < best):
+                best = index
+        action = self.rules[best]['action'] if best is not None else ACTION_TRACK
+
+        if len(self._cache) >= self.MAX_CACHED:
+            self._cache.clear()
+        self._cache[key] = action
+        return action
+
+    def classify_window(self, window):
+        return self.classify(window['process_name'], window.get('executable_path'), window.get('title'))
@@ -0,0 +1,109 @@
+import random
+import threading
+import time
+
+from .focus_watcher import WindowWatcher, window_key
+from .timing import get_clock
+
+
+class SimulatedBackend:
+    """
+    Deterministic, in-process WindowBackend that replays scripted frames.
+
+    Each frame is (timestamp, windows, focused): timestamp in seconds
+    relative to the start of the replay, windows a list of window dicts and
+    focused the window dict that has focus (or None). Frames are replayed in
+    order by ReplayWatcher, as fast as possible unless realtime is set, and
+    events carry the frame's timestamp so durations come out exactly as
+    scripted. finished is set once every frame has been applied.
+    """
+
+    name = "simulated"
+
+    def __init__(self, frames, realtime=False, start_time=None):
+        self.frames = list(frames)
+        self.realtime = realtime
+        self.start_time = start_time
+
+        self._lock = threading.Lock()
+        self._windows = []
+        self._focused = None
+
+        # Set idle_info to a (seconds idle, locked) tuple to simulate an idle or locked session
+        self.idle_info = None
+
+        self.frames_played = 0
+        self.finished = threading.Event()
+
+    @classmethod
+    def random_switches(cls, count, apps=10, interval=5.0, seed=0, **kwargs):
+        """Builds a backend whose focus jumps between `apps` open windows `count` times."""
+        rng = random.Random(seed)
+        windows = [
+            {
+                "hwnd": i + 1,
+                "title": f"Window {i}",
+                "process_name": f"app{i}.exe",
+                "executable_path": None
+            }
+            for i in range(apps)
+        ]
+        frames = []
+        for i in range(count):
+            focused = dict(rng.choice(windows))
+            if rng.random() < 0.3:
+                focused["title"] = f"{focused['title']} - page {rng.randrange(5)}"
+            frames.append((i * interval, windows, focused))
+        return cls(frames, **kwargs)
+
+    def _apply(self, windows, focused):
+        with self._lock:
+            self._windows = [dict(w) for w in windows]
+            self._focused = dict(focused) if focused else None
+
+    def get_active_window_info(self):
+        with self._lock:
+            return dict(self._focused) if self._focused else None
+
+    def get_open_windows(self):
+        with self._lock:
+            return [dict(w) for w in self._windows]
+
+    def get_idle_info(self):
+        return self.idle_info
+
+    def create_watcher(self, poll_interval=1.0):
+        return ReplayWatcher(self)
+
+
+class ReplayWatcher(WindowWatcher):
+    """Feeds a SimulatedBackend's frames to the tracker as focus/title/window events."""
+
+    def _run(self):
+        backend = self.backend
+        base = backend.start_time if backend.start_time is not None else time.time()
+        window_keys = None
+        last_windows = None
+
+        clock = get_clock()
+        for timestamp, windows, focused in backend.frames:
+            if not self._running:
+                break
+            wall = base + timestamp
+            if backend.realtime:
+                delay = wall - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            at = clock.from_wall(wall)
+
+            backend._apply(windows, focused)
+            if windows is not last_windows:
+                last_windows = windows
+                keys = {(window_key(w), w["title"]) for w in windows}
+                if keys != window_keys:
+                    window_keys = keys
+                    self._windows_changed(at, [dict(w) for w in windows])
+            self._focus_changed(backend.get_active_window_info(), at)
+            backend.frames_played += 1
+
+        backend.finished.set()
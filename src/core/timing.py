@@ -0,0 +1,120 @@
+import bisect
+import threading
+import time
+from datetime import datetime
+
+
+class MonotonicClock:
+    """
+    The tracker's time source.
+
+    Timestamps are time.monotonic() readings, so differences between them
+    (session durations, dwell and idle times) are immune to NTP steps, manual
+    clock changes and DST. Wall-clock datetimes for storage are derived
+    from a (wall, monotonic) anchor. now() re-anchors whenever wall minus
+    monotonic time moves by more than REANCHOR_AFTER seconds (the monotonic
+    clock stops during suspend on Linux; NTP or the user may step the wall
+    clock), and each reading converts with the anchor in effect when it was
+    taken, so stored dates follow the wall clock without rewriting the past.
+    """
+
+    REANCHOR_AFTER = 1.0
+    MAX_ANCHORS = 64
+
+    def __init__(self):
+        mono = time.monotonic()
+        # (monotonic readings where each anchor starts, wall - monotonic offset of each); replaced, never mutated
+        self._anchors = ((mono,), (time.time() - mono,))
+        self._lock = threading.Lock()
+        self.reanchors = 0
+
+    def now(self):
+        wall = time.time()
+        mono = time.monotonic()
+        if abs((wall - mono) - self._anchors[1][-1]) > self.REANCHOR_AFTER:
+            self._reanchor(wall, mono)
+        return mono
+
+    def _reanchor(self, wall, mono):
+        with self._lock:
+            starts, offsets = self._anchors
+            if abs((wall - mono) - offsets[-1]) <= self.REANCHOR_AFTER or mono < starts[-1]:
+                return
+            starts, offsets = starts + (mono,), offsets + (wall - mono,)
+            self._anchors = (starts[-self.MAX_ANCHORS:], offsets[-self.MAX_ANCHORS:])
+            self.reanchors += 1
+
+    def to_wall(self, mono):
+        starts, offsets = self._anchors
+        index = max(bisect.bisect_right(starts, mono) - 1, 0)
+        return mono + offsets[index]
+
+    def to_datetime(self, mono):
+        return datetime.fromtimestamp(self.to_wall(mono))
+
+    def from_wall(self, wall):
+        """Converts a time.time() value (e.g. a scripted replay timestamp) to this clock."""
+        return wall - self._anchors[1][-1]
+
+
+_clock = None
+
+
+def get_clock():
+    """Returns the process-wide clock shared by watchers, the tracker and the write-behind queue."""
+    global _clock
+    if _clock is None:
+        _clock = MonotonicClock()
+    return _clock
+
+
+def set_clock(clock):
+    global _clock
+    _clock = clock
+
+
+class TickStats:
+    """
+    Work time per tracker loop iteration as a histogram, plus overruns:
+    iterations whose work took longer than budget seconds, and heartbeat
+    deadlines that passed without a tick.
+    """
+
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+    def __init__(self, budget=0.1):
+        self.budget = budget
+        self._lock = threading.Lock()
+        self.histogram = [0] * (len(self.BUCKETS_MS) + 1)  # last bucket: above the largest bound
+        self.ticks = 0
+        self.overruns = 0
+        self.missed_deadlines = 0
+        self.max_work = 0.0
+        self.last_overrun = None  # (work seconds, monotonic time) of the most recent overrun
+
+    def record(self, work, at):
+        """Records one iteration's work time; returns True if it overran the budget."""
+        with self._lock:
+            self.ticks += 1
+            self.histogram[bisect.bisect_left(self.BUCKETS_MS, work * 1000)] += 1
+            self.max_work = max(self.max_work, work)
+            if work > self.budget:
+                self.overruns += 1
+                self.last_overrun = (work, at)
+                return True
+            return False
+
+    def missed(self, count):
+        with self._lock:
+            self.missed_deadlines += count
+
+    def get_stats(self):
+        with self._lock:
+            labels = [f"<={b}ms" for b in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+            return {
+                'ticks': self.ticks,
+                'overruns': self.overruns,
+                'missed_deadlines': self.missed_deadlines,
+                'max_work_ms': round(self.max_work * 1000, 2),
+                'histogram': {label: count for label, count in zip(labels, self.histogram) if count}
+            }
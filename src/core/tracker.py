@@ -1,13 +1,40 @@
+import queue
 import time
 import threading
-from datetime import datetime
-from .window_watcher import get_open_windows, get_active_window_info
+from .focus_watcher import create_watcher, window_key
 from .discord_rpc import DiscordRPC
+from .discord_presence import PresencePublisher
+from src.database.write_behind import WriteBehindQueue
+from src.database.checkpoint_journal import CheckpointJournal
+from .live_stats import LiveStatsProvider
+from .rules import RuleSet, RULES_SETTING_KEY, ACTION_TRACK, ACTION_IGNORE
+from .icon_worker import IconResolver
+from .timing import get_clock, TickStats
 
 class Tracker:
-    def __init__(self, storage_manager, icon_manager=None):
+    # Without focus events the loop still wakes this often to heartbeat open logs and refresh Discord
+    HEARTBEAT_INTERVAL = 5.0
+    # After this long without input the loop only wakes every IDLE_INTERVAL seconds
+    IDLE_AFTER = 60.0
+    IDLE_INTERVAL = 15.0
+
+    def __init__(self, storage_manager, icon_manager=None, watcher=None, backend=None):
         self.storage = storage_manager
+        self.watcher = watcher or create_watcher(backend)
+        self._change_listeners = []
+        # All tracker timestamps are MonotonicClock readings; see src/core/timing.py
+        self.clock = get_clock()
+        self.tick_stats = TickStats()
+        # Opening the crash journal empties it, so close what the last run left open from it first
+        self.storage.cleanup_incomplete_logs()
+        self.journal = CheckpointJournal(storage_manager.journal_path)
+        self.writer = WriteBehindQueue(
+            storage_manager, on_flush=lambda: self._notify_change("stats"), clock=self.clock, journal=self.journal
+        )
+        self.live_stats = LiveStatsProvider(storage_manager, self.writer)
         self.icon_manager = icon_manager
+        self.icon_resolver = IconResolver(icon_manager, on_resolved=self._on_icon_resolved) if icon_manager else None
+        self._resolved_icons = queue.SimpleQueue()   # activity ids whose icon a worker updated
         self.is_running = False
         
         self.current_activity = None 
@@ -17,78 +44,306 @@ class Tracker:
         self.last_window_title = None
         self.start_time = None 
         self.session_start_time = time.time() 
-        self.last_heartbeat = 0
         
         self.open_sessions = {}
+        self._window_pnames = {}   # window key -> process name, for windows counted in open_sessions
+        self._pname_windows = {}   # process name -> number of such windows
+        self._focused_pname = None
+        self._windows_resync = False
         
         self.manual_sessions = {} 
         self.manual_activities = {} 
         self.manual_desc_sessions = {}
         self.manual_start_times = {}
  
-        # Default ignored apps (can be modified)
-        self.ignored_apps = {"explorer.exe", "SearchApp.exe", "ShellExperienceHost.exe"}
+        # Persisted ignore/classification rules (Settings > Tracking Rules)
+        self.rules = RuleSet.from_storage(self.storage)
+        self.storage.subscribe_setting(RULES_SETTING_KEY, self._on_rules_changed)
+
+        # Apps stopped from the Home tab; ignored until restart or a manual start
+        self.ignored_apps = set()
+        self._ignored_lower = set()
         
         
         self.discord = DiscordRPC(client_id="1469935146579918868")
+        self.presence = PresencePublisher(self.discord)
         self.discord_pinned_activity = None
         self.discord_last_target_name = None
+        self.discord_enabled = self.storage.get_setting("discord_enabled", "True") == "True"
+        self.storage.subscribe_setting("discord_enabled", self._on_discord_setting_changed)
+
+        # Auto tracking pauses after this many seconds without input (0 = never) and while locked
+        self.idle_threshold = self._parse_idle_threshold(self.storage.get_setting("idle_threshold_minutes", "5"))
+        self.storage.subscribe_setting("idle_threshold_minutes", self._on_idle_setting_changed)
+        self.idle_paused = False
+        self.idle_pauses = 0
+        self.sample_interval = self.HEARTBEAT_INTERVAL
+
+        # Focus changes are only logged once the new window has held focus this long (0 = immediately);
+        # shorter visits are merged into the log that is already open
+        self.min_dwell = self._parse_min_dwell(self.storage.get_setting("min_focus_dwell_ms", "1000"))
+        self.storage.subscribe_setting("min_focus_dwell_ms", self._on_min_dwell_changed)
+        self._pending_focus = None   # (window info, time it took focus)
+        # Held by the loop for each iteration and by UI-thread paths that close the automatic log
+        self._state_lock = threading.RLock()
+        self.focus_switches_committed = 0
+        self.micro_segments_merged = 0
+        self.rows_avoided = 0
+    
+    def _on_discord_setting_changed(self, key, value):
+        self.discord_enabled = value == "True"
+
+    @staticmethod
+    def _parse_idle_threshold(value):
+        try:
+            return max(float(value), 0) * 60
+        except (TypeError, ValueError):
+            return 5 * 60
+
+    def _on_idle_setting_changed(self, key, value):
+        self.idle_threshold = self._parse_idle_threshold(value)
+
+    @staticmethod
+    def _parse_min_dwell(value):
+        try:
+            return max(float(value), 0) / 1000
+        except (TypeError, ValueError):
+            return 1.0
+
+    def _on_min_dwell_changed(self, key, value):
+        self.min_dwell = self._parse_min_dwell(value)
+
+    def get_debounce_stats(self):
+        return {
+            'min_dwell_ms': int(self.min_dwell * 1000),
+            'switches_committed': self.focus_switches_committed,
+            'micro_segments_merged': self.micro_segments_merged,
+            'rows_avoided': self.rows_avoided
+        }
+
+    def _on_rules_changed(self, key, value):
+        self.rules = RuleSet.from_storage(self.storage)
+        self._windows_resync = True
+        self._notify_change()
+
+    def add_change_listener(self, callback):
+        """Registers callback(topic), called from the tracker thread whenever tracked state changes."""
+        self._change_listeners.append(callback)
+
+    def _notify_change(self, topic="tracker"):
+        for callback in list(self._change_listeners):
+            try:
+                callback(topic)
+            except Exception as e:
+                print(f"Error in tracker change listener: {e}")
+
+    def has_running_sessions(self):
+        return bool(self.current_activity or self.manual_sessions)
+
+    def current_duration(self, name):
+        """Focused seconds of the open app session for name up to now, including the time since the last tick."""
+        sess = self.open_sessions.get(name)
+        if sess is None:
+            return 0.0
+        duration = sess['accumulated_time']
+        if sess['is_focused']:
+            duration += max(self.clock.now() - sess['last_update'], 0)
+        return duration
     
     def start(self):
         self.is_running = True
-        self.discord.connect()
+        self.writer.start()
+        self.watcher.start()
+        self.presence.start()
         self.thread = threading.Thread(target=self._loop)
         self.thread.daemon = True
         self.thread.start()
 
     def reconnect_discord(self):
         """Manually reconnect to Discord RPC if connection was lost."""
-        if self.discord.connected:
-            self.discord.clear()
-            self.discord.close()
-        
-        self.discord.connected = False
-        self.discord.connect()
+        self.presence.reconnect()
         self._update_discord()
 
     def _resolve_icon_path(self, process_name, executable_path):
-        if not self.icon_manager or not executable_path:
+        """Returns the icon known for the app right now, queueing extraction in the background if there is none."""
+        if not self.icon_resolver or not executable_path:
             return executable_path
-            
-        extracted = self.icon_manager.extract_icon(executable_path, process_name)
-        return extracted if extracted else executable_path
+
+        icon_path = self.icon_resolver.request(process_name, executable_path)
+        return icon_path if icon_path else executable_path
+
+    def _on_icon_resolved(self, process_name, executable_path, icon_path):
+        # Runs on an icon worker; only replaces missing or executable-path icons, never a .png the user picked
+        activity = self.storage.get_activity_by_name(process_name)
+        if not activity or activity.icon_path == icon_path:
+            return
+        if activity.icon_path and activity.icon_path.endswith('.png'):
+            return
+        updated = self.storage.update_activity(activity.id, icon_path=icon_path)
+        if updated:
+            # open_sessions and current_activity belong to the loop thread; it swaps the snapshot in
+            self._resolved_icons.put(updated.id)
+
+    def _apply_resolved_icons(self):
+        """Refreshes the activity snapshots held for icons resolved since the last iteration (loop thread)."""
+        changed = False
+        while True:
+            try:
+                activity_id = self._resolved_icons.get_nowait()
+            except queue.Empty:
+                break
+            updated = self.storage.get_activity_by_id(activity_id)
+            if not updated:
+                continue
+            sess = self.open_sessions.get(updated.name)
+            if sess and sess['activity'].id == updated.id:
+                sess['activity'] = updated
+                changed = True
+            if self.current_activity and self.current_activity.id == updated.id:
+                self.current_activity = updated
+                changed = True
+        if changed:
+            self._notify_change()
+
+    def get_live_stats(self):
+        """Today/lifetime/per-day totals including running sessions; computed at most once per tick."""
+        return self.live_stats.snapshot()
 
     def set_ignore_app(self, app_name, ignore=True):
-        if ignore:
-            self.ignored_apps.add(app_name)
-            if self.current_activity and self.current_activity.name == app_name:
-                self.stop_auto_tracking()
-        else:
-            if app_name in self.ignored_apps:
-                self.ignored_apps.remove(app_name)
+        with self._state_lock:
+            if ignore:
+                self.ignored_apps.add(app_name)
+                pending = self._pending_focus
+                if pending and pending[0]['process_name'] == app_name:
+                    # Otherwise the next tick could commit the switch to the app just ignored
+                    self._drop_pending_focus()
+                if self.current_activity and self.current_activity.name == app_name:
+                    self.stop_auto_tracking()
+            else:
+                if app_name in self.ignored_apps:
+                    self.ignored_apps.remove(app_name)
+            self._ignored_lower = {name.lower() for name in self.ignored_apps}
+            self._windows_resync = True
+        self._notify_change()
 
     def is_ignored(self, app_name):
-        return app_name in self.ignored_apps
+        return app_name.lower() in self._ignored_lower or self.rules.classify(app_name) == ACTION_IGNORE
+
+    def _is_window_excluded(self, win):
+        return win['process_name'].lower() in self._ignored_lower or self.rules.classify_window(win) != ACTION_TRACK
+
+    def _track_window(self, key, win, now, previous=None):
+        """Counts a window towards its process' open session; returns True if a session was added."""
+        if key in self._window_pnames or self._is_window_excluded(win):
+            return False
+        pname = win['process_name']
+        self._window_pnames[key] = pname
+        self._pname_windows[pname] = self._pname_windows.get(pname, 0) + 1
+        if pname in self.open_sessions:
+            return False
+
+        sess = previous.get(pname) if previous else None
+        if sess is None:
+            act = self.storage.get_or_create_activity(
+                name=pname,
+                activity_type='app',
+                description=win['title'],
+                icon_path=self._resolve_icon_path(pname, win.get('executable_path'))
+            )
+            sess = {
+                'activity': act,
+                'executable_path': win.get('executable_path'), 
+                'accumulated_time': 0.0,
+                'last_update': now,
+                'last_focus_time': now, 
+                'is_focused': False,
+                'window_title': win['title']
+            }
+        self.open_sessions[pname] = sess
+        return True
+
+    def _untrack_window(self, key):
+        """Drops a window; returns True if it was the last one of its process and the session closed."""
+        pname = self._window_pnames.pop(key, None)
+        if pname is None:
+            return False
+        count = self._pname_windows[pname] - 1
+        if count:
+            self._pname_windows[pname] = count
+            return False
+        del self._pname_windows[pname]
+        self.open_sessions.pop(pname, None)
+        if self._focused_pname == pname:
+            self._focused_pname = None
+        return True
+
+    def _apply_window_delta(self, now, windows=None):
+        """Updates open_sessions from the watcher's window changes only; returns True if sessions changed."""
+        delta = self.watcher.take_window_delta(windows)
+        if self._windows_resync:
+            # Ignore rules changed: re-evaluate every window once, keeping surviving sessions
+            self._windows_resync = False
+            previous = self.open_sessions
+            self.open_sessions = {}
+            self._window_pnames = {}
+            self._pname_windows = {}
+            for win in self.watcher.last_windows():
+                self._track_window(window_key(win), win, now, previous)
+            return set(previous) != set(self.open_sessions)
+
+        changed = False
+        for win in delta.closed:
+            changed |= self._untrack_window(window_key(win))
+        for win in delta.retitled:
+            key = window_key(win)
+            # A new title can move a window in or out of the excluded set
+            if self._is_window_excluded(win):
+                changed |= self._untrack_window(key)
+            else:
+                changed |= self._track_window(key, win, now)
+        for win in delta.opened:
+            changed |= self._track_window(window_key(win), win, now)
+        return changed
 
     def stop(self):
         self.is_running = False
+        self.watcher.stop()
+        # Let an iteration already in progress queue its opens/ends before the final flush below
+        self.watcher.wake()
+        thread = getattr(self, 'thread', None)
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=self.IDLE_INTERVAL + 5)
+        if thread and thread.is_alive():
+            # Committing here could race the loop into committing the same switch twice
+            print("Tracker loop did not stop in time; dropping the pending focus switch")
+            self._pending_focus = None
+        else:
+            # Only once the loop has exited, so it cannot commit the same switch; the UI-thread
+            # writers (stop_auto_tracking, set_ignore_app) run on this thread
+            self._settle_pending_focus(self.clock.now())
+        if self.icon_resolver:
+            self.icon_resolver.shutdown()
         if self.current_log_id:
-            self.storage.stop_logging(self.current_log_id)
+            self.writer.stop_logging(self.current_log_id)
+        if self.current_desc_log_id:
+            self.writer.stop_description_log(self.current_desc_log_id)
         
         for log_id in self.manual_sessions.values():
-            self.storage.stop_logging(log_id)
+            self.writer.stop_logging(log_id)
+        for desc_id in self.manual_desc_sessions.values():
+            self.writer.stop_description_log(desc_id)
         self.manual_sessions.clear()
+        self.manual_desc_sessions.clear()
         self.manual_start_times.clear()
         self.manual_activities.clear()
         
-        if self.discord.connected:
-            self.discord.clear()
-            self.discord.close()
+        self.writer.stop()
+        self.presence.stop()
 
     def start_manual_session(self, activity):
         """Starts a concurrent manual timer for an activity."""
         if activity.name in self.ignored_apps:
-            self.ignored_apps.remove(activity.name)
+            self.set_ignore_app(activity.name, False)
 
         if activity.id in self.manual_sessions:
             return 
@@ -96,20 +351,22 @@ class Tracker:
         if self.current_activity and self.current_activity.id == activity.id:
             self.stop_auto_tracking()
             
-        log_id = self.storage.start_logging(activity.id)
+        log_id = self.writer.start_logging(activity.id)
         self.manual_sessions[activity.id] = log_id
-        self.manual_start_times[activity.id] = time.time()
+        self.manual_start_times[activity.id] = self.clock.now()
         self.manual_activities[activity.id] = activity
         
         desc = activity.description if activity.description else "Manual Session"
-        desc_id = self.storage.start_description_log(activity.id, desc)
+        desc_id = self.writer.start_description_log(activity.id, desc)
         self.manual_desc_sessions[activity.id] = desc_id
+        self.live_stats.invalidate()
+        self._notify_change()
         
     def stop_manual_session(self, activity):
         """Stops a manual timer."""
         if activity.id in self.manual_sessions:
             log_id = self.manual_sessions.pop(activity.id)
-            self.storage.stop_logging(log_id)
+            self.writer.stop_logging(log_id)
             
             if activity.id in self.manual_start_times:
                 self.manual_start_times.pop(activity.id)
@@ -119,7 +376,9 @@ class Tracker:
             
             if activity.id in self.manual_desc_sessions:
                 desc_id = self.manual_desc_sessions.pop(activity.id)
-                self.storage.stop_description_log(desc_id)
+                self.writer.stop_description_log(desc_id)
+            self.live_stats.invalidate()
+            self._notify_change()
 
     def is_manual_running(self, activity_id):
         return activity_id in self.manual_sessions
@@ -129,26 +388,42 @@ class Tracker:
         if activity_id in self.manual_sessions:
             if activity_id in self.manual_desc_sessions:
                 old_desc_id = self.manual_desc_sessions.pop(activity_id)
-                self.storage.stop_description_log(old_desc_id)
+                self.writer.stop_description_log(old_desc_id)
             
-            new_desc_id = self.storage.start_description_log(activity_id, new_description)
+            new_desc_id = self.writer.start_description_log(activity_id, new_description)
             self.manual_desc_sessions[activity_id] = new_desc_id
+            
+            fresh = self.storage.get_activity_by_id(activity_id)
+            if fresh:
+                self.manual_activities[activity_id] = fresh
+            self._notify_change()
         
-    def stop_auto_tracking(self):
+    def stop_auto_tracking(self, at=None):
+        """Closes the automatic log and discards a pending focus switch; at is a clock reading (default: now)."""
+        with self._state_lock:
+            # A pending switch settled on the next tick would reopen a log right after this stop
+            self._drop_pending_focus()
+            self._end_auto_tracking(at)
+
+    def _end_auto_tracking(self, at=None):
+        """Closes the automatic log; the loop's own path, where a pending switch is still valid."""
+        was_tracking = self.current_activity is not None
         if self.current_log_id:
-            self.storage.stop_logging(self.current_log_id)
+            self.writer.stop_logging(self.current_log_id, at=at)
             self.current_log_id = None
             
         if self.current_desc_log_id:
-            self.storage.stop_description_log(self.current_desc_log_id)
+            self.writer.stop_description_log(self.current_desc_log_id, at=at)
             self.current_desc_log_id = None
 
         self.current_activity = None
         self.last_process_name = None
         self.last_window_title = None
         
-        if self.discord.connected:
-            self.discord.clear()
+        self._update_discord()
+        if was_tracking:
+            self.live_stats.invalidate()
+            self._notify_change()
 
     def set_discord_pin(self, activity):
         """Manually pins an activity for Discord status."""
@@ -156,16 +431,14 @@ class Tracker:
         self.discord_pinned_activity = activity
         print(f"DEBUG: Pinning Activity: {activity.name if activity else 'None'}")
         self._update_discord()
+        self._notify_change()
         
 
         
     def _update_discord(self):
-        if not self.discord.connected:
-            return
-
-        is_enabled = self.storage.get_setting("discord_enabled", "True") == "True"
-        if not is_enabled:
-            self.discord.clear()
+        """Works out the presence to show and hands it to the publisher; never waits on the Discord pipe."""
+        if not self.discord_enabled:
+            self.presence.publish(None)
             self.discord_last_target_name = None 
             return
 
@@ -200,17 +473,11 @@ class Tracker:
                  target = self.storage.get_activity_by_id(first_mid)
 
         if target:
-            fresh_act = self.storage.get_activity_by_id(target.id)
-            if fresh_act:
-                target.discord_visible = fresh_act.discord_visible
+            # Snapshots are immutable; the storage cache always holds the latest one.
+            target = self.storage.get_activity_by_id(target.id) or target
             
             if not target.discord_visible:
-                self.discord.update(
-                    details="Idling",
-                    state="Waiting for activity...",
-                    start=self.session_start_time
-                )
-                self.discord_last_target_name = "Idling"
+                self._publish_presence("Idling", "Waiting for activity...", "Idling")
                 return
                 
             state = target.description
@@ -227,19 +494,14 @@ class Tracker:
             
             if not state: state = target.description or "Active"
 
-            self.discord.update(
-                details=details,
-                state=state,
-                start=self.session_start_time
-            )
-            self.discord_last_target_name = target.name
+            self._publish_presence(details, state, target.name)
         else:
-            self.discord.update(
-                details="Idling",
-                state="Waiting for activity...",
-                start=self.session_start_time
-            )
-            self.discord_last_target_name = "Idling"
+            self._publish_presence("Idling", "Waiting for activity...", "Idling")
+
+    def _publish_presence(self, details, state, target_name):
+        self.presence.publish({'details': details, 'state': state, 'start': self.session_start_time})
+        # Only report a live target while connected, so Home does not show a pin Discord never got
+        self.discord_last_target_name = target_name if self.discord.connected else None
 
     def set_manual_activity(self, activity):
         self.start_manual_session(activity)
@@ -258,109 +520,224 @@ class Tracker:
     def set_automatic_mode(self):
         for act_id in list(self.manual_sessions.keys()):
             log_id = self.manual_sessions.pop(act_id)
-            self.storage.stop_logging(log_id)
+            self.writer.stop_logging(log_id)
+        self._notify_change()
 
     def _loop(self):
+        # Blocks on the watcher instead of sampling; focus/title events carry the
+        # window info and time of the switch, window-list events and heartbeats
+        # reuse the last focus seen so a queued switch is not applied early.
+        # Heartbeats run on a fixed grid of monotonic deadlines, so event handling
+        # and slow iterations never make the period drift.
+        active_info = self.watcher.initial_window
+        event = None
+        deadline = self.clock.now() + self.sample_interval
         while self.is_running:
+            work_started = time.perf_counter()
             try:
-                self._check_window()
-                self._update_discord()
+                with self._state_lock:
+                    self._apply_resolved_icons()
+                    windows = None
+                    if event is not None:
+                        if event.kind == "windows":
+                            windows = event.info
+                        else:
+                            active_info = event.info
+                    now = event.timestamp if event else None
+                    if self._update_idle(active_info):
+                        # Keep open_sessions in step with the window list, but count no focus
+                        self._check_window(None, now=now, windows=windows)
+                    else:
+                        self._check_window(active_info, now=now, windows=windows)
+                    self._update_discord()
+                    if self.clock.now() >= deadline:
+                        # Heartbeat: one fixed-size journal record per open log; the database only sees them on flush
+                        self.writer.checkpoint()
             except Exception as e:
                 print(f"Error in tracker loop: {e}")
-            time.sleep(1) 
 
-    def _check_window(self):
-        try:
-            open_windows = get_open_windows() 
-        except:
-            open_windows = []
+            now = self.clock.now()
+            if self.tick_stats.record(time.perf_counter() - work_started, now) and self.tick_stats.overruns == 1:
+                print(f"Tracker tick overran its {self.tick_stats.budget * 1000:.0f} ms budget")
+            deadline = self._next_deadline(deadline, now)
+
+            timeout = deadline - now
+            pending = self._pending_focus
+            if pending:
+                # Wake when the pending switch has held long enough to be committed
+                timeout = min(timeout, max(pending[1] + self.min_dwell - now, 0.01))
+            event = self.watcher.next_event(timeout=timeout)
+
+    def _next_deadline(self, deadline, now):
+        """Moves a passed heartbeat deadline forward by whole intervals, counting any that were missed."""
+        if now < deadline:
+            return deadline
+        missed = int((now - deadline) // self.sample_interval)
+        if missed:
+            self.tick_stats.missed(missed)
+        return deadline + (missed + 1) * self.sample_interval
+
+    def get_tick_stats(self):
+        return self.tick_stats.get_stats()
+
+    def _update_idle(self, active_info):
+        """
+        Pauses auto tracking once input has stopped for idle_threshold seconds
+        or the session is locked, and resumes it on input. The pause is dated
+        to the last input, so the coarse idle sampling costs no accuracy.
+        Returns whether tracking is paused.
+        """
+        get_idle_info = getattr(self.watcher.backend, "get_idle_info", None)
+        idle_info = get_idle_info() if get_idle_info else None
+        if idle_info is None:
+            self.sample_interval = self.HEARTBEAT_INTERVAL
+            return False
+
+        idle_seconds, locked = idle_info
+        last_input = self.clock.now() - idle_seconds
+        idle = locked or bool(self.idle_threshold and idle_seconds >= self.idle_threshold)
+
+        if idle and not self.idle_paused:
+            self.idle_paused = True
+            self.idle_pauses += 1
+            self._check_window(None, now=last_input)
+            self._end_auto_tracking(last_input)
+            self._notify_change()
+        elif not idle and self.idle_paused:
+            self.idle_paused = False
+            self._check_window(active_info, now=last_input)
+
+        # Input alone raises no watcher event, so an idle pause keeps the short wake to resume promptly
+        # (at the latest input seen); while locked, unlocking brings a focus event anyway.
+        if locked or (idle_seconds >= self.IDLE_AFTER and not self.idle_paused):
+            self.sample_interval = self.IDLE_INTERVAL
+        else:
+            self.sample_interval = self.HEARTBEAT_INTERVAL
+        return self.idle_paused
 
-        active_info = get_active_window_info()
+    def _check_window(self, active_info, now=None, windows=None):
+        now = self.clock.now() if now is None else now
         
-        if active_info:
-             if "Gainhour" in active_info['title'] or "Settings Saved" == active_info['title']:
-                 active_info = None
+        ignored_info = None
+        if active_info and self._is_window_excluded(active_info):
+            # Ignored windows (Gainhour's own, shell, user rules) count as no focus; the previous app keeps running
+            ignored_info, active_info = active_info, None
                  
         focused_name = active_info['process_name'] if active_info else None
         
-        current_pnames = set()
-        for win in open_windows:
-            pname = win['process_name']
-            if pname in self.ignored_apps or "Gainhour" in win['title'] or "Settings Saved" == win['title']:
-                continue
-            
-            current_pnames.add(pname)
-            
-            if pname not in self.open_sessions:
-                icon_path = self._resolve_icon_path(pname, win.get('executable_path'))
-
-                act = self.storage.get_or_create_activity(
-                    name=pname,
-                    activity_type='app',
-                    description=win['title'],
-                    icon_path=icon_path
-                )
-                self.open_sessions[pname] = {
-                    'activity': act,
-                    'executable_path': win.get('executable_path'), 
-                    'accumulated_time': 0.0,
-                    'last_update': time.time(),
-                    'last_focus_time': time.time(), 
-                    'is_focused': False
-                }
-        
-        for pname in list(self.open_sessions.keys()):
-            if pname not in current_pnames:
-                del self.open_sessions[pname]
+        if self._apply_window_delta(now, windows):
+            self._notify_change()
+
 
+        if self.current_activity and self.current_activity.name not in self.open_sessions:
 
-        if self.current_activity and self.current_activity.name not in current_pnames:
+             self._end_auto_tracking(now)
 
-             self.stop_auto_tracking()
 
+        # Only the sessions losing and gaining focus are touched
+        if self._focused_pname != focused_name:
+            old = self.open_sessions.get(self._focused_pname)
+            if old and old['is_focused']:
+                old['accumulated_time'] += max(now - old['last_update'], 0)
+                old['is_focused'] = False
+                old['last_update'] = now
+            self._focused_pname = focused_name
 
-        now = time.time()
-        for pname, sess in self.open_sessions.items():
+        sess = self.open_sessions.get(focused_name) if focused_name else None
+        if sess:
             if sess['is_focused']:
-                dt = now - sess['last_update']
-                sess['accumulated_time'] += dt
-            
-            is_detected_focused = (pname == focused_name)
-            sess['is_focused'] = is_detected_focused
+                sess['accumulated_time'] += max(now - sess['last_update'], 0)
+            sess['is_focused'] = True
             sess['last_update'] = now
-            
-            if is_detected_focused:
-                 sess['last_focus_time'] = now
+            sess['last_focus_time'] = now
 
-            if is_detected_focused and active_info:
-                 sess['activity'].description = active_info['title']
+            if active_info:
+                 pname = focused_name
+                 sess['window_title'] = active_info['title']
                  
                  act = sess['activity']
                  if (not act.icon_path or not act.icon_path.endswith('.png')) and sess.get('executable_path'):
+                      # Non-blocking: returns an icon a worker already resolved, otherwise
+                      # queues extraction and _on_icon_resolved stores the result
                       new_icon = self._resolve_icon_path(pname, sess['executable_path'])
                       if new_icon and new_icon.endswith('.png') and new_icon != act.icon_path:
-                           print(f"Auto-fetched missing icon for {pname}")
-                           act.icon_path = new_icon
-                           self.storage.get_session().commit()
-                           self.storage.update_activity(act.id, icon_path=new_icon)
-                           
-            else:
-                 pass
-                 pass
+                           sess['activity'] = self.storage.update_activity(act.id, icon_path=new_icon) or act
+
+        # A pending switch that held focus for min_dwell is committed at the time it took focus
+        self._settle_pending_focus(now)
 
-        if not active_info: return
-        title = active_info['title']
-        if "Gainhour" in title or title == "Add IRL Activity" or title == "Edit Activity" or title == "Add Description" or title == "Select Icon" or title == "Delete Activity" or title.startswith("Activity Logs - ") or title == "Explorer": 
+        if ignored_info:
+             self._drop_pending_focus()
+             if self.current_activity and self.current_activity.name == ignored_info['process_name']:
+                 self._end_auto_tracking(now)
+             return
+        if not active_info:
+             self._drop_pending_focus()
+             return
+
+        if self.min_dwell <= 0:
+            self._apply_focus(active_info, now)
             return
-        
+
+        key = (active_info['process_name'], active_info['title'])
+        pending = self._pending_focus
+        if pending is None or key != (pending[0]['process_name'], pending[0]['title']):
+            self._drop_pending_focus(returning_to=key)
+            if key != (self.last_process_name, self.last_window_title):
+                self._pending_focus = (active_info, now)
+
+        if self._pending_focus is None:
+            # Focus is on the committed window: heartbeat, and hand over to a manual session if one started
+            self._apply_focus(active_info, now)
+        else:
+            self._heartbeat_logs()
+
+    def _switch_rows(self, from_key, to_key):
+        """Log rows a focus change from from_key to to_key opens: a log and a description log, or just the latter."""
+        if from_key == to_key:
+            return 0
+        return 1 if from_key[0] == to_key[0] else 2
+
+    def _settle_pending_focus(self, now):
+        pending = self._pending_focus
+        if pending and now - pending[1] >= self.min_dwell:
+            self._pending_focus = None
+            self.focus_switches_committed += 1
+            self._apply_focus(*pending)
+
+    def _drop_pending_focus(self, returning_to=None):
+        """
+        Discards a pending switch that did not hold focus for min_dwell; its
+        time stays in the log that is still open. Rows that switching to it
+        (and back to returning_to) would have written are counted as avoided.
+        """
+        pending = self._pending_focus
+        if pending is None:
+            return
+        self._pending_focus = None
+        committed = (self.last_process_name, self.last_window_title)
+        pending_key = (pending[0]['process_name'], pending[0]['title'])
+        self.micro_segments_merged += 1
+        self.rows_avoided += self._switch_rows(committed, pending_key)
+        if returning_to == committed:
+            self.rows_avoided += self._switch_rows(pending_key, committed)
+
+    def _heartbeat_logs(self):
+        # Heartbeats only touch the write-behind queue; it coalesces them into one commit per flush.
+        if self.current_log_id:
+            self.writer.update_log_heartbeat(self.current_log_id)
+        if self.current_desc_log_id:
+            self.writer.update_desc_heartbeat(self.current_desc_log_id)
+
+        for mid in list(self.manual_sessions.values()):
+             self.writer.update_log_heartbeat(mid)
+        for did in list(self.manual_desc_sessions.values()):
+             self.writer.update_desc_heartbeat(did)
+
+    def _apply_focus(self, active_info, now):
+        """Opens/closes logs for a committed focus change, or heartbeats them if nothing changed."""
         process_name = active_info['process_name']
-        if process_name == "explorer.exe":
-             pass 
 
-        if process_name in self.ignored_apps or process_name.lower() in [i.lower() for i in self.ignored_apps]:
-             if self.current_activity and self.current_activity.name == process_name:
-                 self.stop_auto_tracking()
-             return
         activity = self.storage.get_or_create_activity(
             name=process_name, 
             activity_type='app',
@@ -370,50 +747,30 @@ class Tracker:
         
         if activity.id in self.manual_sessions:
             if self.current_log_id:
-                self.stop_auto_tracking()
+                self._end_auto_tracking(now)
             return
 
         if self.last_process_name != process_name:
-             self.stop_auto_tracking()
-             
-             activity = self.storage.get_or_create_activity(
-                name=process_name, 
-                activity_type='app',
-                description=active_info['title'],
-                icon_path=self._resolve_icon_path(process_name, active_info.get('executable_path'))
-            )
+             self._end_auto_tracking(now)
              
-             self.current_log_id = self.storage.start_logging(activity.id)
+             self.current_log_id = self.writer.start_logging(activity.id, at=now)
              self.current_activity = activity
              self.last_process_name = process_name
-             self.start_time = time.time()
+             self.start_time = now
              
-             self.current_desc_log_id = self.storage.start_description_log(activity.id, active_info['title'])
+             self.current_desc_log_id = self.writer.start_description_log(activity.id, active_info['title'], at=now)
              self.last_window_title = active_info['title']
+             self.live_stats.invalidate()
+             self._notify_change()
              
         else:
-            if time.time() - self.last_heartbeat > 30:
-                if self.current_log_id:
-                    self.storage.update_log_heartbeat(self.current_log_id)
-                if self.current_desc_log_id:
-                    self.storage.update_desc_heartbeat(self.current_desc_log_id)
-                
-                for mid in list(self.manual_sessions.values()):
-                     self.storage.update_log_heartbeat(mid)
-                for did in list(self.manual_desc_sessions.values()):
-                     self.storage.update_desc_heartbeat(did)
-                     
-                self.last_heartbeat = time.time()
+            self._heartbeat_logs()
 
             if self.last_window_title != active_info['title']:
                   self.last_window_title = active_info['title']
                   
                   if self.current_desc_log_id:
-                      self.storage.stop_description_log(self.current_desc_log_id)
-                  
-                  self.current_desc_log_id = self.storage.start_description_log(self.current_activity.id, active_info['title'])
+                      self.writer.stop_description_log(self.current_desc_log_id, at=now)
                   
-                  if self.current_activity.type != 'app':
-                      self.current_activity.description = active_info['title']
-
-
+                  self.current_desc_log_id = self.writer.start_description_log(self.current_activity.id, active_info['title'], at=now)
+                  self._notify_change()
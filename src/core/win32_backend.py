@@ -0,0 +1,141 @@
+import ctypes
+from ctypes import c_int, byref
+
+import psutil
+import win32gui
+import win32process
+
+from .process_cache import ProcessInfoCache
+
+DWMWA_CLOAKED = 13
+DESKTOP_SWITCHDESKTOP = 0x0100
+
+
+class LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+
+def is_cloaked(hwnd):
+    """Check if window is cloaked (Windows 8+)"""
+    cloaked = c_int(0)
+    try:
+        ctypes.windll.dwmapi.DwmGetWindowAttribute(hwnd, DWMWA_CLOAKED, byref(cloaked), ctypes.sizeof(cloaked))
+        return cloaked.value != 0
+    except:
+        return False
+
+
+def is_session_locked():
+    """True while the workstation is locked (the input desktop is not the user's)."""
+    user32 = ctypes.windll.user32
+    desktop = user32.OpenInputDesktop(0, False, DESKTOP_SWITCHDESKTOP)
+    if not desktop:
+        return True
+    try:
+        return not user32.SwitchDesktop(desktop)
+    finally:
+        user32.CloseDesktop(desktop)
+
+
+class Win32Backend:
+    """WindowBackend for Windows, built on pywin32 and psutil."""
+
+    name = "win32"
+
+    def __init__(self):
+        self.process_cache = ProcessInfoCache()
+
+    def get_active_window_info(self):
+        """
+        Returns a dictionary with window title and process name.
+        """
+        try:
+            window_handle = win32gui.GetForegroundWindow()
+            pid = win32process.GetWindowThreadProcessId(window_handle)[1]
+            process_info = self.process_cache.lookup(pid)
+            if not process_info:
+                return None
+            process_name, executable_path = process_info
+            window_title = win32gui.GetWindowText(window_handle)
+
+            # Filter
+            if not window_title.strip():
+                window_title = process_name
+
+            return {
+                "title": window_title,
+                "process_name": process_name,
+                "executable_path": executable_path
+            }
+        except Exception as e:
+            return None
+
+    def get_open_windows(self):
+        """
+        Returns a list of dictionaries with window info for all visible windows.
+        Filters out cloaked windows and tool windows.
+        """
+        windows = []
+
+        def enum_window_callback(hwnd, _):
+            if not win32gui.IsWindowVisible(hwnd):
+                return
+
+            window_title = win32gui.GetWindowText(hwnd)
+            if not window_title or not window_title.strip():
+                return
+
+            if is_cloaked(hwnd):
+                pass
+
+            try:
+                ex_style = win32gui.GetWindowLong(hwnd, -20)
+                if (ex_style & 0x00000080) and not (ex_style & 0x00040000):
+                    pass
+            except:
+                 pass
+
+            try:
+                _, pid = win32process.GetWindowThreadProcessId(hwnd)
+                process_info = self.process_cache.lookup(pid)
+                if not process_info:
+                    return
+                process_name, executable_path = process_info
+
+                windows.append({
+                    "hwnd": hwnd,
+                    "title": window_title,
+                    "process_name": process_name,
+                    "executable_path": executable_path
+                })
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+            except Exception:
+                pass
+
+        self.process_cache.begin_pass()
+        win32gui.EnumWindows(enum_window_callback, None)
+        self.process_cache.end_pass()
+        return windows
+
+    def get_idle_info(self):
+        """Returns (seconds since last keyboard/mouse input, locked), or None if it cannot be read."""
+        try:
+            info = LASTINPUTINFO()
+            info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+            if not ctypes.windll.user32.GetLastInputInfo(byref(info)):
+                return None
+            # Both are 32-bit tick counts; the mask handles the 49.7-day wraparound
+            idle_ms = (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+            return idle_ms / 1000.0, is_session_locked()
+        except Exception:
+            return None
+
+    def create_watcher(self, poll_interval=1.0):
+        from .focus_watcher import WinEventWatcher, PollingWatcher
+        try:
+            ctypes.windll.user32.SetWinEventHook
+            return WinEventWatcher(self)
+        except Exception as e:
+            print(f"WinEvent hooks unavailable, falling back to polling: {e}")
+            return PollingWatcher(self, poll_interval)
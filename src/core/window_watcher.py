@@ -1,94 +1,62 @@
-import pywintypes
-import win32gui
-import win32process
-import psutil
 import os
+import sys
+from typing import List, Optional, Protocol, Tuple
 
-def get_active_window_info():
+
+class WindowBackend(Protocol):
     """
-    Returns a dictionary with window title and process name.
+    Source of window/focus information for the tracker.
+
+    Window dicts always have "title", "process_name" and "executable_path"
+    (None when the process cannot be inspected); get_open_windows entries may
+    also carry a platform handle under "hwnd". create_watcher returns the
+    WindowWatcher that turns this backend into an event stream.
+    get_idle_info returns (seconds since the last user input, session locked),
+    or None if the platform cannot tell.
     """
-    try:
-        window_handle = win32gui.GetForegroundWindow()
-        pid = win32process.GetWindowThreadProcessId(window_handle)[1]
-        process = psutil.Process(pid)
-        process_name = process.name()
-        window_title = win32gui.GetWindowText(window_handle)
-        
-        # Filter
-        if not window_title.strip():
-            window_title = process_name
-
-        try:
-            executable_path = process.exe()
-        except (psutil.AccessDenied, psutil.ZombieProcess):
-            executable_path = None
-
-        return {
-            "title": window_title,
-            "process_name": process_name,
-            "executable_path": executable_path
-        }
-    except Exception as e:
-        return None
-import ctypes
-from ctypes import windll, c_int, byref
-
-DWMWA_CLOAKED = 13
-
-def is_cloaked(hwnd):
-    """Check if window is cloaked (Windows 8+)"""
-    cloaked = c_int(0)
-    try:
-        windll.dwmapi.DwmGetWindowAttribute(hwnd, DWMWA_CLOAKED, byref(cloaked), ctypes.sizeof(cloaked))
-        return cloaked.value != 0
-    except:
-        return False
+
+    name: str
+
+    def get_active_window_info(self) -> Optional[dict]:
+        ...
+
+    def get_open_windows(self) -> List[dict]:
+        ...
+
+    def get_idle_info(self) -> Optional[Tuple[float, bool]]:
+        ...
+
+    def create_watcher(self, poll_interval: float = 1.0):
+        ...
+
+
+_backend = None
+
+
+def get_backend():
+    """Returns the process-wide backend, loading the platform implementation on first use."""
+    global _backend
+    if _backend is None:
+        if sys.platform == "win32":
+            from .win32_backend import Win32Backend
+            _backend = Win32Backend()
+        elif sys.platform.startswith("linux") and os.environ.get("DISPLAY"):
+            from .x11_backend import X11Backend
+            _backend = X11Backend()
+        else:
+            raise RuntimeError(f"No window backend available for platform '{sys.platform}'")
+    return _backend
+
+
+def set_backend(backend):
+    """Replaces the process-wide backend, e.g. with a SimulatedBackend."""
+    global _backend
+    _backend = backend
+
+
+def get_active_window_info():
+    return get_backend().get_active_window_info()
+
 
 def get_open_windows():
-    """
-    Returns a list of dictionaries with window info for all visible windows.
-    Filters out cloaked windows and tool windows.
-    """
-    windows = []
-    
-    def enum_window_callback(hwnd, _):
-        if not win32gui.IsWindowVisible(hwnd):
-            return
-
-        window_title = win32gui.GetWindowText(hwnd)
-        if not window_title or not window_title.strip():
-            return
-            
-        if is_cloaked(hwnd):
-            pass
-
-        try:
-            ex_style = win32gui.GetWindowLong(hwnd, -20)
-            if (ex_style & 0x00000080) and not (ex_style & 0x00040000):
-                pass
-        except:
-             pass
-
-        try:
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            process = psutil.Process(pid)
-            process_name = process.name()
-            try:
-                executable_path = process.exe()
-            except (psutil.AccessDenied, psutil.ZombieProcess):
-                executable_path = None
-            
-            windows.append({
-                "hwnd": hwnd,
-                "title": window_title,
-                "process_name": process_name,
-                "executable_path": executable_path
-            })
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            pass
-        except Exception:
-            pass
-
-    win32gui.EnumWindows(enum_window_callback, None)
-    return windows
+    return get_backend().get_open_windows()
@@ -0,0 +1,285 @@
+import os
+import select
+import threading
+import time
+
+import psutil
+from Xlib import X, display as xdisplay, error as xerror
+from Xlib.ext import screensaver
+
+from .focus_watcher import WindowWatcher
+from .timing import get_clock
+from .process_cache import ProcessInfoCache
+
+
+def get_process_info(pid):
+    """Resolves (process_name, executable_path) for pid through /proc; executable_path is None if unreadable."""
+    try:
+        executable_path = os.readlink(f"/proc/{pid}/exe")
+    except OSError:
+        executable_path = None
+
+    if executable_path:
+        # Deleted binaries (e.g. after a package upgrade) show up as "/usr/bin/app (deleted)"
+        if executable_path.endswith(" (deleted)"):
+            executable_path = executable_path[:-len(" (deleted)")]
+        return os.path.basename(executable_path), executable_path
+
+    try:
+        with open(f"/proc/{pid}/comm", "r") as f:
+            return f.read().strip(), None
+    except OSError:
+        return None, None
+
+
+def _proc_resolver(process):
+    process_name, executable_path = get_process_info(process.pid)
+    if not process_name:
+        raise psutil.NoSuchProcess(process.pid)
+    return process_name, executable_path
+
+
+class X11Backend:
+    """
+    WindowBackend for X11 desktops with an EWMH-compliant window manager.
+
+    The active window and client list come from the root window's
+    _NET_ACTIVE_WINDOW and _NET_CLIENT_LIST, titles from _NET_WM_NAME (falling
+    back to WM_NAME) and the owning process from _NET_WM_PID via /proc.
+    """
+
+    name = "x11"
+
+    def __init__(self, display_name=None, display_factory=None):
+        self.display_name = display_name
+        # Opens a display connection for a display name; tests pass a fake server's connect
+        self.display_factory = display_factory or xdisplay.Display
+        self.process_cache = ProcessInfoCache(resolver=_proc_resolver)
+        self._lock = threading.Lock()
+        self.display = self.open_display()
+        self.root = self.display.screen().root
+
+        self.NET_ACTIVE_WINDOW = self.display.intern_atom("_NET_ACTIVE_WINDOW")
+        self.NET_CLIENT_LIST = self.display.intern_atom("_NET_CLIENT_LIST")
+        self.NET_WM_NAME = self.display.intern_atom("_NET_WM_NAME")
+        self.NET_WM_PID = self.display.intern_atom("_NET_WM_PID")
+        self.WM_NAME = self.display.intern_atom("WM_NAME")
+        self.UTF8_STRING = self.display.intern_atom("UTF8_STRING")
+        self.has_screensaver = self.display.has_extension("MIT-SCREEN-SAVER")
+
+    def open_display(self):
+        return self.display_factory(self.display_name)
+
+    def _root_property(self, atom):
+        prop = self.root.get_full_property(atom, X.AnyPropertyType)
+        return list(prop.value) if prop else []
+
+    def _window_title(self, window):
+        prop = window.get_full_property(self.NET_WM_NAME, self.UTF8_STRING)
+        if prop and prop.value:
+            value = prop.value
+            return value.decode("utf-8", "replace") if isinstance(value, bytes) else str(value)
+        name = window.get_wm_name()
+        if isinstance(name, bytes):
+            name = name.decode("latin-1", "replace")
+        return name or ""
+
+    def _window_info(self, window_id):
+        if not window_id:
+            return None
+        try:
+            window = self.display.create_resource_object("window", window_id)
+            title = self._window_title(window)
+            pid_prop = window.get_full_property(self.NET_WM_PID, X.AnyPropertyType)
+        except xerror.XError:
+            # The window went away between listing and querying it
+            return None
+        if not pid_prop or not pid_prop.value:
+            return None
+
+        process_info = self.process_cache.lookup(pid_prop.value[0])
+        if not process_info:
+            return None
+        process_name, executable_path = process_info
+        if not title.strip():
+            title = process_name
+
+        return {
+            "hwnd": window_id,
+            "title": title,
+            "process_name": process_name,
+            "executable_path": executable_path
+        }
+
+    def get_active_window_info(self):
+        with self._lock:
+            try:
+                active = self._root_property(self.NET_ACTIVE_WINDOW)
+                info = self._window_info(active[0]) if active else None
+            except xerror.XError:
+                return None
+        if info:
+            info.pop("hwnd")
+        return info
+
+    def get_open_windows(self):
+        windows = []
+        with self._lock:
+            try:
+                client_ids = self._root_property(self.NET_CLIENT_LIST)
+            except xerror.XError:
+                return windows
+            self.process_cache.begin_pass()
+            for window_id in client_ids:
+                info = self._window_info(window_id)
+                if info and info["title"].strip():
+                    windows.append(info)
+            self.process_cache.end_pass()
+        return windows
+
+    def get_idle_info(self):
+        """Idle time from the MIT-SCREEN-SAVER extension; an active screensaver counts as locked."""
+        if not self.has_screensaver:
+            return None
+        with self._lock:
+            try:
+                info = self.root.screensaver_query_info()
+            except xerror.XError:
+                return None
+        return info.idle / 1000.0, info.state == screensaver.StateOn
+
+    def create_watcher(self, poll_interval=1.0):
+        return X11EventWatcher(self, poll_interval=poll_interval)
+
+
+class X11EventWatcher(WindowWatcher):
+    """
+    Event-driven watcher for X11.
+
+    Listens for PropertyNotify on the root window (active window and client
+    list changes) and on every window in the client list (title changes)
+    over a dedicated display connection, sleeping in select() between
+    events. A title change on any client marks the window list changed, so
+    title rules are re-evaluated for background windows too; on the active
+    window it is also reported as a title event.
+
+    If the event loop fails it reconnects after a backoff that doubles from
+    initial_backoff up to max_backoff, re-reading the focus and window list
+    it may have missed. After max_restarts failures in a row (a loop that
+    ran for STABLE_AFTER seconds resets the count) it falls back to polling
+    every poll_interval seconds for the rest of the session.
+    """
+
+    STABLE_AFTER = 60.0
+
+    def __init__(self, backend, wake_interval=0.5, initial_backoff=1.0, max_backoff=30.0,
+                 max_restarts=5, poll_interval=1.0):
+        super().__init__(backend)
+        self.wake_interval = wake_interval
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.max_restarts = max_restarts
+        self.poll_interval = poll_interval
+        self._watched_clients = set()
+        self._active_id = 0
+
+        self.restarts = 0
+        self.polling = False
+
+    def _watch_clients(self, display, root):
+        """Subscribes to title changes on every window in _NET_CLIENT_LIST, dropping windows that left it."""
+        prop = root.get_full_property(self.backend.NET_CLIENT_LIST, X.AnyPropertyType)
+        client_ids = set(prop.value) if prop and prop.value else set()
+        for window_id in self._watched_clients - client_ids:
+            try:
+                display.create_resource_object("window", window_id).change_attributes(event_mask=X.NoEventMask)
+            except xerror.XError:
+                # Usually already destroyed, which ends the subscription anyway
+                pass
+        watched = set()
+        for window_id in client_ids:
+            if window_id in self._watched_clients:
+                watched.add(window_id)
+                continue
+            try:
+                display.create_resource_object("window", window_id).change_attributes(event_mask=X.PropertyChangeMask)
+                watched.add(window_id)
+            except xerror.XError:
+                pass
+        self._watched_clients = watched
+        display.flush()
+
+    def _read_active(self, root):
+        active = root.get_full_property(self.backend.NET_ACTIVE_WINDOW, X.AnyPropertyType)
+        self._active_id = active.value[0] if active and active.value else 0
+
+    def _sleep(self, seconds):
+        deadline = time.monotonic() + seconds
+        while self._running and time.monotonic() < deadline:
+            time.sleep(min(self.wake_interval, deadline - time.monotonic()))
+
+    def _run(self):
+        failures = 0
+        while self._running:
+            started = time.monotonic()
+            try:
+                self._listen(resync=self.restarts > 0)
+                return
+            except Exception as e:
+                failures = 1 if time.monotonic() - started >= self.STABLE_AFTER else failures + 1
+                if failures > self.max_restarts:
+                    print(f"X11 event loop failed {failures} times in a row ({e}); "
+                          f"falling back to polling every {self.poll_interval}s")
+                    self.polling = True
+                    self._poll(self.poll_interval)
+                    return
+                delay = min(self.initial_backoff * (2 ** (failures - 1)), self.max_backoff)
+                print(f"Error in X11 event loop, reconnecting in {delay:.1f}s: {e}")
+                self._sleep(delay)
+                self.restarts += 1
+
+    def _listen(self, resync=False):
+        backend = self.backend
+        display = backend.open_display()
+        self._watched_clients = set()
+        try:
+            root = display.screen().root
+            root.change_attributes(event_mask=X.PropertyChangeMask)
+
+            self._read_active(root)
+            self._watch_clients(display, root)
+            if resync:
+                # Changes made while the loop was down produced no events
+                now = get_clock().now()
+                self._focus_changed(backend.get_active_window_info(), now)
+                self._windows_changed(now)
+
+            title_atoms = (backend.NET_WM_NAME, backend.WM_NAME)
+            while self._running:
+                readable, _, _ = select.select([display.fileno()], [], [], self.wake_interval)
+                if not readable and not display.pending_events():
+                    continue
+
+                while display.pending_events():
+                    event = display.next_event()
+                    if event.type != X.PropertyNotify:
+                        continue
+                    now = get_clock().now()
+
+                    if event.window.id == root.id:
+                        if event.atom == backend.NET_ACTIVE_WINDOW:
+                            self._read_active(root)
+                            self._focus_changed(backend.get_active_window_info(), now)
+                        elif event.atom == backend.NET_CLIENT_LIST:
+                            self._watch_clients(display, root)
+                            self._windows_changed(now)
+                    elif event.atom in title_atoms:
+                        # A new title can move any window in or out of a title rule
+                        self._windows_changed(now)
+                        if event.window.id == self._active_id:
+                            self._focus_changed(backend.get_active_window_info(), now)
+        finally:
+            try:
+                display.close()
+            except Exception:
+                pass
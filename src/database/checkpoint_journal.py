@@ -0,0 +1,163 @@
+import os
+import struct
+import threading
+import time
+import zlib
+
+_MAGIC = b"GHCKPT01"
+
+# kind, flags, log id, end (time.time()), duration seconds, crc32 of the preceding 28 bytes
+_RECORD = struct.Struct("<BB2xQdqI")
+_BODY = struct.Struct("<BB2xQdq")
+
+_KIND_CODES = {'log': 1, 'desc': 2}
+_KIND_NAMES = {code: kind for kind, code in _KIND_CODES.items()}
+_FLAG_CLOSED = 1
+
+
+def journal_path_for(db_path):
+    """The checkpoint journal that belongs to the database at db_path."""
+    return f"{db_path}.checkpoint"
+
+
+def _pack(kind, log_id, end_wall, duration, closed):
+    body = _BODY.pack(_KIND_CODES[kind], _FLAG_CLOSED if closed else 0, log_id, end_wall, duration)
+    return body + struct.pack("<I", zlib.crc32(body))
+
+
+class CheckpointJournal:
+    """
+    Append-only file of fixed-size checkpoint records for open logs.
+
+    Every record says "log log_id of kind 'log'/'desc' ran until end_wall,
+    for duration seconds", optionally marking it closed there. append()
+    writes the records to the OS straight away, so they survive the process
+    dying; os.fsync, which protects against power loss, runs at most every
+    fsync_interval seconds. Once a log's close has reached the database,
+    forget() drops it, and the file is rewritten with only the latest record
+    per live log whenever it grows past max_bytes. close() after a clean
+    shutdown leaves an empty journal.
+
+    read() returns the latest valid record per log; torn or corrupt records
+    (e.g. a half-written tail after power loss) are skipped. Opening a
+    journal truncates it, so recover from it first (Tracker runs
+    StorageManager.cleanup_incomplete_logs before opening its journal).
+    """
+
+    def __init__(self, path, fsync_interval=5.0, max_bytes=256 * 1024):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._latest = {}   # (kind, log_id) -> packed record, for logs whose close is not yet in the database
+        self._file = open(path, "wb")
+        self._file.write(_MAGIC)
+        self._size = len(_MAGIC)
+        self._dirty = True
+        self._last_sync = 0.0
+
+        self.records_written = 0
+        self.syncs = 0
+        self.compactions = 0
+        self._sync()
+
+    @staticmethod
+    def read(path):
+        """Returns { (kind, log_id): (end_wall, duration, closed) } from the journal at path, or {} if there is none."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return {}
+        if not data.startswith(_MAGIC):
+            return {}
+
+        checkpoints = {}
+        for offset in range(len(_MAGIC), len(data) - _RECORD.size + 1, _RECORD.size):
+            code, flags, log_id, end_wall, duration, crc = _RECORD.unpack_from(data, offset)
+            if zlib.crc32(data[offset:offset + _BODY.size]) != crc or code not in _KIND_NAMES:
+                continue
+            checkpoints[(_KIND_NAMES[code], log_id)] = (end_wall, duration, bool(flags & _FLAG_CLOSED))
+        return checkpoints
+
+    def append(self, records):
+        """Appends (kind, log_id, end_wall, duration, closed) records in one write."""
+        with self._lock:
+            if self._file is None:
+                return
+            packed = []
+            for kind, log_id, end_wall, duration, closed in records:
+                record = _pack(kind, log_id, end_wall, duration, closed)
+                self._latest[(kind, log_id)] = record
+                packed.append(record)
+            if not packed:
+                return
+            data = b"".join(packed)
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+            self._dirty = True
+            self.records_written += len(packed)
+
+            if self._size > self.max_bytes:
+                self._compact()
+            elif time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def forget(self, kind, log_id):
+        """Stops carrying a log through compactions, once its close is safely in the database."""
+        with self._lock:
+            self._latest.pop((kind, log_id), None)
+
+    def sync(self):
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+
+    def _sync(self):
+        if not self._dirty:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._dirty = False
+        self._last_sync = time.monotonic()
+        self.syncs += 1
+
+    def _compact(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as tmp:
+            tmp.write(_MAGIC)
+            tmp.write(b"".join(self._latest.values()))
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "ab")
+        self._size = len(_MAGIC) + _RECORD.size * len(self._latest)
+        self._dirty = False
+        self._last_sync = time.monotonic()
+        self.compactions += 1
+
+    def close(self):
+        """Syncs and closes the journal, emptying it if no log is still waiting to reach the database."""
+        with self._lock:
+            if self._file is None:
+                return
+            if not self._latest:
+                self._file.seek(0)
+                self._file.truncate(len(_MAGIC))
+                self._dirty = True
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'bytes': self._size,
+                'live_logs': len(self._latest),
+                'records_written': self.records_written,
+                'syncs': self.syncs,
+                'compactions': self.compactions
+            }
@@ -0,0 +1,100 @@
+"""
+Schema migrations for gainhour.db.
+
+The schema version lives in ``PRAGMA user_version``. Each migration is a
+function taking a connection and is applied once, in order, inside its own
+transaction. Fresh databases are created from the models by ``create_all``
+and are stamped with the latest version without running anything.
+"""
+
+
+def _add_log_indexes(conn):
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_activity_logs_activity_start "
+        "ON activity_logs (activity_id, start_time)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_activity_logs_start "
+        "ON activity_logs (start_time)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_activity_desc_logs_activity_desc_start "
+        "ON activity_description_logs (activity_id, description, start_time)"
+    )
+
+
+def _unique_activity_name_type(conn):
+    """Replace the old UNIQUE(name) on activities with UNIQUE(name, type).
+
+    SQLite cannot drop a constraint, so the table is rebuilt: create the new
+    table, copy rows, drop the old one and rename the new one into place.
+    """
+    conn.exec_driver_sql("DROP TABLE IF EXISTS activities_new")
+    conn.exec_driver_sql(
+        "CREATE TABLE activities_new ("
+        "id INTEGER NOT NULL, "
+        "type VARCHAR, "
+        "name VARCHAR NOT NULL, "
+        "description VARCHAR, "
+        "icon_path VARCHAR, "
+        "discord_visible BOOLEAN, "
+        "created_at DATETIME, "
+        "PRIMARY KEY (id), "
+        "CONSTRAINT uq_activities_name_type UNIQUE (name, type))"
+    )
+    conn.exec_driver_sql(
+        "INSERT INTO activities_new (id, type, name, description, icon_path, discord_visible, created_at) "
+        "SELECT id, type, name, description, icon_path, discord_visible, created_at FROM activities"
+    )
+    conn.exec_driver_sql("DROP TABLE activities")
+    conn.exec_driver_sql("ALTER TABLE activities_new RENAME TO activities")
+
+
+def rebuild_daily_totals(conn):
+    """Regenerate activity_daily_totals from the raw activity_logs rows."""
+    conn.exec_driver_sql("DELETE FROM activity_daily_totals")
+    result = conn.exec_driver_sql(
+        "INSERT INTO activity_daily_totals (day, activity_id, seconds) "
+        "SELECT date(start_time), activity_id, SUM(duration_seconds) FROM activity_logs "
+        "WHERE activity_id IS NOT NULL AND start_time IS NOT NULL "
+        "GROUP BY date(start_time), activity_id "
+        "HAVING SUM(duration_seconds) IS NOT NULL"
+    )
+    return result.rowcount
+
+
+# Append new migrations to the end; never reorder or remove entries.
+MIGRATIONS = [
+    _add_log_indexes,
+    _unique_activity_name_type,
+    rebuild_daily_totals,  # the table itself is created by create_all
+]
+
+LATEST_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn):
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def _set_schema_version(conn, version):
+    conn.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+
+
+def run_migrations(engine, is_new_db=False):
+    """Bring the database up to LATEST_VERSION. Returns the number of migrations applied."""
+    with engine.begin() as conn:
+        if is_new_db:
+            _set_schema_version(conn, LATEST_VERSION)
+            return 0
+        current = get_schema_version(conn)
+
+    applied = 0
+    for version in range(current + 1, LATEST_VERSION + 1):
+        migration = MIGRATIONS[version - 1]
+        with engine.begin() as conn:
+            migration(conn)
+            _set_schema_version(conn, version)
+        print(f"Migration: upgraded schema to version {version} ({migration.__name__})")
+        applied += 1
+    return applied
@@ -1,16 +1,20 @@
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, ForeignKey, event
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy import create_engine, Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Index, UniqueConstraint, event, inspect
+from sqlalchemy.orm import declarative_base, relationship, sessionmaker, scoped_session
 from datetime import datetime
 import os
+import threading
 
 Base = declarative_base()
 
 class Activity(Base):
     __tablename__ = 'activities'
+    __table_args__ = (
+        UniqueConstraint('name', 'type', name='uq_activities_name_type'),
+    )
     
     id = Column(Integer, primary_key=True)
     type = Column(String)
-    name = Column(String, unique=True, nullable=False)
+    name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     icon_path = Column(String, nullable=True)
     discord_visible = Column(Boolean, default=True)
@@ -24,6 +28,10 @@ class Activity(Base):
 
 class ActivityLog(Base):
     __tablename__ = 'activity_logs'
+    __table_args__ = (
+        Index('ix_activity_logs_activity_start', 'activity_id', 'start_time'),
+        Index('ix_activity_logs_start', 'start_time'),
+    )
     
     id = Column(Integer, primary_key=True)
     activity_id = Column(Integer, ForeignKey('activities.id'))
@@ -38,6 +46,9 @@ class ActivityLog(Base):
 
 class ActivityDescriptionLog(Base):
     __tablename__ = 'activity_description_logs'
+    __table_args__ = (
+        Index('ix_activity_desc_logs_activity_desc_start', 'activity_id', 'description', 'start_time'),
+    )
 
     id = Column(Integer, primary_key=True)
     activity_id = Column(Integer, ForeignKey('activities.id'))
@@ -52,6 +63,16 @@ class ActivityDescriptionLog(Base):
         return f"<ActivityDescriptionLog(activity_id='{self.activity_id}', desc='{self.description}')>"
 
 
+class ActivityDailyTotal(Base):
+    """Rollup of ActivityLog.duration_seconds per activity per start day."""
+    __tablename__ = 'activity_daily_totals'
+
+    day = Column(Date, primary_key=True)
+    activity_id = Column(Integer, ForeignKey('activities.id'), primary_key=True)
+    seconds = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<ActivityDailyTotal(day='{self.day}', activity_id='{self.activity_id}', seconds={self.seconds})>"
 
 class Setting(Base):
     __tablename__ = 'settings'
@@ -65,8 +86,58 @@ def _fk_pragma_on_connect(dbapi_con, con_record):
     cursor.execute("PRAGMA synchronous=NORMAL")
     cursor.close()
 
+# One engine and one thread-local session registry per database file, shared by the whole process.
+_databases = {}
+_databases_lock = threading.Lock()
+
 def init_db(db_path="gainhour.db"):
-    engine = create_engine(f'sqlite:///{db_path}', connect_args={'check_same_thread': False, 'timeout': 15})
-    event.listen(engine, 'connect', _fk_pragma_on_connect)
-    Base.metadata.create_all(engine)
-    return sessionmaker(bind=engine)
+    """
+    Returns the process-wide scoped_session for db_path, creating the engine,
+    tables and migrations on first use. Each thread gets its own session.
+    """
+    key = os.path.abspath(db_path)
+    with _databases_lock:
+        db = _databases.get(key)
+        if db:
+            return db['Session']
+
+        engine = create_engine(f'sqlite:///{db_path}', connect_args={'check_same_thread': False, 'timeout': 15})
+        event.listen(engine, 'connect', _fk_pragma_on_connect)
+        stats = {'connections_opened': 0, 'checkouts': 0, 'sessions_created': 0}
+
+        def _on_connect(dbapi_con, con_record):
+            stats['connections_opened'] += 1
+
+        def _on_checkout(dbapi_con, con_record, con_proxy):
+            stats['checkouts'] += 1
+
+        event.listen(engine, 'connect', _on_connect)
+        event.listen(engine, 'checkout', _on_checkout)
+
+        is_new_db = not inspect(engine).has_table(Activity.__tablename__)
+        Base.metadata.create_all(engine)
+
+        from .migrations import run_migrations
+        run_migrations(engine, is_new_db)
+
+        factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+        def _create_session():
+            stats['sessions_created'] += 1
+            return factory()
+
+        Session = scoped_session(_create_session)
+        _databases[key] = {'engine': engine, 'Session': Session, 'stats': stats}
+        return Session
+
+def get_db_stats(db_path="gainhour.db"):
+    """Connection and session counters for the shared engine of db_path."""
+    db = _databases.get(os.path.abspath(db_path))
+    if not db:
+        return {}
+    pool = db['engine'].pool
+    result = dict(db['stats'])
+    result['engines'] = len(_databases)
+    result['checked_out'] = pool.checkedout() if hasattr(pool, 'checkedout') else 0
+    result['pool_size'] = pool.size() if hasattr(pool, 'size') else 0
+    return result
@@ -0,0 +1,81 @@
+import threading
+
+from .models import Setting
+
+
+class SettingsStore:
+    """
+    In-memory view of the settings table.
+
+    All rows are loaded on first access and reads are served from memory.
+    Writes go straight through to the database, then subscribers are told
+    about the keys whose value actually changed.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self._values = None
+        self._lock = threading.Lock()
+        self._subscribers = []  # (key or None, callback)
+
+    def _ensure_loaded(self):
+        """Returns the in-memory values, loading them first if needed; a concurrent reload() cannot take them away."""
+        values = self._values
+        if values is not None:
+            return values
+        session = self.storage.get_session()
+        try:
+            values = {s.key: s.value for s in session.query(Setting).all()}
+        finally:
+            self.storage.release_session(session)
+        with self._lock:
+            if self._values is None:
+                self._values = values
+            return self._values
+
+    def reload(self):
+        """Drops the in-memory copy so the next read loads from the database again."""
+        with self._lock:
+            self._values = None
+
+    def get(self, key, default=None):
+        return self._ensure_loaded().get(key, default)
+
+    def set(self, key, value):
+        value = str(value)
+        values = self._ensure_loaded()
+
+        session = self.storage.get_session()
+        try:
+            setting = session.get(Setting, key)
+            if not setting:
+                session.add(Setting(key=key, value=value))
+            else:
+                setting.value = value
+            self.storage.commit_session(session)
+        finally:
+            self.storage.release_session(session)
+
+        with self._lock:
+            if self._values is not None:
+                values = self._values
+            changed = values.get(key) != value
+            values[key] = value
+            subscribers = list(self._subscribers)
+
+        if changed:
+            for sub_key, callback in subscribers:
+                if sub_key is None or sub_key == key:
+                    try:
+                        callback(key, value)
+                    except Exception as e:
+                        print(f"Error in settings subscriber for {key}: {e}")
+
+    def subscribe(self, callback, key=None):
+        """Calls callback(key, value) after a setting changes. key=None subscribes to every key."""
+        with self._lock:
+            self._subscribers.append((key, callback))
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [(k, cb) for k, cb in self._subscribers if cb != callback]
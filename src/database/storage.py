@@ -1,38 +1,169 @@
-from .models import init_db, Activity, ActivityLog, ActivityDescriptionLog, Setting
+from .models import init_db, get_db_stats, Activity, ActivityLog, ActivityDescriptionLog, ActivityDailyTotal, Setting
 from datetime import datetime, timedelta
 import os
+import threading
+from contextlib import contextmanager
 from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from .settings_store import SettingsStore
+from .checkpoint_journal import CheckpointJournal, journal_path_for
+from .views import ActivityView
 
 class StorageManager:
     def __init__(self, db_path="gainhour.db"):
+        self.db_path = db_path
+        self.journal_path = journal_path_for(db_path)
         self.Session = init_db(db_path)
+        self._local = threading.local()
+        self.settings = SettingsStore(self)
+
+        # (name, type) -> ActivityView and id -> ActivityView for rows already read
+        self._activity_cache = {}
+        self._activity_cache_by_id = {}
+        self._activity_cache_lock = threading.Lock()
+        self.activity_cache_hits = 0
+        self.activity_cache_misses = 0
+
+        self._change_listeners = []
     
     def get_session(self):
+        """Returns this thread's session. Pair with release_session when done."""
         return self.Session()
-    
-    def get_activity_by_name(self, name, activity_type='app'):
+
+    def _in_unit_of_work(self):
+        return getattr(self._local, 'uow_depth', 0) > 0
+
+    def commit_session(self, session):
+        """Commits, or only flushes when inside unit_of_work (the unit commits at the end)."""
+        if self._in_unit_of_work():
+            session.flush()
+        else:
+            session.commit()
+
+    def rollback_session(self, session):
+        session.rollback()
+        if self._in_unit_of_work():
+            self._local.uow_failed = True
+            # Activities cached earlier in the unit may describe rows that were just rolled back
+            self.clear_activity_cache()
+
+    def release_session(self, session):
+        if not self._in_unit_of_work():
+            session.close()
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Groups several StorageManager calls made on this thread into one transaction.
+        Nested units join the outermost one. A failure in any step rolls back the whole unit.
+        """
+        depth = getattr(self._local, 'uow_depth', 0)
+        if depth == 0:
+            self._local.uow_failed = False
+        self._local.uow_depth = depth + 1
         session = self.get_session()
         try:
-            return session.query(Activity).filter_by(name=name, type=activity_type).first()
+            yield session
+        except Exception:
+            self._local.uow_failed = True
+            raise
         finally:
-            session.close()
+            self._local.uow_depth = depth
+            if depth == 0:
+                try:
+                    if self._local.uow_failed:
+                        session.rollback()
+                        self.clear_activity_cache()
+                    else:
+                        session.commit()
+                finally:
+                    session.close()
+
+    def get_connection_stats(self):
+        """Engine/pool/session counters, to check connections are reused under load."""
+        return get_db_stats(self.db_path)
+
+    def _cache_activity(self, activity):
+        """Snapshots an Activity row into the cache and returns the ActivityView."""
+        view = ActivityView.from_model(activity)
+        with self._activity_cache_lock:
+            old = self._activity_cache_by_id.get(view.id)
+            if old is not None:
+                self._activity_cache.pop((old.name, old.type), None)
+            self._activity_cache[(view.name, view.type)] = view
+            self._activity_cache_by_id[view.id] = view
+        return view
+
+    def _uncache_activity(self, activity_id):
+        with self._activity_cache_lock:
+            old = self._activity_cache_by_id.pop(activity_id, None)
+            if old is not None:
+                self._activity_cache.pop((old.name, old.type), None)
+
+    def _cached_activity(self, key, by_id=False):
+        with self._activity_cache_lock:
+            cache = self._activity_cache_by_id if by_id else self._activity_cache
+            activity = cache.get(key)
+            if activity is None:
+                self.activity_cache_misses += 1
+            else:
+                self.activity_cache_hits += 1
+            return activity
+
+    def clear_activity_cache(self):
+        with self._activity_cache_lock:
+            self._activity_cache.clear()
+            self._activity_cache_by_id.clear()
+
+    def get_activity_cache_stats(self):
+        with self._activity_cache_lock:
+            return {
+                "hits": self.activity_cache_hits,
+                "misses": self.activity_cache_misses,
+                "size": len(self._activity_cache_by_id)
+            }
+    
+    def add_change_listener(self, callback):
+        """Registers callback(topic), called after activities ("activities") or logs ("stats") are modified."""
+        self._change_listeners.append(callback)
+
+    def _notify_change(self, topic):
+        for callback in list(self._change_listeners):
+            try:
+                callback(topic)
+            except Exception as e:
+                print(f"Error in storage change listener: {e}")
+
+    def get_activity_by_name(self, name, activity_type='app'):
+        cached = self._cached_activity((name, activity_type))
+        if cached is not None:
+            return cached
 
-    def get_activity_by_id(self, activity_id):
         session = self.get_session()
         try:
-            return session.query(Activity).get(activity_id)
+            activity = session.query(Activity).filter_by(name=name, type=activity_type).first()
+            return self._cache_activity(activity) if activity else None
         finally:
-            session.close()
+            self.release_session(session)
 
     def get_activity_by_id(self, activity_id):
+        cached = self._cached_activity(activity_id, by_id=True)
+        if cached is not None:
+            return cached
+
         session = self.get_session()
         try:
-            return session.query(Activity).get(activity_id)
+            activity = session.query(Activity).get(activity_id)
+            return self._cache_activity(activity) if activity else None
         finally:
-            session.close()
+            self.release_session(session)
 
 
     def get_or_create_activity(self, name, activity_type='app', description=None, icon_path=None):
+        cached = self._cached_activity((name, activity_type))
+        if cached is not None and not (icon_path and not cached.icon_path):
+            return cached
+
         session = self.get_session()
         try:
             activity = session.query(Activity).filter_by(name=name, type=activity_type).first()
@@ -42,58 +173,138 @@ class StorageManager:
                     
                 activity = Activity(name=name, type=activity_type, description=description, icon_path=icon_path)
                 session.add(activity)
-                session.commit()
+                self.commit_session(session)
                 session.refresh(activity)
+                self._notify_change("activities")
             elif icon_path and not activity.icon_path:
                 activity.icon_path = icon_path
-                session.commit()
+                self.commit_session(session)
                 session.refresh(activity)
-            return activity
+                self._notify_change("activities")
+            return self._cache_activity(activity)
         finally:
-            session.close()
+            self.release_session(session)
 
     def start_logging(self, activity_id):
         session = self.get_session()
         try:
             log = ActivityLog(activity_id=activity_id, start_time=datetime.now())
             session.add(log)
-            session.commit()
+            self.commit_session(session)
             session.refresh(log)
             return log.id
         finally:
-            session.close()
+            self.release_session(session)
+
+    def _add_daily_total(self, session, activity_id, day, delta):
+        """Adds delta seconds to the activity_daily_totals row for (day, activity_id)."""
+        if not delta or activity_id is None:
+            return
+        stmt = sqlite_insert(ActivityDailyTotal).values(day=day, activity_id=activity_id, seconds=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ActivityDailyTotal.day, ActivityDailyTotal.activity_id],
+            set_={'seconds': ActivityDailyTotal.seconds + stmt.excluded.seconds}
+        )
+        session.execute(stmt)
+
+    def _set_log_duration(self, session, log, end_time, duration=None):
+        """
+        Closes log at end_time and moves the duration change into the daily rollup.
+        duration, if given, is used instead of end_time - start_time (e.g. measured on a monotonic clock).
+        """
+        old_duration = log.duration_seconds or 0
+        log.end_time = end_time
+        log.duration_seconds = int((log.end_time - log.start_time).total_seconds()) if duration is None else duration
+        self._add_daily_total(session, log.activity_id, log.start_time.date(), log.duration_seconds - old_duration)
 
     def stop_logging(self, log_id):
         session = self.get_session()
         try:
             log = session.query(ActivityLog).get(log_id)
             if log:
-                log.end_time = datetime.now()
-                log.duration_seconds = int((log.end_time - log.start_time).total_seconds())
-                session.commit()
+                self._set_log_duration(session, log, datetime.now())
+                self.commit_session(session)
         except Exception as e:
-            session.rollback()
+            self.rollback_session(session)
         finally:
-            session.close()
+            self.release_session(session)
             
+    def write_log_batch(self, opens, ends):
+        """
+        Applies queued log writes in a single transaction.
+        opens: [{'key', 'kind', 'activity_id', 'description', 'start_time'}] rows to insert.
+        ends: [{'kind', 'log_id' or 'key', 'end_time', optional 'duration_seconds'}] rows to stamp with an end time.
+        kind is 'log' for ActivityLog and 'desc' for ActivityDescriptionLog.
+        Returns { key: log_id } for the inserted rows.
+        """
+        session = self.get_session()
+        try:
+            activity_ids = {o['activity_id'] for o in opens}
+            existing = set()
+            if activity_ids:
+                existing = {row[0] for row in session.query(Activity.id).filter(Activity.id.in_(activity_ids))}
+
+            inserted = {}
+            for o in opens:
+                if o['activity_id'] not in existing:
+                    continue
+                if o['kind'] == 'log':
+                    log = ActivityLog(activity_id=o['activity_id'], start_time=o['start_time'])
+                else:
+                    log = ActivityDescriptionLog(activity_id=o['activity_id'], description=o['description'], start_time=o['start_time'])
+                session.add(log)
+                inserted[o['key']] = log
+            session.flush()
+            new_ids = {key: log.id for key, log in inserted.items()}
+
+            for e in ends:
+                log_id = e.get('log_id') or new_ids.get(e.get('key'))
+                if not log_id:
+                    continue
+                if e['kind'] == 'log':
+                    log = session.get(ActivityLog, log_id)
+                    if log:
+                        self._set_log_duration(session, log, e['end_time'], e.get('duration_seconds'))
+                else:
+                    log = session.get(ActivityDescriptionLog, log_id)
+                    if log:
+                        log.end_time = e['end_time']
+                        duration = e.get('duration_seconds')
+                        log.duration_seconds = int((log.end_time - log.start_time).total_seconds()) if duration is None else duration
+
+            self.commit_session(session)
+            return new_ids
+        except Exception:
+            self.rollback_session(session)
+            raise
+        finally:
+            self.release_session(session)
+
     def get_all_activities(self):
         session = self.get_session()
         try:
-            return session.query(Activity).all()
+            return [self._cache_activity(activity) for activity in session.query(Activity).all()]
         finally:
-            session.close()
+            self.release_session(session)
 
     def update_activity_visibility(self, activity_id, visible):
+        """Returns the updated ActivityView, or None if the activity does not exist."""
         session = self.get_session()
         try:
             activity = session.query(Activity).get(activity_id)
             if activity:
                 activity.discord_visible = visible
-                session.commit()
+                self.commit_session(session)
+                session.refresh(activity)
+                view = self._cache_activity(activity)
+                self._notify_change("activities")
+                return view
+            return None
         finally:
-            session.close()
+            self.release_session(session)
 
     def update_activity(self, activity_id, description=None, icon_path=None):
+        """Returns the updated ActivityView, or None if the activity does not exist."""
         session = self.get_session()
         try:
             activity = session.query(Activity).get(activity_id)
@@ -103,29 +314,64 @@ class StorageManager:
                         activity.description = description
                 if icon_path is not None:
                     activity.icon_path = icon_path
-                session.commit()
+                self.commit_session(session)
+                session.refresh(activity)
+                view = self._cache_activity(activity)
+                self._notify_change("activities")
+                return view
+            return None
         finally:
-            session.close()
+            self.release_session(session)
 
 
+    def _stats_from_rows(self, rows):
+        return [
+            {
+                "name": name,
+                "type": act_type,
+                "total_seconds": total_seconds,
+                "icon_path": icon_path
+            }
+            for name, act_type, icon_path, total_seconds in rows
+        ]
+
+    def _grouped_stats(self, start_dt=None, end_dt=None):
+        """Per-activity duration totals in one SUM/GROUP BY, optionally limited to [start_dt, end_dt)."""
+        session = self.get_session()
+        try:
+            total = func.sum(ActivityLog.duration_seconds)
+            query = session.query(
+                Activity.name,
+                Activity.type,
+                Activity.icon_path,
+                total
+            ).join(ActivityLog, ActivityLog.activity_id == Activity.id)
+
+            if start_dt is not None:
+                query = query.filter(ActivityLog.start_time >= start_dt)
+            if end_dt is not None:
+                query = query.filter(ActivityLog.start_time < end_dt)
+
+            rows = query.group_by(Activity.id).having(total > 0).order_by(total.desc()).all()
+            return self._stats_from_rows(rows)
+        finally:
+            self.release_session(session)
+
     def get_activity_stats(self):
         session = self.get_session()
         try:
-            activities = session.query(Activity).all()
-            stats = []
-            for activity in activities:
-                total_seconds = sum(log.duration_seconds for log in activity.logs if log.duration_seconds)
-                if total_seconds > 0:
-                     stats.append({
-                        "name": activity.name,
-                        "type": activity.type,
-                        "total_seconds": total_seconds,
-                        "icon_path": activity.icon_path
-                    })
-            stats.sort(key=lambda x: x['total_seconds'], reverse=True)
-            return stats
+            total = func.sum(ActivityDailyTotal.seconds)
+            rows = session.query(
+                Activity.name,
+                Activity.type,
+                Activity.icon_path,
+                total
+            ).join(ActivityDailyTotal, ActivityDailyTotal.activity_id == Activity.id).group_by(
+                Activity.id
+            ).having(total > 0).order_by(total.desc()).all()
+            return self._stats_from_rows(rows)
         finally:
-            session.close()
+            self.release_session(session)
 
     def get_activity_duration(self, name, activity_type='app'):
         session = self.get_session()
@@ -139,7 +385,7 @@ class StorageManager:
             ).scalar()
             return total if total else 0
         finally:
-            session.close()
+            self.release_session(session)
 
     def get_today_duration(self, name, activity_type='app'):
         session = self.get_session()
@@ -156,7 +402,7 @@ class StorageManager:
             ).scalar()
             return total if total else 0
         finally:
-            session.close()
+            self.release_session(session)
 
     def get_total_today_duration(self):
         session = self.get_session()
@@ -167,63 +413,16 @@ class StorageManager:
             ).scalar()
             return total if total else 0
         finally:
-            session.close()
+            self.release_session(session)
 
     def get_today_stats(self):
-        session = self.get_session()
-        try:
-            today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            activities = session.query(Activity).all()
-            stats = []
-            
-            for activity in activities:
-                total_seconds = sum(
-                    log.duration_seconds for log in activity.logs 
-                    if log.start_time >= today_start and log.duration_seconds
-                )
-                
-                if total_seconds > 0:
-                    stats.append({
-                        "name": activity.name,
-                        "type": activity.type,
-                        "total_seconds": total_seconds,
-                        "icon_path": activity.icon_path
-                    })
-            
-            stats.sort(key=lambda x: x['total_seconds'], reverse=True)
-            stats.sort(key=lambda x: x['total_seconds'], reverse=True)
-            return stats
-        finally:
-            session.close()
+        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return self._grouped_stats(start_dt=today_start)
 
     def get_daily_stats(self, target_date):
         """Get stats for a specific date (date object)."""
-        session = self.get_session()
-        try:
-            start_dt = datetime.combine(target_date, datetime.min.time())
-            end_dt = datetime.combine(target_date, datetime.max.time())
-            
-            activities = session.query(Activity).all()
-            stats = []
-            
-            for activity in activities:
-                total_seconds = sum(
-                    log.duration_seconds for log in activity.logs 
-                    if log.start_time >= start_dt and log.start_time <= end_dt and log.duration_seconds
-                )
-                
-                if total_seconds > 0:
-                    stats.append({
-                        "name": activity.name,
-                        "type": activity.type,
-                        "total_seconds": total_seconds,
-                        "icon_path": activity.icon_path
-                    })
-            
-            stats.sort(key=lambda x: x['total_seconds'], reverse=True)
-            return stats
-        finally:
-            session.close()
+        start_dt = datetime.combine(target_date, datetime.min.time())
+        return self._grouped_stats(start_dt=start_dt, end_dt=start_dt + timedelta(days=1))
 
 
     def clean_explorer_data(self):
@@ -232,24 +431,27 @@ class StorageManager:
             activity = session.query(Activity).filter_by(name="explorer.exe").first()
             if activity:
                 session.query(ActivityLog).filter_by(activity_id=activity.id).delete()
+                session.query(ActivityDailyTotal).filter_by(activity_id=activity.id).delete()
                 session.delete(activity)
-                session.commit()
+                self.commit_session(session)
+                self._uncache_activity(activity.id)
+                self._notify_change("activities")
         except Exception as e:
             print(f"Error cleaning explorer data: {e}")
-            session.rollback()
+            self.rollback_session(session)
         finally:
-            session.close()
+            self.release_session(session)
 
     def start_description_log(self, activity_id, description):
         session = self.get_session()
         try:
             log = ActivityDescriptionLog(activity_id=activity_id, description=description, start_time=datetime.now())
             session.add(log)
-            session.commit()
+            self.commit_session(session)
             session.refresh(log)
             return log.id
         finally:
-            session.close()
+            self.release_session(session)
 
     def stop_description_log(self, log_id):
         session = self.get_session()
@@ -258,9 +460,9 @@ class StorageManager:
             if log:
                 log.end_time = datetime.now()
                 log.duration_seconds = int((log.end_time - log.start_time).total_seconds())
-                session.commit()
+                self.commit_session(session)
         finally:
-            session.close()
+            self.release_session(session)
 
     def update_log_heartbeat(self, log_id):
         """Update end_time of a log to now without closing it conceptually (keeps it valid)."""
@@ -270,14 +472,33 @@ class StorageManager:
         self.stop_description_log(log_id)
 
     def cleanup_incomplete_logs(self):
-        """Close any logs that were left open (NULL end_time) due to crashes."""
+        """
+        Closes logs left open by a crash. Logs checkpointed in the tracker's
+        journal are closed at their last checkpoint; any other log still
+        without an end_time is closed at its start.
+        """
+        checkpoints = CheckpointJournal.read(self.journal_path)
         session = self.get_session()
         try:
+            recovered = 0
+            for (kind, log_id), (end_wall, duration, closed) in checkpoints.items():
+                log = session.query(ActivityLog if kind == 'log' else ActivityDescriptionLog).get(log_id)
+                end_time = datetime.fromtimestamp(end_wall)
+                if log is None or end_time < log.start_time:
+                    continue
+                if log.end_time is not None and (log.end_time == end_time if closed else log.end_time >= end_time):
+                    continue
+                if kind == 'log':
+                    self._set_log_duration(session, log, end_time, duration)
+                else:
+                    log.end_time = end_time
+                    log.duration_seconds = duration
+                recovered += 1
+
             incomplete_logs = session.query(ActivityLog).filter(ActivityLog.end_time == None).all()
             count = 0
             for log in incomplete_logs:
-                log.end_time = log.start_time
-                log.duration_seconds = 0
+                self._set_log_duration(session, log, log.start_time)
                 count += 1
 
             incomplete_desc = session.query(ActivityDescriptionLog).filter(ActivityDescriptionLog.end_time == None).all()
@@ -287,10 +508,10 @@ class StorageManager:
                 log.duration_seconds = 0
                 d_count += 1
                 
-            session.commit()
-            print(f"Cleanup: Closed {count} logs and {d_count} desc logs.")
+            self.commit_session(session)
+            print(f"Cleanup: Recovered {recovered} logs from checkpoints, closed {count} logs and {d_count} desc logs.")
         finally:
-            session.close()
+            self.release_session(session)
 
     def get_description_stats(self, activity_id, description):
         session = self.get_session()
@@ -302,7 +523,7 @@ class StorageManager:
                 "total_seconds": total_duration if total_duration else 0
             }
         finally:
-            session.close()
+            self.release_session(session)
 
     def get_activity_description_logs(self, activity_id, today_only=False):
         """
@@ -362,7 +583,7 @@ class StorageManager:
                 
             return result
         finally:
-            session.close()
+            self.release_session(session)
     
 
     def delete_activity(self, activity_id):
@@ -382,40 +603,30 @@ class StorageManager:
 
             session.query(ActivityLog).filter_by(activity_id=activity_id).delete()
             session.query(ActivityDescriptionLog).filter_by(activity_id=activity_id).delete()
+            session.query(ActivityDailyTotal).filter_by(activity_id=activity_id).delete()
             
 
             session.delete(activity)
-            session.commit()
+            self.commit_session(session)
+            self._uncache_activity(activity_id)
+            self._notify_change("activities")
             return True
         except Exception as e:
             print(f"Error deleting activity {activity_id}: {e}")
-            session.rollback()
+            self.rollback_session(session)
             return False
         finally:
-            session.close()
+            self.release_session(session)
 
     def get_setting(self, key, default=None):
-        session = self.get_session()
-        try:
-            from src.database.models import Setting
-            setting = session.query(Setting).get(key)
-            return setting.value if setting else default
-        finally:
-            session.close()
+        return self.settings.get(key, default)
 
     def set_setting(self, key, value):
-        session = self.get_session()
-        try:
-            from src.database.models import Setting
-            setting = session.query(Setting).get(key)
-            if not setting:
-                setting = Setting(key=key, value=str(value)) 
-                session.add(setting)
-            else:
-                setting.value = str(value)
-            session.commit()
-        finally:
-            session.close()
+        self.settings.set(key, value)
+
+    def subscribe_setting(self, key, callback):
+        """Calls callback(key, value) whenever the given setting changes."""
+        self.settings.subscribe(callback, key=key)
 
     def cleanup_old_description_logs(self):
         """Deletes all description logs that started before today (00:00:00)."""
@@ -425,36 +636,31 @@ class StorageManager:
             today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
 
             deleted = session.query(ActivityDescriptionLog).filter(ActivityDescriptionLog.start_time < today_start).delete()
-            session.commit()
+            self.commit_session(session)
             print(f"Cleanup: Deleted {deleted} old description logs.")
             return deleted
         except Exception as e:
             print(f"Error cleaning old logs: {e}")
-            session.rollback()
+            self.rollback_session(session)
         finally:
-            session.close()
+            self.release_session(session)
 
     def get_daily_activity_breakdown(self):
         """
         Returns { date_obj: { activity_name: total_seconds } }
-        Aggregates duration per activity per day.
+        Reads the activity_daily_totals rollup, so cost scales with days rather than log rows.
         """
         session = self.get_session()
         try:
             data = session.query(
-                func.date(ActivityLog.start_time),
+                ActivityDailyTotal.day,
                 Activity.name,
-                func.sum(ActivityLog.duration_seconds)
-            ).join(Activity).group_by(func.date(ActivityLog.start_time), Activity.name).all()
+                func.sum(ActivityDailyTotal.seconds)
+            ).join(Activity).group_by(ActivityDailyTotal.day, Activity.name).all()
             
             result = {}
-            for day_str, act_name, duration in data:
-                if not day_str or not duration: 
-                    continue
-                
-                try:
-                    day = datetime.strptime(day_str, "%Y-%m-%d").date()
-                except ValueError:
+            for day, act_name, duration in data:
+                if not day or not duration: 
                     continue
                     
                 if day not in result:
@@ -463,23 +669,44 @@ class StorageManager:
                 
             return result
         finally:
-            session.close()
+            self.release_session(session)
+
+    def rebuild_daily_totals(self):
+        """Regenerates the activity_daily_totals rollup from the raw logs."""
+        session = self.get_session()
+        try:
+            from src.database.migrations import rebuild_daily_totals
+            rows = rebuild_daily_totals(session.connection())
+            self.commit_session(session)
+            print(f"Rebuild: Wrote {rows} daily total rows.")
+            return rows
+        except Exception as e:
+            print(f"Error rebuilding daily totals: {e}")
+            self.rollback_session(session)
+            return 0
+        finally:
+            self.release_session(session)
 
     def wipe_data(self):
         """Hard resets the database by wiping all tables."""
         session = self.get_session()
         try:
-            from src.database.models import Activity, ActivityLog, ActivityDescriptionLog, Setting
+            from src.database.models import Activity, ActivityLog, ActivityDescriptionLog, ActivityDailyTotal, Setting
+            session.query(ActivityDailyTotal).delete()
             session.query(ActivityDescriptionLog).delete()
             session.query(ActivityLog).delete()
             session.query(Activity).delete()
             session.query(Setting).delete()
-            session.commit()
+            self.commit_session(session)
+            self.clear_activity_cache()
+            self.settings.reload()
+            self._notify_change("activities")
+            self._notify_change("stats")
             print("Database wiped successfully.")
             return True
         except Exception as e:
             print(f"Error wiping database: {e}")
-            session.rollback()
+            self.rollback_session(session)
             return False
         finally:
-            session.close()
+            self.release_session(session)
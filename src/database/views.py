@@ -0,0 +1,39 @@
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ActivityView:
+    """
+    Immutable snapshot of an Activity row, returned by StorageManager reads.
+
+    Unlike a detached ORM instance it cannot lazy-load or be mutated by
+    accident, so it is safe to cache and to share between the tracker and UI
+    threads. Change an activity through StorageManager.update_activity /
+    update_activity_visibility, which return the new snapshot.
+    """
+    __slots__ = ('id', 'name', 'type', 'description', 'icon_path', 'discord_visible', 'created_at')
+
+    id: int
+    name: str
+    type: str
+    description: Optional[str]
+    icon_path: Optional[str]
+    discord_visible: bool
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, activity):
+        return cls(
+            id=activity.id,
+            name=activity.name,
+            type=activity.type,
+            description=activity.description,
+            icon_path=activity.icon_path,
+            discord_visible=activity.discord_visible if activity.discord_visible is not None else True,
+            created_at=activity.created_at
+        )
+
+    def with_changes(self, **changes):
+        return replace(self, **changes)
@@ -0,0 +1,251 @@
+import itertools
+import threading
+
+from src.core.timing import get_clock
+
+
+def _seconds(delta):
+    # Whole seconds like timedelta arithmetic: float noise (4.9999999) must not lose a second
+    return int(round(delta, 6))
+
+
+class WriteBehindQueue:
+    """
+    Sits in front of StorageManager for the tracker's log writes.
+
+    Opening, heartbeating and closing logs only records the intent in memory
+    and returns immediately. A background thread flushes everything pending in
+    one transaction every flush_interval seconds, with heartbeats and closes
+    for the same log coalesced to the latest end time.
+
+    start_logging/start_description_log return queue handles rather than
+    database ids; the row id is resolved when the open is flushed. Opens and
+    closes take an optional MonotonicClock reading so callers can record when
+    the change actually happened rather than when it was processed.
+    Durations are the difference of monotonic readings; only the stored
+    start/end datetimes are derived from the clock's wall anchor.
+
+    on_flush, if given, is called with no arguments after each successful
+    flush so listeners can react to the persisted totals changing.
+
+    journal, if given, is a CheckpointJournal: checkpoint() records how far
+    every open log has run and closes are journaled as they happen, so a
+    crash loses at most the time since the last checkpoint rather than since
+    the last flush. Records need a database id, so checkpoint() first
+    flushes any open that has not reached the database yet.
+    """
+
+    def __init__(self, storage, flush_interval=10, on_flush=None, clock=None, journal=None):
+        self.storage = storage
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.clock = clock or get_clock()
+        self.journal = journal
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._handles = itertools.count(1)
+        self._meta = {}      # handle -> kind, activity_id, start_time, monotonic start/persisted_until/closed_at
+        self._log_ids = {}   # handle -> database id, once flushed
+        self._opens = {}     # handle -> pending insert
+        self._ends = {}      # handle -> (end_time, closed)
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self.flush_count = 0
+        self.events_queued = 0
+        self.events_written = 0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the flush thread and writes everything still pending."""
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval)
+        self._thread = None
+        self.flush()
+        if self.journal:
+            self.journal.close()
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def _open(self, kind, activity_id, description=None, at=None):
+        with self._lock:
+            handle = next(self._handles)
+            start = self.clock.now() if at is None else at
+            start_time = self.clock.to_datetime(start)
+            self._meta[handle] = {
+                'kind': kind,
+                'activity_id': activity_id,
+                'start_time': start_time,
+                'start': start,
+                'persisted_until': start,
+                'closed_at': None
+            }
+            self._opens[handle] = {
+                'key': handle,
+                'kind': kind,
+                'activity_id': activity_id,
+                'description': description,
+                'start_time': start_time
+            }
+            self.events_queued += 1
+            return handle
+
+    def _end(self, handle, closed, at=None):
+        record = None
+        with self._lock:
+            meta = self._meta.get(handle)
+            if meta is None or meta['closed_at'] is not None:
+                return
+            now = max(self.clock.now() if at is None else at, meta['start'])
+            self._ends[handle] = (now, closed)
+            if closed:
+                meta['closed_at'] = now
+                if self.journal and handle in self._log_ids:
+                    record = self._checkpoint_record(handle, meta, now, closed=True)
+            self.events_queued += 1
+        if record:
+            try:
+                self.journal.append([record])
+            except OSError as e:
+                print(f"Error writing checkpoint journal: {e}")
+
+    def _checkpoint_record(self, handle, meta, end, closed=False):
+        return (meta['kind'], self._log_ids[handle], self.clock.to_wall(end), _seconds(end - meta['start']), closed)
+
+    def checkpoint(self, at=None):
+        """Journals the current end of every open log; cheap enough to call on every tracker tick."""
+        if not self.journal:
+            return
+        now = self.clock.now() if at is None else at
+        with self._lock:
+            unflushed_opens = bool(self._opens)
+        if unflushed_opens:
+            # A log that exists only in memory would be lost outright by a crash; give it a row id first
+            self.flush()
+        with self._lock:
+            records = [
+                self._checkpoint_record(handle, meta, max(now, meta['start']))
+                for handle, meta in self._meta.items()
+                if meta['closed_at'] is None and handle in self._log_ids
+            ]
+        try:
+            self.journal.append(records)
+        except OSError as e:
+            print(f"Error writing checkpoint journal: {e}")
+
+    def start_logging(self, activity_id, at=None):
+        return self._open('log', activity_id, at=at)
+
+    def start_description_log(self, activity_id, description, at=None):
+        return self._open('desc', activity_id, description, at=at)
+
+    def stop_logging(self, handle, at=None):
+        self._end(handle, closed=True, at=at)
+
+    def stop_description_log(self, handle, at=None):
+        self._end(handle, closed=True, at=at)
+
+    def update_log_heartbeat(self, handle):
+        self._end(handle, closed=False)
+
+    def update_desc_heartbeat(self, handle):
+        self._end(handle, closed=False)
+
+    def unflushed_log_seconds(self, now=None):
+        """
+        Seconds of ActivityLog time not yet in the database, as
+        { (activity_id, start_date): seconds }. Open logs count up to now and
+        closed-but-unflushed logs up to their close time, so persisted totals
+        plus this overlay give the live figure with nothing counted twice.
+        """
+        now = self.clock.now() if now is None else now
+        result = {}
+        with self._lock:
+            for meta in self._meta.values():
+                if meta['kind'] != 'log':
+                    continue
+                until = meta['closed_at'] or now
+                seconds = _seconds(until - meta['persisted_until'])
+                if seconds <= 0:
+                    continue
+                key = (meta['activity_id'], meta['start_time'].date())
+                result[key] = result.get(key, 0) + seconds
+        return result
+
+    def read_with_unflushed(self, read_persisted, now=None):
+        """
+        Returns (read_persisted(), unflushed_log_seconds(now)) with no flush
+        in between, so persisted totals read by the callback and the overlay
+        never both count the same seconds.
+        """
+        with self._flush_lock:
+            return read_persisted(), self.unflushed_log_seconds(now)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._opens) + len(self._ends)
+
+    def flush(self):
+        """Writes all pending events in one transaction. Returns the number of events written."""
+        with self._flush_lock:
+            with self._lock:
+                opens, ends = self._opens, self._ends
+                self._opens, self._ends = {}, {}
+                open_rows = list(opens.values())
+                end_rows = [
+                    {
+                        'kind': self._meta[handle]['kind'],
+                        'key': handle,
+                        'log_id': self._log_ids.get(handle),
+                        'end_time': self.clock.to_datetime(end),
+                        'duration_seconds': _seconds(end - self._meta[handle]['start'])
+                    }
+                    for handle, (end, _) in ends.items()
+                ]
+
+            if not open_rows and not end_rows:
+                return 0
+
+            try:
+                new_ids = self.storage.write_log_batch(open_rows, end_rows)
+            except Exception as e:
+                print(f"Error flushing tracker writes: {e}")
+                with self._lock:
+                    opens.update(self._opens)
+                    self._opens = opens
+                    for handle, value in ends.items():
+                        self._ends.setdefault(handle, value)
+                return 0
+
+            with self._lock:
+                self._log_ids.update(new_ids)
+                for handle, (end_time, closed) in ends.items():
+                    if closed:
+                        meta = self._meta.pop(handle, None)
+                        log_id = self._log_ids.pop(handle, None)
+                        if self.journal and meta and log_id is not None:
+                            self.journal.forget(meta['kind'], log_id)
+                    elif handle in self._meta:
+                        self._meta[handle]['persisted_until'] = end_time
+
+            written = len(open_rows) + len(end_rows)
+            self.flush_count += 1
+            self.events_written += written
+
+        if self.on_flush:
+            try:
+                self.on_flush()
+            except Exception as e:
+                print(f"Error in flush callback: {e}")
+        return written
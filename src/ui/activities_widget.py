@@ -1,11 +1,11 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, 
                              QGridLayout, QScrollArea, QPushButton, QSizePolicy, QDialog, QLineEdit, QFileDialog)
 from PySide6.QtCore import Qt, Signal, QSize
-from PySide6.QtGui import QFont, QPixmap, QIcon
+from PySide6.QtGui import QFont, QIcon
 from PySide6.QtWidgets import QMessageBox, QComboBox
-import os
 
 from src.ui.add_activity_dialog import AddActivityDialog
+from src.ui.icon_cache import get_icon_cache
 from src.ui.log_viewer_dialog import LogViewerDialog
 from src.ui.flow_layout import FlowLayout
 
@@ -37,19 +37,10 @@ class ActivityCard(QFrame):
         self.icon_lbl.setFixedSize(40, 40)
         
 
-        icon_path = activity.icon_path
-        if icon_path and not os.path.isabs(icon_path):
-             base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-             icon_path = os.path.join(base_path, icon_path)
-
-        if icon_path and os.path.exists(icon_path):
-             pixmap = QPixmap(icon_path)
-             if not pixmap.isNull():
-                 pixmap = pixmap.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                 self.icon_lbl.setPixmap(pixmap)
-                 self.icon_lbl.setStyleSheet("background: transparent; border: none;")
-             else:
-                 self.set_fallback_icon()
+        pixmap = get_icon_cache().pixmap(activity.icon_path, 40)
+        if pixmap is not None:
+             self.icon_lbl.setPixmap(pixmap)
+             self.icon_lbl.setStyleSheet("background: transparent; border: none;")
         else:
              self.set_fallback_icon()
              
@@ -160,9 +151,13 @@ class ActivityCard(QFrame):
             font-size: 13px;
         """)
 
-    def update_stats(self):
-        today = self.db.get_today_duration(self.activity.name, self.activity.type)
-        total = self.db.get_activity_duration(self.activity.name, self.activity.type)
+    def update_stats(self, live=None):
+        if live is not None:
+            today = live.today_seconds(self.activity.name, self.activity.type)
+            total = live.total_seconds(self.activity.name, self.activity.type)
+        else:
+            today = self.db.get_today_duration(self.activity.name, self.activity.type)
+            total = self.db.get_activity_duration(self.activity.name, self.activity.type)
         
         h, r = divmod(today, 3600)
         m, _ = divmod(r, 60)
@@ -332,6 +327,7 @@ class ActivitiesWidget(QWidget):
         if reply == QMessageBox.Yes:
             success = self.db.delete_activity(activity.id)
             if success:
+                self.icon_manager.forget_path(activity.icon_path)
                 if self.tracker.is_manual_running(activity.id):
                     self.tracker.stop_manual_session(activity)
                 
@@ -350,6 +346,7 @@ class ActivitiesWidget(QWidget):
 
     def update_data(self):
         self.update_states()
+        live = self.tracker.get_live_stats()
         for card in self.cards.values():
-            card.update_stats()
+            card.update_stats(live)
 
@@ -1,10 +1,11 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
                              QPushButton, QFileDialog, QFrame)
 from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QIcon, QPixmap, QFont
+from PySide6.QtGui import QIcon, QFont
 import os
 
 from src.ui.styles import get_stylesheet
+from src.ui.icon_cache import get_icon_cache
 
 class AddActivityDialog(QDialog):
     def __init__(self, parent, db, icon_manager, activity_to_edit=None):
@@ -127,21 +128,20 @@ class AddActivityDialog(QDialog):
         """)
 
     def update_icon_preview(self):
-        if self.selected_icon_path and os.path.exists(self.selected_icon_path):
-            pix = QPixmap(self.selected_icon_path)
-            if not pix.isNull():
-                self.icon_btn.setText("")
-                icon = QIcon(pix)
-                self.icon_btn.setIcon(icon)
-                self.icon_btn.setIconSize(QSize(80, 80))
-                self.icon_btn.setObjectName("SecondaryButton")
-                self.icon_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: transparent;
-                        border: 2px solid #555;
-                        border-radius: 12px;
-                    }
-                """)
+        pix = get_icon_cache().pixmap(self.selected_icon_path, 80)
+        if pix is not None:
+            self.icon_btn.setText("")
+            icon = QIcon(pix)
+            self.icon_btn.setIcon(icon)
+            self.icon_btn.setIconSize(QSize(80, 80))
+            self.icon_btn.setObjectName("SecondaryButton")
+            self.icon_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: transparent;
+                    border: 2px solid #555;
+                    border-radius: 12px;
+                }
+            """)
 
     def browse_icon(self):
         path, _ = QFileDialog.getOpenFileName(self, "Select Icon", "", "Image Files (*.png *.jpg *.ico)")
@@ -1,13 +1,13 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, 
                              QScrollArea, QPushButton, QLineEdit, QComboBox, QSizePolicy, QGridLayout, QLayout, QStackedWidget, QCheckBox)
 from PySide6.QtCore import Qt, QTimer, QSize, Signal
-from PySide6.QtGui import QFont, QPixmap, QIcon, QFontMetrics, QPainter, QColor, QPen
+from PySide6.QtGui import QFont, QIcon, QFontMetrics, QPainter, QColor, QPen
 from PySide6.QtWidgets import QMessageBox
-import os
 import time
 
 from PySide6.QtCore import Qt, QTimer, QSize, Signal
 from src.ui.add_activity_dialog import AddActivityDialog
+from src.ui.icon_cache import get_icon_cache
 
 from src.utils.text_utils import format_app_name
 
@@ -298,11 +298,12 @@ class ActiveSessionCard(QFrame):
         layout.addLayout(action_layout)
         
     def update_icon(self):
+        # The icon index is kept current, so no existence check is needed here
         icon_path = self.icon_manager.get_icon_path(self.name)
-        if icon_path and os.path.exists(icon_path):
-             pix = QPixmap(icon_path)
-             if not pix.isNull():
-                 self.icon_lbl.setPixmap(pix.scaled(28, 28, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        if icon_path:
+             pix = get_icon_cache().pixmap(icon_path, 28)
+             if pix is not None:
+                 self.icon_lbl.setPixmap(pix)
                  self.icon_lbl.setStyleSheet("background: transparent; border: none;")
                  return
         
@@ -346,8 +347,7 @@ class ActiveSessionCard(QFrame):
         text, ok = QInputDialog.getText(self, "Add Description", "Enter description:", QLineEdit.Normal, current)
         
         if ok and text:
-            self.activity_obj.description = text
-            self.db.update_activity(self.activity_obj.id, description=text)
+            self.activity_obj = self.db.update_activity(self.activity_obj.id, description=text) or self.activity_obj
             
 
             if not self.is_auto and self.tracker:
@@ -358,8 +358,7 @@ class ActiveSessionCard(QFrame):
             self.user_desc_lbl.setText(text)
             self.desc_stack.setCurrentIndex(1)
         elif ok and not text:
-             self.activity_obj.description = "Manual Session" # Or None? keeping simple
-             self.db.update_activity(self.activity_obj.id, description="Manual Session")
+             self.activity_obj = self.db.update_activity(self.activity_obj.id, description="Manual Session") or self.activity_obj
              self.window_title = "Manual Session"
              self.desc_stack.setCurrentIndex(0)
 
@@ -380,6 +379,7 @@ class HomeWidget(QWidget):
         self.db = db
         self.icon_manager = icon_manager
         self.active_cards = {}
+        self.discord_enabled = self.db.get_setting("discord_enabled", "True") == "True"
         
         self.layout = QVBoxLayout(self)
         self.layout.setSpacing(20)
@@ -414,6 +414,12 @@ class HomeWidget(QWidget):
         
         self.last_refresh = 0
         
+        self.db.subscribe_setting("discord_enabled", self.on_discord_setting_changed)
+        
+    def on_discord_setting_changed(self, key, value):
+        self.discord_enabled = value == "True"
+        self.reconnect_btn.setVisible(self.discord_enabled)
+        
     def create_header(self):
         self.header_frame = QFrame()
         self.header_frame.setMinimumHeight(290)
@@ -433,7 +439,7 @@ class HomeWidget(QWidget):
         self.reconnect_btn.setObjectName("DiscordButton")
         self.reconnect_btn.clicked.connect(self.tracker.reconnect_discord)
 
-        self.reconnect_btn.setVisible(False)
+        self.reconnect_btn.setVisible(self.discord_enabled)
         
         header_top_layout = QHBoxLayout()
         header_top_layout.addWidget(lbl)
@@ -546,28 +552,10 @@ class HomeWidget(QWidget):
         layout.addWidget(add_btn)
 
     def update_data(self):
-        is_discord_enabled = self.tracker.storage.get_setting("discord_enabled", "True") == "True"
-        self.reconnect_btn.setVisible(is_discord_enabled)
-        
-        self.update_active_sessions()
+        live = self.tracker.get_live_stats()
+        self.update_active_sessions(live)
         
-        total = self.db.get_total_today_duration()
-        
-        if self.tracker.current_activity:
-             pname = self.tracker.current_activity.name
-             if pname in self.tracker.open_sessions:
-                  total += int(self.tracker.open_sessions[pname]['accumulated_time'])
-        
-        session = self.db.get_session()
-        try:
-            for act_id, log_id in list(self.tracker.manual_sessions.items()):
-                 from src.database.models import ActivityLog
-                 log = session.query(ActivityLog).get(log_id)
-                 if log: total += int(time.time() - log.start_time.timestamp())
-        except:
-            pass
-        finally:
-            session.close()
+        total = live.total_today
 
         h, r = divmod(int(total), 3600)
         m, s = divmod(r, 60)
@@ -577,7 +565,9 @@ class HomeWidget(QWidget):
             self.refresh_list()
             self.last_refresh = time.time()
             
-    def update_active_sessions(self):
+    def update_active_sessions(self, live=None):
+        if live is None:
+            live = self.tracker.get_live_stats()
         current_active_ids = set()
         
 
@@ -609,7 +599,7 @@ class HomeWidget(QWidget):
                  act = self.db.get_activity_by_id(self.tracker.current_activity.id)
                  if act: is_visible = act.discord_visible
              
-             is_global_enabled = self.tracker.storage.get_setting("discord_enabled", "True") == "True"
+             is_global_enabled = self.discord_enabled
              
              should_show_checkbox = is_visible and is_global_enabled
              self.active_cards[sid].discord_chk.setVisible(should_show_checkbox)
@@ -623,12 +613,11 @@ class HomeWidget(QWidget):
              
              self.active_cards[sid].set_live_style(is_live_now)
 
-             duration = 0
-             if name in self.tracker.open_sessions:
-                  duration = int(self.tracker.open_sessions[name]['accumulated_time'])
+             # Sessions only advance on tracker ticks; count the time since then so the card ticks every second
+             duration = int(self.tracker.current_duration(name))
              
-             today = self.db.get_today_duration(name)
-             total = self.db.get_activity_duration(name)
+             today = live.today_seconds(name)
+             total = live.total_seconds(name)
              
              self.active_cards[sid].update_stats(duration, today, total)
 
@@ -651,7 +640,7 @@ class HomeWidget(QWidget):
                      self.active_cards[sid] = card
                  
              is_visible = getattr(act, 'discord_visible', True)
-             is_global_enabled = self.tracker.storage.get_setting("discord_enabled", "True") == "True"
+             is_global_enabled = self.discord_enabled
              
              should_show_checkbox = is_visible and is_global_enabled
              self.active_cards[sid].discord_chk.setVisible(should_show_checkbox)
@@ -667,16 +656,11 @@ class HomeWidget(QWidget):
 
                      
              duration = 0
-             session = self.db.get_session()
-             try:
-                 from src.database.models import ActivityLog
-                 log = session.query(ActivityLog).get(log_id)
-                 if log: duration = int(time.time() - log.start_time.timestamp())
-             except: pass
-             finally: session.close()
+             start_t = self.tracker.manual_start_times.get(act_id)
+             if start_t: duration = int(self.tracker.clock.now() - start_t)
                  
-             today = self.db.get_today_duration(act.name, act.type)
-             total = self.db.get_activity_duration(act.name, act.type)
+             today = live.today_seconds(act.name, act.type)
+             total = live.total_seconds(act.name, act.type)
              
              self.active_cards[sid].update_stats(duration, today, total)
 
@@ -697,6 +681,7 @@ class HomeWidget(QWidget):
              if hasattr(self, 'no_active_lbl'): self.no_active_lbl.hide()
         
     def refresh_list(self):
+        live = self.tracker.get_live_stats()
         current_data = {}
 
         all_acts = self.db.get_all_activities()
@@ -723,8 +708,8 @@ class HomeWidget(QWidget):
             if filter_mode == "IRL" and not info['is_irl']: continue
             if search_txt and search_txt not in name.lower(): continue
             
-            total = self.db.get_activity_duration(name, info['type'])
-            today = self.db.get_today_duration(name, info['type'])
+            total = live.total_seconds(name, info['type'])
+            today = live.today_seconds(name, info['type'])
             filtered_items.append((info, total, today))
             
         filtered_items.sort(key=lambda x: x[1], reverse=True)
@@ -753,11 +738,10 @@ class HomeWidget(QWidget):
         icon_lbl = QLabel()
         icon_lbl.setFixedSize(32, 32)
         
-        if info['icon'] and os.path.exists(info['icon']):
-             pix = QPixmap(info['icon'])
-             if not pix.isNull():
-                 icon_lbl.setPixmap(pix.scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                 icon_lbl.setStyleSheet("background: transparent; border: none;")
+        pix = get_icon_cache().pixmap(info['icon'], 24)
+        if pix is not None:
+             icon_lbl.setPixmap(pix)
+             icon_lbl.setStyleSheet("background: transparent; border: none;")
         else:
              icon_lbl.setText(info['name'][:2].upper())
              icon_lbl.setObjectName("AppIcon")
@@ -850,6 +834,7 @@ class HomeWidget(QWidget):
         if reply == QMessageBox.Yes:
             success = self.db.delete_activity(activity.id)
             if success:
+                self.icon_manager.forget_path(activity.icon_path)
                 if self.tracker.is_manual_running(activity.id):
                     self.tracker.stop_manual_session(activity)
 
@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QGuiApplication, QPixmap
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+class IconCache:
+    """
+    Application-wide cache of decoded, pre-scaled icon pixmaps.
+
+    Each icon file is decoded once; every (path, size, device pixel ratio)
+    variant the UI asks for is scaled once and reused across widget
+    rebuilds. Missing or unreadable files are cached as misses for
+    MISS_TTL seconds, so rebuilds do not hit the disk for them on every
+    refresh but an icon that appears later still shows up. Entries are evicted least
+    recently used first once their estimated size exceeds max_bytes.
+
+    Pixmaps must be created and destroyed on the GUI thread, so
+    invalidate() (which IconManager may call from an icon worker) only
+    queues the path; it is dropped on the next GUI-thread access.
+    """
+
+    MISS_TTL = 30.0
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (path, size, dpr) or (path, None, None) for the source -> QPixmap or None
+        self._costs = {}
+        self._missed_at = {}           # key -> time.monotonic() when a None entry was stored
+        self._by_path = {}             # path -> set of keys
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._invalidated = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.decodes = 0
+        self.evictions = 0
+
+    def _resolve(self, path):
+        # Activity icon paths may be stored relative to the project root
+        if not os.path.isabs(path):
+            base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            path = os.path.join(base_path, path)
+        return os.path.normcase(os.path.abspath(path))
+
+    def pixmap(self, path, size, dpr=None):
+        """
+        Returns path scaled to fit size x size logical pixels (aspect kept),
+        or None if it cannot be loaded.
+        """
+        if not path:
+            return None
+        self._drop_invalidated()
+        if dpr is None:
+            screen = QGuiApplication.primaryScreen()
+            dpr = screen.devicePixelRatio() if screen else 1.0
+
+        path = self._resolve(path)
+        key = (path, size, dpr)
+        found, cached = self._lookup(key)
+        if found:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        source = self._source(path)
+        scaled = None
+        if source is not None:
+            px = round(size * dpr)
+            scaled = source.scaled(px, px, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            scaled.setDevicePixelRatio(dpr)
+        self._store(key, scaled)
+        return scaled
+
+    def _lookup(self, key):
+        """Returns (True, entry) for a cached entry, or (False, None) if there is none or it is an expired miss."""
+        if key not in self._entries:
+            return False, None
+        entry = self._entries[key]
+        if entry is None and time.monotonic() - self._missed_at.get(key, 0) > self.MISS_TTL:
+            del self._entries[key]
+            self._forget(key)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry
+
+    def _source(self, path):
+        key = (path, None, None)
+        found, cached = self._lookup(key)
+        if found:
+            return cached
+        self.decodes += 1
+        source = QPixmap(path)
+        if source.isNull():
+            source = None
+        self._store(key, source)
+        return source
+
+    def _store(self, key, pixmap):
+        cost = pixmap.width() * pixmap.height() * 4 if pixmap is not None else 64
+        self._entries[key] = pixmap
+        self._costs[key] = cost
+        if pixmap is None:
+            self._missed_at[key] = time.monotonic()
+        self._by_path.setdefault(key[0], set()).add(key)
+        self._bytes += cost
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            old_key, _ = self._entries.popitem(last=False)
+            self._forget(old_key)
+            self.evictions += 1
+
+    def _forget(self, key):
+        self._bytes -= self._costs.pop(key, 0)
+        self._missed_at.pop(key, None)
+        keys = self._by_path.get(key[0])
+        if keys:
+            keys.discard(key)
+            if not keys:
+                del self._by_path[key[0]]
+
+    def invalidate(self, path):
+        """Drops every cached variant of path; safe to call from any thread."""
+        if not path:
+            return
+        with self._lock:
+            self._invalidated.add(self._resolve(path))
+
+    def _drop_invalidated(self):
+        if not self._invalidated:
+            return
+        with self._lock:
+            paths, self._invalidated = self._invalidated, set()
+        for path in paths:
+            for key in list(self._by_path.get(path, ())):
+                self._entries.pop(key, None)
+                self._forget(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._costs.clear()
+        self._missed_at.clear()
+        self._by_path.clear()
+        self._bytes = 0
+
+    def get_stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'decodes': self.decodes,
+            'evictions': self.evictions
+        }
+
+
+_cache = None
+
+
+def get_icon_cache():
+    global _cache
+    if _cache is None:
+        _cache = IconCache()
+    return _cache
+
+
+def set_icon_cache(cache):
+    global _cache
+    _cache = cache
@@ -1,13 +1,13 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, 
                                QTableWidgetItem, QHeaderView, QTabWidget, QWidget, QPushButton)
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon, QPixmap
-import os
+from PySide6.QtGui import QIcon
 from datetime import datetime
 
 from src.utils.text_utils import format_app_name
 
 from src.ui.styles import get_stylesheet
+from src.ui.icon_cache import get_icon_cache
 
 class LogViewerDialog(QDialog):
     def __init__(self, activity, db, icon_manager, parent=None):
@@ -33,16 +33,9 @@ class LogViewerDialog(QDialog):
         # Icon
         icon_lbl = QLabel()
         icon_lbl.setFixedSize(64, 64)
-        icon_path = activity.icon_path
-        if icon_path and not os.path.isabs(icon_path):
-             base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-             icon_path = os.path.join(base_path, icon_path)
-
-        if icon_path and os.path.exists(icon_path):
-             pixmap = QPixmap(icon_path)
-             if not pixmap.isNull():
-                 pixmap = pixmap.scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                 icon_lbl.setPixmap(pixmap)
+        pixmap = get_icon_cache().pixmap(activity.icon_path, 64)
+        if pixmap is not None:
+             icon_lbl.setPixmap(pixmap)
         
         header_layout.addWidget(icon_lbl)
 
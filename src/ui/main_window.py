@@ -2,20 +2,23 @@ import sys
 import os
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QPushButton, QStackedWidget, QLabel, QSystemTrayIcon, QMenu, QApplication)
-from PySide6.QtCore import Qt, QTimer, QSize
+from PySide6.QtCore import Qt, QSize, QEvent
 from PySide6.QtGui import QIcon, QFont, QAction, QPixmap
 from src.ui.styles import get_stylesheet
 
 from src.database.storage import StorageManager
 from src.core.tracker import Tracker
 from src.core.icon_manager import IconManager
+from src.ui.icon_cache import IconCache, set_icon_cache
 from src.ui.home_widget import HomeWidget
 from src.ui.activities_widget import ActivitiesWidget
 from src.ui.statistics_widget import StatisticsWidget
 from src.ui.settings_widget import SettingsWidget
+from src.ui.refresh_scheduler import (RefreshScheduler, TOPIC_TRACKER, TOPIC_STATS,
+                                      TOPIC_ACTIVITIES, TOPIC_SETTINGS, TOPIC_LIVE)
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, db=None):
         super().__init__()
 
         self.setWindowTitle("Gainhour")
@@ -24,10 +27,20 @@ class MainWindow(QMainWindow):
         from src.utils.path_utils import get_resource_path, get_db_path
         
         # Setup Core
-        db_file = get_db_path("gainhour.db")
-        self.db = StorageManager(db_file)
-        self.db.clean_explorer_data()
+        if db is None:
+            db = StorageManager(get_db_path("gainhour.db"))
+            db.clean_explorer_data()
+        self.db = db
         self.icon_manager = IconManager()
+        self.icon_manager.adopt_legacy_icons(self.db.get_all_activities())
+        # Decoded/scaled icon pixmaps shared by every widget; cap in MB is the "icon_cache_mb" setting
+        try:
+            icon_cache_mb = max(int(self.db.get_setting("icon_cache_mb", "16")), 1)
+        except (TypeError, ValueError):
+            icon_cache_mb = 16
+        self.icon_cache = IconCache(max_bytes=icon_cache_mb * 1024 * 1024)
+        set_icon_cache(self.icon_cache)
+        self.icon_manager.add_change_listener(self.icon_cache.invalidate)
         self.tracker = Tracker(self.db, self.icon_manager)
         self.tracker.start()
 
@@ -62,10 +75,23 @@ class MainWindow(QMainWindow):
         self.stack.addWidget(self.statistics_widget)
         self.stack.addWidget(self.settings_widget)
         
-        # Timer for updates
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_ui)
-        self.update_timer.start(1000)
+        # One scheduler drives all periodic refreshes; only visible tabs with changed data are redrawn
+        self.refresh_scheduler = RefreshScheduler(live_source=self.tracker.has_running_sessions, parent=self)
+        self.refresh_scheduler.register(
+            self.home_widget, self.home_widget.update_data,
+            {TOPIC_TRACKER, TOPIC_STATS, TOPIC_ACTIVITIES, TOPIC_SETTINGS, TOPIC_LIVE}, interval_ms=1000)
+        self.refresh_scheduler.register(
+            self.activities_widget, self.activities_widget.update_data,
+            {TOPIC_TRACKER, TOPIC_STATS, TOPIC_ACTIVITIES, TOPIC_LIVE}, interval_ms=1000)
+        # Statistics follows persisted totals (flushes) and activity edits, not the per-second live tick
+        self.refresh_scheduler.register(
+            self.statistics_widget, self.statistics_widget.refresh_if_changed,
+            {TOPIC_STATS, TOPIC_ACTIVITIES}, interval_ms=5000)
+
+        self.tracker.add_change_listener(self.refresh_scheduler.mark_dirty)
+        self.db.add_change_listener(self.refresh_scheduler.mark_dirty)
+        self.db.settings.subscribe(lambda key, value: self.refresh_scheduler.mark_dirty(TOPIC_SETTINGS))
+        self.refresh_scheduler.start()
         
         self.create_tray_icon()
 
@@ -117,11 +143,9 @@ class MainWindow(QMainWindow):
             widget = self.stack.currentWidget()
             if hasattr(widget, 'refresh'):
                 widget.refresh()
-
-    def update_ui(self):
-        current = self.stack.currentWidget()
-        if hasattr(current, 'update_data'):
-            current.update_data()
+                self.refresh_scheduler.mark_view_clean(widget)
+            else:
+                self.refresh_scheduler.refresh_view(widget)
 
     def create_tray_icon(self):
         self.tray_icon = QSystemTrayIcon(self)
@@ -158,16 +182,28 @@ class MainWindow(QMainWindow):
         self.show()
         self.setWindowState(self.windowState() & ~Qt.WindowMinimized | Qt.WindowActive)
         self.activateWindow()
+        self.refresh_scheduler.resume()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.refresh_scheduler.pause()
+            elif self.isVisible():
+                self.refresh_scheduler.resume()
+        super().changeEvent(event)
 
     def quit_app(self):
+        self.refresh_scheduler.pause()
         self.tracker.stop()
         QApplication.instance().quit()
 
     def closeEvent(self, event):
         if self.tray_icon.isVisible():
             self.hide()
+            self.refresh_scheduler.pause()
             event.ignore()
         else:
+            self.refresh_scheduler.pause()
             self.tracker.stop()
             event.accept()
 
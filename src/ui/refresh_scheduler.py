@@ -0,0 +1,126 @@
+import threading
+import time
+
+from PySide6.QtCore import QObject, QTimer
+
+TOPIC_TRACKER = "tracker"        # sessions started/stopped, focus or title changed, window list changed
+TOPIC_STATS = "stats"            # persisted log totals changed (write-behind flush)
+TOPIC_ACTIVITIES = "activities"  # activity rows created, edited or deleted
+TOPIC_SETTINGS = "settings"      # a setting value changed
+TOPIC_LIVE = "live"              # wall time advanced while at least one session is running
+
+
+class RefreshScheduler(QObject):
+    """
+    Drives every periodic UI refresh from a single QTimer.
+
+    Views register the topics they depend on and a minimum refresh interval.
+    On each tick a view is refreshed only if it is visible and one of its
+    topics has been marked dirty since its last refresh; hidden views keep
+    their dirty topics until they are shown again. The timer is stopped
+    entirely while paused (e.g. minimized to the tray).
+
+    mark_dirty only records the topic under a lock, so tracker and storage
+    callbacks may call it from any thread.
+    """
+
+    def __init__(self, tick_ms=1000, live_source=None, parent=None):
+        super().__init__(parent)
+        self.live_source = live_source
+        self._lock = threading.Lock()
+        self._views = []
+
+        self.refresh_count = 0
+        self.skipped_hidden = 0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(tick_ms)
+        self._timer.timeout.connect(self._tick)
+
+    def register(self, widget, callback, topics, interval_ms=1000):
+        with self._lock:
+            self._views.append({
+                'widget': widget,
+                'callback': callback,
+                'topics': set(topics),
+                'interval': interval_ms / 1000.0,
+                'dirty': set(topics),
+                'last_run': 0.0
+            })
+
+    def mark_dirty(self, topic):
+        with self._lock:
+            for view in self._views:
+                if topic in view['topics']:
+                    view['dirty'].add(topic)
+
+    def mark_view_dirty(self, widget):
+        """Forces widget to refresh on the next tick, e.g. after switching to its tab."""
+        with self._lock:
+            for view in self._views:
+                if view['widget'] is widget:
+                    view['dirty'].update(view['topics'])
+                    view['last_run'] = 0.0
+
+    def mark_view_clean(self, widget):
+        """Records that widget was just fully rebuilt outside the scheduler."""
+        with self._lock:
+            for view in self._views:
+                if view['widget'] is widget:
+                    view['dirty'].clear()
+                    view['last_run'] = time.monotonic()
+
+    def refresh_view(self, widget):
+        """Refreshes widget immediately, regardless of its dirty state or interval."""
+        callbacks = []
+        with self._lock:
+            for view in self._views:
+                if view['widget'] is widget:
+                    view['dirty'].clear()
+                    view['last_run'] = time.monotonic()
+                    callbacks.append(view['callback'])
+        for callback in callbacks:
+            self._run(callback)
+
+    def start(self):
+        self._timer.start()
+
+    def pause(self):
+        self._timer.stop()
+
+    def resume(self):
+        if not self._timer.isActive():
+            self._timer.start()
+            self._tick()
+
+    def is_paused(self):
+        return not self._timer.isActive()
+
+    def _tick(self):
+        if self.live_source and self.live_source():
+            self.mark_dirty(TOPIC_LIVE)
+
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for view in self._views:
+                if not view['dirty']:
+                    continue
+                if not view['widget'].isVisible():
+                    self.skipped_hidden += 1
+                    continue
+                if now - view['last_run'] < view['interval']:
+                    continue
+                view['dirty'].clear()
+                view['last_run'] = now
+                due.append(view['callback'])
+
+        for callback in due:
+            self._run(callback)
+
+    def _run(self, callback):
+        try:
+            callback()
+            self.refresh_count += 1
+        except Exception as e:
+            print(f"Error refreshing view: {e}")
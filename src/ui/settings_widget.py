@@ -5,6 +5,10 @@ from PySide6.QtCore import Qt, QTimer, Property, QSize, QEasingCurve, QPropertyA
 
 from src.utils.startup_manager import set_run_on_startup, check_run_on_startup
 from src.ui.styles import THEMES
+from src.ui.icon_cache import get_icon_cache
+from src.core.rules import (load_rules, save_rules, validate_rule, DEFAULT_RULES,
+                            FIELD_PROCESS, FIELD_EXE, FIELD_TITLE, MATCH_EXACT, MATCH_GLOB, MATCH_REGEX,
+                            ACTION_TRACK, ACTION_IGNORE)
 
 class ToggleSwitch(QWidget):
     def __init__(self, parent=None, track_radius=10, thumb_radius=8):
@@ -191,6 +195,9 @@ class SettingsWidget(QWidget):
         "Email": "depthwc@gmail.com",
     }
 
+    # (label, idle_threshold_minutes setting value); "0" never pauses
+    IDLE_OPTIONS = [("Never", "0"), ("2 min", "2"), ("5 min", "5"), ("10 min", "10"), ("15 min", "15"), ("30 min", "30")]
+
     def __init__(self, db, tracker=None):
         super().__init__()
         self.db = db
@@ -235,6 +242,17 @@ class SettingsWidget(QWidget):
         self.startup_check.setChecked(is_startup)
         
         g_layout.addWidget(self.startup_check)
+
+        idle_container = QHBoxLayout()
+        idle_container.setAlignment(Qt.AlignLeft)
+        idle_lbl = QLabel("Pause Tracking When Idle For")
+        idle_container.addWidget(idle_lbl)
+        self.idle_combo = QComboBox()
+        for label, _ in self.IDLE_OPTIONS:
+            self.idle_combo.addItem(label)
+        self.idle_combo.setFixedWidth(100)
+        idle_container.addWidget(self.idle_combo)
+        g_layout.addLayout(idle_container)
         
         left_col.addWidget(self.general_box)
 
@@ -456,6 +474,73 @@ class SettingsWidget(QWidget):
 
         right_col.addWidget(self.custom_box)
         
+        # --- Tracking Rules ---
+        rules_lbl = QLabel("Tracking Rules")
+        rules_lbl.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        rules_lbl.setObjectName("SectionHeader")
+        right_col.addWidget(rules_lbl)
+        
+        self.rules_box = QFrame()
+        self.rules_box.setObjectName("SettingsCard")
+        
+        rules_layout = QVBoxLayout(self.rules_box)
+        rules_layout.setSpacing(10)
+        rules_layout.setContentsMargins(15, 15, 15, 15)
+        
+        rules_helper = QLabel("The first matching rule wins. Ignored windows are never tracked and "
+                              "the previous app keeps running while they have focus. "
+                              "Use Track to make an exception to the rules below it.")
+        rules_helper.setWordWrap(True)
+        rules_helper.setObjectName("HelperLabel")
+        rules_layout.addWidget(rules_helper)
+        
+        self.rules_scroll = QScrollArea()
+        self.rules_scroll.setWidgetResizable(True)
+        self.rules_scroll.setFixedHeight(220)
+        self.rules_scroll.setStyleSheet("""
+            QScrollArea { border-radius: 4px; }
+            QScrollBar:vertical { width: 10px; }
+            QScrollBar::handle:vertical { border-radius: 5px; }
+        """)
+        
+        self.rules_list_widget = QWidget()
+        self.rules_list_layout = QVBoxLayout(self.rules_list_widget)
+        self.rules_list_layout.setSpacing(6)
+        self.rules_list_layout.setContentsMargins(5, 5, 5, 5)
+        self.rules_list_layout.setAlignment(Qt.AlignTop)
+        self.rules_scroll.setWidget(self.rules_list_widget)
+        rules_layout.addWidget(self.rules_scroll)
+        
+        self.rule_rows = []
+        
+        self.rules_status_lbl = QLabel("")
+        self.rules_status_lbl.setObjectName("WarningLabel")
+        self.rules_status_lbl.setWordWrap(True)
+        self.rules_status_lbl.setVisible(False)
+        rules_layout.addWidget(self.rules_status_lbl)
+        
+        rules_btn_layout = QHBoxLayout()
+        add_rule_btn = QPushButton("Add Rule")
+        add_rule_btn.setCursor(Qt.PointingHandCursor)
+        add_rule_btn.clicked.connect(lambda: self.add_rule_row())
+        rules_btn_layout.addWidget(add_rule_btn)
+        
+        defaults_btn = QPushButton("Restore Defaults")
+        defaults_btn.setCursor(Qt.PointingHandCursor)
+        defaults_btn.clicked.connect(self.restore_default_rules)
+        rules_btn_layout.addWidget(defaults_btn)
+        rules_btn_layout.addStretch()
+        
+        self.save_rules_btn = QPushButton("Save")
+        self.save_rules_btn.setFixedSize(80, 30)
+        self.save_rules_btn.setCursor(Qt.PointingHandCursor)
+        self.save_rules_btn.setObjectName("PrimaryButton")
+        self.save_rules_btn.clicked.connect(self.save_rules)
+        rules_btn_layout.addWidget(self.save_rules_btn)
+        rules_layout.addLayout(rules_btn_layout)
+        
+        right_col.addWidget(self.rules_box)
+        
         # --- Danger Zone ---
         danger_lbl = QLabel("Delete All Data")
         danger_lbl.setFont(QFont("Segoe UI", 12, QFont.Bold))
@@ -556,6 +641,10 @@ class SettingsWidget(QWidget):
         set_run_on_startup(startup_val == "True")
         self.startup_check.setChecked(startup_val == "True")
 
+        idle_val = self.db.get_setting("idle_threshold_minutes", "5")
+        values = [value for _, value in self.IDLE_OPTIONS]
+        self.idle_combo.setCurrentIndex(values.index(idle_val) if idle_val in values else values.index("5"))
+
         # Discord Globals
         discord_val = self.db.get_setting("discord_enabled", "True")
         is_enabled = (discord_val == "True")
@@ -584,11 +673,10 @@ class SettingsWidget(QWidget):
             icon_lbl.setAlignment(Qt.AlignCenter)
             
             has_icon = False
-            if app.icon_path:
-                 px = QPixmap(app.icon_path)
-                 if not px.isNull():
-                     icon_lbl.setPixmap(px.scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                     has_icon = True
+            px = get_icon_cache().pixmap(app.icon_path, 24)
+            if px is not None:
+                 icon_lbl.setPixmap(px)
+                 has_icon = True
             
             if not has_icon:
                  if app.type == 'irl':
@@ -628,6 +716,106 @@ class SettingsWidget(QWidget):
             
             self.app_rows.append((clean_name.lower(), row))
 
+        self.load_rules_list()
+
+    RULE_FIELDS = [("Process", FIELD_PROCESS), ("Executable", FIELD_EXE), ("Title", FIELD_TITLE)]
+    RULE_MATCHES = [("Exact", MATCH_EXACT), ("Glob", MATCH_GLOB), ("Regex", MATCH_REGEX)]
+    RULE_ACTIONS = [("Ignore", ACTION_IGNORE), ("Track", ACTION_TRACK)]
+
+    def load_rules_list(self, rules=None):
+        for row in self.rule_rows:
+            row['widget'].setParent(None)
+        self.rule_rows = []
+        self.rules_status_lbl.setVisible(False)
+
+        for rule in (rules if rules is not None else load_rules(self.db)):
+            self.add_rule_row(rule)
+
+    def add_rule_row(self, rule=None):
+        rule = rule or {'field': FIELD_PROCESS, 'match': MATCH_EXACT, 'pattern': "",
+                        'case_sensitive': False, 'action': ACTION_IGNORE}
+
+        row_widget = QWidget()
+        row_layout = QHBoxLayout(row_widget)
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        row_layout.setSpacing(5)
+
+        def make_combo(options, current):
+            combo = QComboBox()
+            for label, value in options:
+                combo.addItem(label, value)
+            idx = combo.findData(current)
+            combo.setCurrentIndex(idx if idx >= 0 else 0)
+            return combo
+
+        field_combo = make_combo(self.RULE_FIELDS, rule.get('field'))
+        match_combo = make_combo(self.RULE_MATCHES, rule.get('match'))
+        pattern_edit = QLineEdit(rule.get('pattern', ""))
+        pattern_edit.setPlaceholderText("Pattern")
+        case_check = QCheckBox("Aa")
+        case_check.setToolTip("Case sensitive")
+        case_check.setChecked(bool(rule.get('case_sensitive')))
+        action_combo = make_combo(self.RULE_ACTIONS, rule.get('action'))
+
+        remove_btn = QPushButton("✕")
+        remove_btn.setFixedSize(26, 26)
+        remove_btn.setCursor(Qt.PointingHandCursor)
+
+        row_layout.addWidget(field_combo)
+        row_layout.addWidget(match_combo)
+        row_layout.addWidget(pattern_edit, 1)
+        row_layout.addWidget(case_check)
+        row_layout.addWidget(action_combo)
+        row_layout.addWidget(remove_btn)
+
+        row = {
+            'widget': row_widget,
+            'field': field_combo,
+            'match': match_combo,
+            'pattern': pattern_edit,
+            'case_sensitive': case_check,
+            'action': action_combo
+        }
+        remove_btn.clicked.connect(lambda: self.remove_rule_row(row))
+
+        self.rules_list_layout.addWidget(row_widget)
+        self.rule_rows.append(row)
+        return row
+
+    def remove_rule_row(self, row):
+        if row in self.rule_rows:
+            self.rule_rows.remove(row)
+            row['widget'].setParent(None)
+
+    def restore_default_rules(self):
+        self.load_rules_list(DEFAULT_RULES)
+
+    def save_rules(self):
+        rules = []
+        for i, row in enumerate(self.rule_rows, start=1):
+            rule = {
+                'field': row['field'].currentData(),
+                'match': row['match'].currentData(),
+                'pattern': row['pattern'].text().strip(),
+                'case_sensitive': row['case_sensitive'].isChecked(),
+                'action': row['action'].currentData()
+            }
+            if not rule['pattern']:
+                continue
+            try:
+                validate_rule(rule)
+            except ValueError as e:
+                self.rules_status_lbl.setText(f"⚠ Rule {i}: {e}")
+                self.rules_status_lbl.setVisible(True)
+                return
+            rules.append(rule)
+
+        save_rules(self.db, rules)
+        self.load_rules_list(rules)
+
+        dlg = SavedDialog("Tracking rules saved.", self)
+        dlg.exec()
+
     def on_combo_changed(self, index):
         self.warning_lbl.setVisible(index == 1)
 
@@ -642,6 +830,7 @@ class SettingsWidget(QWidget):
     def save_settings(self):
         is_startup = self.startup_check.isChecked()
         self.db.set_setting("run_on_startup", "True" if is_startup else "False")
+        self.db.set_setting("idle_threshold_minutes", self.IDLE_OPTIONS[self.idle_combo.currentIndex()][1])
         
         success = set_run_on_startup(is_startup)
         
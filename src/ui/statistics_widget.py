@@ -532,6 +532,8 @@ class StatisticsWidget(QWidget):
         self.db = db
         self.tracker = tracker
         self.current_date = date.today()
+        self._drawn_daily = None   # (date, stats) the daily panel last drew
+        self._drawn_total = None   # (lifetime stats, daily breakdown) the lifetime charts last drew
         
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(20, 20, 20, 20)
@@ -700,10 +702,6 @@ class StatisticsWidget(QWidget):
         
         self.layout.addWidget(self.bottom_box)
         
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh)
-        self.timer.start(1000) 
-
         self.refresh()
         
     def switch_tab(self, index):
@@ -780,13 +778,18 @@ class StatisticsWidget(QWidget):
     def refresh(self):
         self.refresh_daily()
         self.refresh_total()
+
+    def refresh_if_changed(self):
+        """Scheduler entry point: redraws only the charts whose data differs from what is on screen."""
+        self.refresh_daily(force=False)
+        self.refresh_total(force=False)
         
     def _calculate_total_str(self, stats):
         total_sec = sum(s['total_seconds'] for s in stats)
         h, m = divmod(total_sec // 60, 60)
         return f"Total: {int(h)}h {int(m)}m"
 
-    def refresh_daily(self):
+    def refresh_daily(self, force=True):
         if self.current_date == date.today():
              self.date_lbl.setText("Today")
              self.btn_next.setEnabled(False)
@@ -797,101 +800,38 @@ class StatisticsWidget(QWidget):
              self.date_lbl.setText(self.current_date.strftime("%b %d"))
              self.btn_next.setEnabled(True)
              
-        if self.current_date == date.today():
+        if self.current_date == date.today() and self.tracker:
+             stats = self.tracker.get_live_stats().today
+        elif self.current_date == date.today():
              stats = self.db.get_today_stats()
-             
-             if self.tracker:
-                 import time
-                 current_time = time.time()
-                 
-                 def add_to_stats(name, duration):
-                     for s in stats:
-                         if s['name'] == name:
-                             s['total_seconds'] += duration
-                             return
-                     stats.append({'name': name, 'total_seconds': duration})
-                 if self.tracker.current_activity and self.tracker.start_time:
-                     duration = current_time - self.tracker.start_time
-                     if duration > 0:
-                         add_to_stats(self.tracker.current_activity.name, duration)
-                         
-                 if hasattr(self.tracker, 'manual_activities') and hasattr(self.tracker, 'manual_start_times'):
-                     for aid, activity in self.tracker.manual_activities.items():
-                         start_t = self.tracker.manual_start_times.get(aid)
-                         if start_t:
-                             duration = current_time - start_t
-                             if duration > 0:
-                                 add_to_stats(activity.name, duration)
-             
-             stats.sort(key=lambda x: x['total_seconds'], reverse=True)
-             
         else:
              stats = self.db.get_daily_stats(self.current_date)
-        
+
+        drawn = (self.current_date, stats)
+        if not force and drawn == self._drawn_daily:
+            return
+        self._drawn_daily = drawn
         self.daily_total_lbl.setText(self._calculate_total_str(stats))
         self.daily_panel.update_data(stats)
 
-    def refresh_total(self):
-        stats = self.db.get_activity_stats()
-        
+    def _get_daily_breakdown(self):
         if self.tracker:
-             import time
-             current_time = time.time()
-             
-             def add_to_stats(name, duration):
-                 for s in stats:
-                     if s['name'] == name:
-                         s['total_seconds'] += duration
-                         return
-                 stats.append({'name': name, 'total_seconds': duration})
-
-             if self.tracker.current_activity and self.tracker.start_time:
-                 duration = current_time - self.tracker.start_time
-                 if duration > 0:
-                     add_to_stats(self.tracker.current_activity.name, duration)
-                     
-             if hasattr(self.tracker, 'manual_activities') and hasattr(self.tracker, 'manual_start_times'):
-                 for aid, activity in self.tracker.manual_activities.items():
-                     start_t = self.tracker.manual_start_times.get(aid)
-                     if start_t:
-                         duration = current_time - start_t
-                         if duration > 0:
-                             add_to_stats(activity.name, duration)
-                             
-             stats.sort(key=lambda x: x['total_seconds'], reverse=True)
+            return self.tracker.get_live_stats().daily_breakdown
+        return self.db.get_daily_activity_breakdown()
 
+    def refresh_total(self, force=True):
+        if self.tracker:
+            stats = self.tracker.get_live_stats().lifetime
+        else:
+            stats = self.db.get_activity_stats()
+        daily_breakdown = self._get_daily_breakdown()
+
+        drawn = (stats, daily_breakdown)
+        if not force and drawn == self._drawn_total:
+            return
+        self._drawn_total = drawn
         self.lifetime_total_lbl.setText(self._calculate_total_str(stats))
         self.total_panel.update_data(stats)
-        
-        daily_breakdown = self.db.get_daily_activity_breakdown()
-        
-        if self.tracker:
-            import time
-            from datetime import date
-            today = date.today()
-            current_time = time.time()
-            
-            if today not in daily_breakdown:
-                daily_breakdown[today] = {}
-            
-            def add_to_breakdown(name, duration):
-                if name in daily_breakdown[today]:
-                    daily_breakdown[today][name] += duration
-                else:
-                    daily_breakdown[today][name] = duration
-
-            if self.tracker.current_activity and self.tracker.start_time:
-                 duration = current_time - self.tracker.start_time
-                 if duration > 0:
-                     add_to_breakdown(self.tracker.current_activity.name, duration)
-            
-            if hasattr(self.tracker, 'manual_activities') and hasattr(self.tracker, 'manual_start_times'):
-                 for aid, activity in self.tracker.manual_activities.items():
-                     start_t = self.tracker.manual_start_times.get(aid)
-                     if start_t:
-                         duration = current_time - start_t
-                         if duration > 0:
-                             add_to_breakdown(activity.name, duration)
 
         self.lifetime_chart.update_data(daily_breakdown)
 
@@ -921,35 +861,7 @@ class StatisticsWidget(QWidget):
             return
             
         if not isinstance(daily_breakdown, dict):
-            daily_breakdown = self.db.get_daily_activity_breakdown()
-            
-            if self.tracker:
-                import time
-                from datetime import date
-                today = date.today()
-                current_time = time.time()
-                
-                if today not in daily_breakdown:
-                    daily_breakdown[today] = {}
-                
-                def add_to_breakdown(name, duration):
-                    if name in daily_breakdown[today]:
-                        daily_breakdown[today][name] += duration
-                    else:
-                        daily_breakdown[today][name] = duration
-
-                if self.tracker.current_activity and self.tracker.start_time:
-                     duration = current_time - self.tracker.start_time
-                     if duration > 0:
-                         add_to_breakdown(self.tracker.current_activity.name, duration)
-                
-                if hasattr(self.tracker, 'manual_activities') and hasattr(self.tracker, 'manual_start_times'):
-                     for aid, activity in self.tracker.manual_activities.items():
-                         start_t = self.tracker.manual_start_times.get(aid)
-                         if start_t:
-                             duration = current_time - start_t
-                             if duration > 0:
-                                 add_to_breakdown(activity.name, duration)
-                                 
+            daily_breakdown = self._get_daily_breakdown()
+
         groups = [combo.get_checked_items() for combo in self.group_combos]
         self.clustered_chart.update_data(daily_breakdown, groups, self.group_colors)